@@ -8,6 +8,7 @@ from .models import (
     Dosen, RisetGrup, Kurikulum, MataKuliah,
     JadwalKuliah, Publikasi, Fasilitas
 )
+from main.images import thumbnail_url
 
 
 @admin.register(Dosen)
@@ -47,7 +48,7 @@ class DosenAdmin(admin.ModelAdmin):
     
     def foto_preview(self, obj):
         if obj.foto:
-            return format_html('<img src="{}" width="40" height="40" style="border-radius: 50%; object-fit: cover;" />', obj.foto.url)
+            return format_html('<img src="{}" width="40" height="40" style="border-radius: 50%; object-fit: cover;" />', thumbnail_url(obj.foto, 80))
         return '-'
     foto_preview.short_description = 'Foto'
 
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('akademik', '0002_risetgrup_fokus_riset'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jadwalkuliah',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['hari', 'jam_mulai'], name='jadwal_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publikasi',
+            index=models.Index(fields=['tahun', 'jenis'], name='publikasi_tahun_jenis_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publikasi',
+            index=models.Index(fields=['jenis', '-tahun'], name='publikasi_jenis_tahun_idx'),
+        ),
+    ]
@@ -8,6 +8,34 @@ from django.urls import reverse
 from django.utils.text import slugify
 
 
+class RisetGrupQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def for_list(self):
+        """Ketua di-join, anggota di-prefetch, dan jumlah anggota dianotasi sebagai anggota_count"""
+        return self.select_related('ketua').prefetch_related('anggota').annotate(
+            anggota_count=models.Count('anggota', distinct=True)
+        )
+
+
+class KurikulumQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def with_mata_kuliah(self):
+        """Semua mata kuliah di-prefetch sekaligus untuk daftar mata kuliah per semester"""
+        return self.prefetch_related('mata_kuliah')
+
+
+class JadwalKuliahQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def for_list(self):
+        return self.select_related('mata_kuliah', 'dosen')
+
+
 class Dosen(models.Model):
     """
     Model untuk data dosen
@@ -99,6 +127,8 @@ class RisetGrup(models.Model):
     anggota = models.ManyToManyField(Dosen, blank=True, related_name='riset_grup')
     is_active = models.BooleanField(default=True)
     
+    objects = RisetGrupQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Riset Grup'
         verbose_name_plural = 'Riset Grup'
@@ -129,6 +159,8 @@ class Kurikulum(models.Model):
     file_kurikulum = models.FileField(upload_to='kurikulum/', blank=True)
     is_active = models.BooleanField(default=True, verbose_name='Kurikulum Aktif')
     
+    objects = KurikulumQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Kurikulum'
         verbose_name_plural = 'Kurikulum'
@@ -140,28 +172,44 @@ class Kurikulum(models.Model):
     @property
     def total_sks(self):
         """Menghitung total SKS kurikulum"""
-        total = 0
-        for mk in self.mata_kuliah.all():
-            total += mk.sks_teori + mk.sks_praktik
-        return total
+        return sum(self.get_sks_per_semester().values())
     
     def get_semester_list(self):
         """Mengembalikan daftar semester yang ada"""
-        semesters = self.mata_kuliah.values_list('semester', flat=True).distinct().order_by('semester')
-        return list(semesters)
+        return sorted(self.get_sks_per_semester())
     
     def get_matakuliah_by_semester(self):
-        """Mengembalikan semua mata kuliah"""
-        return self.mata_kuliah.all().order_by('semester', 'kode')
+        """Mengembalikan semua mata kuliah (urutan default: semester, kode)"""
+        return self.mata_kuliah.all()
     
     def get_sks_per_semester(self):
-        """Menghitung SKS per semester"""
-        sks_dict = {}
-        for mk in self.mata_kuliah.all():
-            if mk.semester not in sks_dict:
-                sks_dict[mk.semester] = 0
-            sks_dict[mk.semester] += mk.sks_teori + mk.sks_praktik
-        return sks_dict
+        """
+        Menghitung SKS per semester di database.
+        Hasilnya disimpan di instance; attach_sks_per_semester() mengisinya
+        untuk banyak kurikulum sekaligus.
+        """
+        if not hasattr(self, '_sks_per_semester'):
+            attach_sks_per_semester([self])
+        return self._sks_per_semester
+
+
+def attach_sks_per_semester(kurikulum_list):
+    """Mengisi _sks_per_semester (dict semester -> SKS) tiap kurikulum dengan satu query agregat"""
+    kurikulum_list = [kurikulum for kurikulum in kurikulum_list if kurikulum.pk is not None]
+    for kurikulum in kurikulum_list:
+        kurikulum._sks_per_semester = {}
+    if not kurikulum_list:
+        return
+    by_pk = {kurikulum.pk: kurikulum for kurikulum in kurikulum_list}
+    rows = (
+        MataKuliah.objects
+        .filter(kurikulum__in=list(by_pk))
+        .values('kurikulum', 'semester')
+        .annotate(sks=models.Sum(models.F('sks_teori') + models.F('sks_praktik')))
+        .order_by('kurikulum', 'semester')
+    )
+    for row in rows:
+        by_pk[row['kurikulum']]._sks_per_semester[row['semester']] = row['sks'] or 0
 
 
 class MataKuliah(models.Model):
@@ -207,6 +255,9 @@ class MataKuliah(models.Model):
     def __str__(self):
         return f'{self.kode} - {self.nama}'
     
+    def get_absolute_url(self):
+        return reverse('akademik:matakuliah_detail', kwargs={'kurikulum_id': self.kurikulum_id, 'slug': self.kode})
+    
     @property
     def total_sks(self):
         return self.sks_teori + self.sks_praktik
@@ -239,10 +290,16 @@ class JadwalKuliah(models.Model):
     kapasitas = models.IntegerField(default=40)
     is_active = models.BooleanField(default=True)
     
+    objects = JadwalKuliahQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Jadwal Kuliah'
         verbose_name_plural = 'Jadwal Kuliah'
         ordering = ['hari', 'jam_mulai']
+        indexes = [
+            models.Index(fields=['hari', 'jam_mulai'], condition=models.Q(is_active=True),
+                         name='jadwal_active_idx'),
+        ]
     
     def __str__(self):
         return f'{self.mata_kuliah.kode} - {self.kelas} ({self.hari})'
@@ -282,6 +339,11 @@ class Publikasi(models.Model):
         verbose_name = 'Publikasi'
         verbose_name_plural = 'Publikasi'
         ordering = ['-tahun', 'judul']
+        # Filter tahun dan/atau jenis, urut tahun terbaru
+        indexes = [
+            models.Index(fields=['tahun', 'jenis'], name='publikasi_tahun_jenis_idx'),
+            models.Index(fields=['jenis', '-tahun'], name='publikasi_jenis_tahun_idx'),
+        ]
     
     def __str__(self):
         return f'{self.judul[:50]} ({self.tahun})'
@@ -14,7 +14,7 @@ urlpatterns = [
     
     # Kurikulum
     path('kurikulum/', views.KurikulumView.as_view(), name='kurikulum'),
-    path('matakuliah/<slug:slug>/', views.MataKuliahDetailView.as_view(), name='matakuliah_detail'),
+    path('matakuliah/<int:kurikulum_id>/<slug:slug>/', views.MataKuliahDetailView.as_view(), name='matakuliah_detail'),
     
     # Jadwal
     path('jadwal/', views.JadwalView.as_view(), name='jadwal'),
@@ -6,7 +6,8 @@ from django.shortcuts import render, get_object_or_404
 from django.views.generic import ListView, DetailView, TemplateView
 from django.db.models import Q
 
-from .models import Dosen, MataKuliah, Fasilitas, JadwalKuliah, RisetGrup, Publikasi, Kurikulum
+from .models import Dosen, MataKuliah, Fasilitas, JadwalKuliah, RisetGrup, Publikasi, Kurikulum, attach_sks_per_semester
+from main.pagination import CursorPaginationMixin
 
 
 class DosenListView(ListView):
@@ -47,12 +48,12 @@ class DosenDetailView(DetailView):
     slug_field = 'slug'
     
     def get_queryset(self):
-        return Dosen.objects.filter(is_active=True)
+        return Dosen.objects.filter(is_active=True).prefetch_related('riset_grup')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         dosen = self.object
-        context['publikasi_list'] = Publikasi.objects.filter(penulis__icontains=dosen.nama)[:10]
+        context['publikasi_list'] = dosen.publikasi.all()[:10]
         context['matakuliah_list'] = MataKuliah.objects.filter(dosen_pengampu=dosen)
         return context
 
@@ -63,7 +64,10 @@ class KurikulumView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['kurikulum_list'] = Kurikulum.objects.filter(is_active=True)
+        kurikulum_list = list(Kurikulum.objects.active().with_mata_kuliah())
+        # Rekap SKS semua kurikulum dalam satu query agregat, bukan satu query per kurikulum
+        attach_sks_per_semester(kurikulum_list)
+        context['kurikulum_list'] = kurikulum_list
         context['semester_list'] = range(1, 9)
         context['matakuliah_list'] = MataKuliah.objects.all().order_by('semester', 'nama')
         
@@ -82,10 +86,14 @@ class MataKuliahDetailView(DetailView):
     model = MataKuliah
     template_name = 'akademik/matakuliah_detail.html'
     context_object_name = 'matakuliah'
-    slug_field = 'slug'
+    slug_field = 'kode'
     
     def get_queryset(self):
-        return MataKuliah.objects.all()
+        # Kode MK hanya unik dalam satu kurikulum
+        return (
+            MataKuliah.objects.filter(kurikulum_id=self.kwargs['kurikulum_id'])
+            .select_related('kurikulum').prefetch_related('dosen_pengampu', 'prasyarat')
+        )
 
 
 class FasilitasView(ListView):
@@ -104,7 +112,7 @@ class JadwalView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['jadwal_list'] = JadwalKuliah.objects.filter(is_active=True).order_by('hari', 'jam_mulai')
+        context['jadwal_list'] = JadwalKuliah.objects.active().for_list().order_by('hari', 'jam_mulai')
         context['hari_list'] = JadwalKuliah.HARI_CHOICES
         
         hari = self.request.GET.get('hari')
@@ -121,18 +129,20 @@ class RisetGrupView(ListView):
     """View untuk halaman riset grup"""
     model = RisetGrup
     template_name = 'akademik/riset_grup.html'
-    context_object_name = 'riset_list'
+    context_object_name = 'riset_grup_list'
     
     def get_queryset(self):
-        return RisetGrup.objects.filter(is_active=True)
+        return RisetGrup.objects.active().for_list()
 
 
-class PublikasiView(ListView):
+class PublikasiView(CursorPaginationMixin, ListView):
     """View untuk halaman publikasi"""
     model = Publikasi
     template_name = 'akademik/publikasi.html'
     context_object_name = 'publikasi_list'
     paginate_by = 20
+    cursor_ordering = ('-tahun',)
+    json_fields = ('judul', 'penulis_text', 'jenis', 'nama_jurnal', 'tahun', 'doi', 'url')
     
     def get_queryset(self):
         queryset = Publikasi.objects.all().order_by('-tahun')
@@ -144,12 +154,16 @@ class PublikasiView(ListView):
         jenis = self.request.GET.get('jenis')
         if jenis:
             queryset = queryset.filter(jenis=jenis)
-        
+
+        dosen = self.request.GET.get('dosen')
+        if dosen:
+            queryset = queryset.filter(penulis__slug=dosen)
+
         search = self.request.GET.get('q')
         if search:
             queryset = queryset.filter(
                 Q(judul__icontains=search) |
-                Q(penulis__icontains=search)
+                Q(penulis_text__icontains=search)
             )
         
         return queryset
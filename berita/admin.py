@@ -5,6 +5,7 @@ Admin configuration untuk berita app
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import Berita, KategoriBerita, TagBerita, GaleriBerita, KomentarBerita
+from main.images import thumbnail_url
 
 
 class GaleriBeritaInline(admin.TabularInline):
@@ -80,7 +81,7 @@ class BeritaAdmin(admin.ModelAdmin):
     
     def gambar_preview(self, obj):
         if obj.gambar_utama:
-            return format_html('<img src="{}" width="80" height="50" style="object-fit: cover;" />', obj.gambar_utama.url)
+            return format_html('<img src="{}" width="80" height="50" style="object-fit: cover;" />', thumbnail_url(obj.gambar_utama, 160))
         return '-'
     gambar_preview.short_description = 'Preview'
     
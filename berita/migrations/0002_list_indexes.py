@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('berita', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-published_at', '-id'], name='berita_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-view_count'], name='berita_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['jenis', '-published_at'], name='berita_jenis_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['-is_pinned', '-published_at'], name='berita_featured_idx'),
+        ),
+    ]
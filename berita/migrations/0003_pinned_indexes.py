@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('berita', '0002_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-is_pinned', '-published_at', '-id'], name='berita_pinned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['jenis', '-is_pinned', '-published_at'], name='berita_jenis_pinned_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 11:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('berita', '0003_pinned_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['kategori', '-is_pinned', '-published_at'], name='berita_kategori_pinned_idx'),
+        ),
+    ]
@@ -10,6 +10,39 @@ from django.utils.text import slugify
 from django.contrib.auth.models import User
 
 
+class TaksonomiBeritaQuerySet(models.QuerySet):
+    """Query untuk kategori dan tag berita"""
+
+    def with_berita_count(self):
+        """Menambahkan berita_count (berita yang dipublikasikan) dalam satu query"""
+        return self.annotate(berita_count=models.Count('berita', filter=models.Q(berita__is_published=True)))
+
+
+class BeritaQuerySet(models.QuerySet):
+    """Query berita yang sudah memuat relasi yang dipakai template"""
+
+    def published(self):
+        return self.filter(is_published=True)
+
+    def for_list(self):
+        """Untuk kartu berita: kategori ikut di-join"""
+        return self.select_related('kategori')
+
+    def for_detail(self):
+        return self.select_related('kategori', 'author').prefetch_related('tags', 'galeri')
+
+
+class KomentarBeritaQuerySet(models.QuerySet):
+    def approved(self):
+        return self.filter(is_approved=True)
+
+    def with_replies(self):
+        """Balasan yang disetujui di-prefetch sekaligus untuk semua komentar"""
+        return self.prefetch_related(
+            models.Prefetch('replies', queryset=KomentarBerita.objects.approved().order_by('created_at'))
+        )
+
+
 class KategoriBerita(models.Model):
     """
     Model untuk kategori berita
@@ -20,6 +53,8 @@ class KategoriBerita(models.Model):
     icon = models.CharField(max_length=50, blank=True, help_text='Class icon Bootstrap, contoh: bi-newspaper')
     warna = models.CharField(max_length=20, default='primary', help_text='Class warna Bootstrap')
     
+    objects = TaksonomiBeritaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Kategori Berita'
         verbose_name_plural = 'Kategori Berita'
@@ -45,6 +80,8 @@ class TagBerita(models.Model):
     nama = models.CharField(max_length=50)
     slug = models.SlugField(unique=True, blank=True)
     
+    objects = TaksonomiBeritaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Tag Berita'
         verbose_name_plural = 'Tag Berita'
@@ -59,7 +96,9 @@ class TagBerita(models.Model):
         super().save(*args, **kwargs)
     
     def get_berita_count(self):
-        """Menghitung jumlah berita dengan tag ini"""
+        """Menghitung jumlah berita dengan tag ini (memakai anotasi berita_count jika ada)"""
+        if hasattr(self, 'berita_count'):
+            return self.berita_count
         return self.berita_set.filter(is_published=True).count()
 
 
@@ -112,10 +151,31 @@ class Berita(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(blank=True, null=True)
     
+    objects = BeritaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Berita'
         verbose_name_plural = 'Berita'
         ordering = ['-is_pinned', '-published_at']
+        # Indeks parsial: SQLite menulis filter boolean sebagai WHERE "is_published",
+        # sehingga hanya indeks dengan kondisi yang sama yang dipakai (main/queryplans.py)
+        indexes = [
+            models.Index(fields=['-published_at', '-id'], condition=models.Q(is_published=True),
+                         name='berita_published_idx'),
+            # Daftar berita: yang di-pin dulu, lalu terbaru (juga untuk paginasi cursor)
+            models.Index(fields=['-is_pinned', '-published_at', '-id'], condition=models.Q(is_published=True),
+                         name='berita_pinned_idx'),
+            models.Index(fields=['-view_count'], condition=models.Q(is_published=True),
+                         name='berita_popular_idx'),
+            models.Index(fields=['jenis', '-published_at'], condition=models.Q(is_published=True),
+                         name='berita_jenis_idx'),
+            models.Index(fields=['jenis', '-is_pinned', '-published_at'], condition=models.Q(is_published=True),
+                         name='berita_jenis_pinned_idx'),
+            models.Index(fields=['kategori', '-is_pinned', '-published_at'], condition=models.Q(is_published=True),
+                         name='berita_kategori_pinned_idx'),
+            models.Index(fields=['-is_pinned', '-published_at'],
+                         condition=models.Q(is_published=True, is_featured=True), name='berita_featured_idx'),
+        ]
     
     def __str__(self):
         return self.judul
@@ -150,9 +210,9 @@ class Berita(models.Model):
         return text[:200] + '...' if len(text) > 200 else text
     
     def increment_view(self):
-        """Tambah jumlah view"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """Tambah jumlah view (di-buffer, lihat main/counters.py)"""
+        from main.counters import counters
+        counters.incr(self, 'view_count')
     
     def get_related_berita(self, limit=4):
         """Mendapatkan berita terkait berdasarkan kategori atau tag"""
@@ -198,6 +258,8 @@ class KomentarBerita(models.Model):
     is_approved = models.BooleanField(default=False, verbose_name='Disetujui')
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = KomentarBeritaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Komentar Berita'
         verbose_name_plural = 'Komentar Berita'
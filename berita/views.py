@@ -6,21 +6,30 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView
 from django.http import JsonResponse
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.core.paginator import Paginator
 
 from .models import Berita, KategoriBerita, TagBerita, KomentarBerita
+from main.counters import counters
+from main.fragments import fragments, list_widgets
+from main.pagination import CursorPaginationMixin
 
 
-class BeritaListView(ListView):
+# Widget bilah samping tanpa berita unggulan, untuk halaman kategori dan tag
+SIDEBAR_WIDGETS = ['berita:kategori', 'berita:tags', 'berita:populer']
+
+
+class BeritaListView(CursorPaginationMixin, ListView):
     """View untuk daftar berita"""
     model = Berita
     template_name = 'berita/berita_list.html'
     context_object_name = 'berita_list'
     paginate_by = 9
+    cursor_ordering = ('-is_pinned', '-published_at')
+    json_fields = ('judul', 'slug', 'jenis', 'ringkasan', 'published_at', 'view_count')
     
     def get_queryset(self):
-        queryset = Berita.objects.filter(is_published=True)
+        queryset = Berita.objects.published().for_list()
         
         jenis = self.request.GET.get('jenis')
         if jenis:
@@ -42,20 +51,17 @@ class BeritaListView(ListView):
                 Q(ringkasan__icontains=search)
             )
         
-        return queryset.distinct().order_by('-published_at')
+        # Berita yang di-pin tetap paling atas (Meta.ordering), juga di mode cursor
+        return queryset.distinct().order_by('-is_pinned', '-published_at')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['kategori_list'] = KategoriBerita.objects.annotate(
-            berita_count=Count('berita', filter=Q(berita__is_published=True))
-        )
-        context['tag_list'] = TagBerita.objects.all()[:20]
-        context['berita_populer'] = Berita.objects.filter(is_published=True).order_by('-view_count')[:5]
+        context.update(list_widgets('berita'))
         context['jenis_choices'] = Berita.JENIS_CHOICES
         context['selected_jenis'] = self.request.GET.get('jenis', '')
         context['selected_kategori'] = self.request.GET.get('kategori', '')
         context['search_query'] = self.request.GET.get('q', '')
-        context['featured_list'] = Berita.objects.filter(is_published=True, is_featured=True)[:3]
+        context['selected_tag'] = self.request.GET.get('tag', '')
         return context
 
 
@@ -67,65 +73,70 @@ class BeritaDetailView(DetailView):
     slug_field = 'slug'
     
     def get_queryset(self):
-        return Berita.objects.filter(is_published=True)
+        return Berita.objects.published().for_detail()
     
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        obj.view_count += 1
-        obj.save()
+        counters.incr(obj, 'view_count')
         return obj
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         berita = self.object
         
-        context['berita_terkait'] = Berita.objects.filter(
-            is_published=True, kategori=berita.kategori
+        context['berita_terkait'] = Berita.objects.published().for_list().filter(
+            kategori=berita.kategori
         ).exclude(pk=berita.pk)[:4]
         
-        context['komentar_list'] = berita.komentar.filter(is_approved=True)
+        context['komentar_list'] = berita.komentar.approved().with_replies()
         return context
 
 
-class KategoriDetailView(ListView):
+class KategoriDetailView(CursorPaginationMixin, ListView):
     """View untuk berita berdasarkan kategori"""
     model = Berita
     template_name = 'berita/berita_list.html'
     context_object_name = 'berita_list'
     paginate_by = 9
+    cursor_ordering = BeritaListView.cursor_ordering
+    json_fields = BeritaListView.json_fields
     
     def get_queryset(self):
         self.kategori = get_object_or_404(KategoriBerita, slug=self.kwargs['slug'])
-        return Berita.objects.filter(is_published=True, kategori=self.kategori).order_by('-published_at')
+        return Berita.objects.published().for_list().filter(kategori=self.kategori).order_by(*self.cursor_ordering)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['kategori'] = self.kategori
-        context['kategori_list'] = KategoriBerita.objects.all()
+        context['selected_kategori'] = self.kategori.slug
+        context.update(fragments.context(SIDEBAR_WIDGETS))
         return context
 
 
-class TagDetailView(ListView):
+class TagDetailView(CursorPaginationMixin, ListView):
     """View untuk berita berdasarkan tag"""
     model = Berita
     template_name = 'berita/berita_list.html'
     context_object_name = 'berita_list'
     paginate_by = 9
+    cursor_ordering = BeritaListView.cursor_ordering
+    json_fields = BeritaListView.json_fields
     
     def get_queryset(self):
         self.tag = get_object_or_404(TagBerita, slug=self.kwargs['slug'])
-        return Berita.objects.filter(is_published=True, tags=self.tag).order_by('-published_at')
+        return Berita.objects.published().for_list().filter(tags=self.tag).order_by(*self.cursor_ordering)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['tag'] = self.tag
-        context['tag_list'] = TagBerita.objects.all()
+        context['selected_tag'] = self.tag.slug
+        context.update(fragments.context(SIDEBAR_WIDGETS))
         return context
 
 
 def agenda_list(request):
     """View untuk daftar agenda"""
-    agenda = Berita.objects.filter(is_published=True, jenis='agenda').order_by('-published_at')
+    agenda = Berita.objects.published().for_list().filter(jenis='agenda').order_by('-published_at')
     return render(request, 'berita/berita_list.html', {
         'berita_list': agenda,
         'is_agenda': True,
@@ -135,8 +146,7 @@ def agenda_list(request):
 def share_berita(request, slug):
     """Track share count"""
     berita = get_object_or_404(Berita, slug=slug, is_published=True)
-    berita.share_count += 1
-    berita.save()
+    counters.incr(berita, 'share_count')
     return JsonResponse({'status': 'success', 'share_count': berita.share_count})
 
 
@@ -3,8 +3,10 @@ Admin configuration untuk chatbot app
 """
 
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
-from .models import ChatbotKnowledge, ChatSession, ChatMessage, ChatbotFeedback, QuickReply
+from .models import ChatbotKnowledge, ChatSession, ChatMessage, ChatbotFeedback, QuickReply, ChatDailyStat
+from .response_cache import response_cache
 
 
 @admin.register(ChatbotKnowledge)
@@ -31,6 +33,12 @@ class ChatbotKnowledgeAdmin(admin.ModelAdmin):
     def pertanyaan_short(self, obj):
         return obj.pertanyaan[:60] + '...' if len(obj.pertanyaan) > 60 else obj.pertanyaan
     pertanyaan_short.short_description = 'Pertanyaan'
+    
+    def changelist_view(self, request, extra_context=None):
+        # Statistik cache jawaban (per proses worker yang melayani halaman ini)
+        extra_context = extra_context or {}
+        extra_context['response_cache_stats'] = response_cache.stats()
+        return super().changelist_view(request, extra_context=extra_context)
 
 
 class ChatMessageInline(admin.TabularInline):
@@ -57,9 +65,14 @@ class ChatSessionAdmin(admin.ModelAdmin):
         return obj.session_id[:8] + '...'
     session_id_short.short_description = 'Session ID'
     
+    def get_queryset(self, request):
+        # Jumlah pesan dihitung sekali lewat annotate, bukan COUNT per baris
+        return super().get_queryset(request).annotate(message_total=Count('messages'))
+    
     def message_count(self, obj):
-        return obj.messages.count()
+        return obj.message_total
     message_count.short_description = 'Jumlah Pesan'
+    message_count.admin_order_field = 'message_total'
     
     def has_add_permission(self, request):
         return False
@@ -110,3 +123,30 @@ class QuickReplyAdmin(admin.ModelAdmin):
     list_display = ('teks', 'urutan', 'is_active')
     list_editable = ('urutan', 'is_active')
     ordering = ('urutan',)
+
+
+@admin.register(ChatDailyStat)
+class ChatDailyStatAdmin(admin.ModelAdmin):
+    """Admin untuk agregat chat harian (tetap ada setelah sesi lama diarsipkan)"""
+    
+    list_display = ('date', 'session_count', 'message_count', 'matched_rate_display',
+                   'mean_confidence_display', 'feedback_display')
+    date_hierarchy = 'date'
+    
+    def matched_rate_display(self, obj):
+        return f'{obj.matched_rate:.1f}%'
+    matched_rate_display.short_description = 'Jawaban Cocok'
+    
+    def mean_confidence_display(self, obj):
+        return f'{obj.mean_confidence:.2f}'
+    mean_confidence_display.short_description = 'Rata-rata Confidence'
+    
+    def feedback_display(self, obj):
+        return ' / '.join(str(getattr(obj, f'feedback_{i}')) for i in range(1, 6))
+    feedback_display.short_description = 'Feedback 1-5'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -5,3 +5,6 @@ class ChatbotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chatbot'
     verbose_name = 'AI Chatbot'
+
+    def ready(self):
+        from . import signals  # noqa: F401
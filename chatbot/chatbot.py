@@ -0,0 +1,294 @@
+"""
+Logika pencocokan chatbot
+INOVASI: Keyword matching dengan automaton Aho-Corasick dan ranking BM25,
+keduanya dikompilasi sekali per proses
+"""
+
+import heapq
+import math
+import threading
+from collections import Counter, deque, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from main.stamps import bump_stamp, stamp_cache
+
+from .models import ChatbotKnowledge
+from .nlp import STOPWORDS, TOKEN_RE, TrigramIndex, analyze, max_typo_distance
+
+
+# Kunci cache untuk version stamp knowledge base, dinaikkan setiap ada perubahan
+KNOWLEDGE_VERSION_KEY = 'chatbot:knowledge_version'
+
+
+class KeywordAutomaton:
+    """
+    Automaton Aho-Corasick untuk mencari banyak kata kunci sekaligus
+    dalam satu kali scan pesan, tanpa peduli jumlah kata kunci.
+    Setiap kata kunci membawa `rank` (urutan prioritas); semakin kecil semakin diprioritaskan.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [None]
+
+    def add(self, keyword, rank):
+        """Menambahkan kata kunci ke trie"""
+        node = 0
+        for char in keyword:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.best.append(None)
+            node = next_node
+        if self.best[node] is None or rank < self.best[node]:
+            self.best[node] = rank
+
+    def compile(self):
+        """Membangun failure link (BFS) dan menggabungkan rank terbaik dari suffix"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                inherited = self.best[self.fail[child]]
+                if inherited is not None and (self.best[child] is None or inherited < self.best[child]):
+                    self.best[child] = inherited
+
+    def search(self, text):
+        """Mengembalikan rank terbaik dari semua kata kunci yang muncul di teks, atau None"""
+        goto, fail, best = self.goto, self.fail, self.best
+        node = 0
+        result = None
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            rank = best[node]
+            if rank is not None and (result is None or rank < result):
+                result = rank
+                if result == 0:
+                    break
+        return result
+
+
+class BM25Index:
+    """
+    Inverted index sparse untuk ranking BM25.
+    Kontribusi setiap (term, dokumen) sudah dihitung saat build, sehingga query
+    hanya menjumlahkan bobot dari posting list term yang ada di pertanyaan.
+    """
+
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.size = len(documents)
+        self.postings = {}
+        self.idf = {}
+
+        lengths = [sum(tf.values()) for tf in documents]
+        avg_length = (sum(lengths) / self.size) if self.size else 0.0
+
+        doc_freq = Counter()
+        for tf in documents:
+            doc_freq.update(tf.keys())
+        for term, df in doc_freq.items():
+            self.idf[term] = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+
+        for doc_id, tf in enumerate(documents):
+            norm = k1 * (1 - b + b * lengths[doc_id] / avg_length) if avg_length else k1
+            for term, freq in tf.items():
+                weight = self.idf[term] * freq * (k1 + 1) / (freq + norm)
+                self.postings.setdefault(term, []).append((doc_id, weight))
+
+    def search(self, terms, k=3):
+        """
+        Mengembalikan maksimal k tuple (doc_id, skor, confidence).
+        Confidence = skor dibagi batas atas BM25 untuk term query yang dikenal,
+        sehingga nilainya selalu di rentang 0..1 dan bisa dibandingkan antar query.
+        """
+        terms = [t for t in set(terms) if t in self.postings]
+        if not terms:
+            return []
+
+        scores = {}
+        for term in terms:
+            for doc_id, weight in self.postings[term]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        upper_bound = sum(self.idf[t] for t in terms) * (self.k1 + 1)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score, min(score / upper_bound, 1.0)) for doc_id, score in top]
+
+
+ChatResult = namedtuple('ChatResult', ['knowledge', 'score', 'confidence'])
+
+
+class ChatbotEngine:
+    """
+    Engine knowledge base per proses.
+    Kata kunci semua ChatbotKnowledge aktif dikompilasi menjadi satu automaton,
+    sedangkan pertanyaan, kata kunci, dan jawaban diindeks dengan BM25.
+    Keduanya dibangun ulang hanya ketika version stamp berubah (lihat signals.py).
+    Kata yang salah ketik dikoreksi dulu ke kata kunci terdekat lewat indeks trigram.
+    """
+
+    # Bobot field: term dari kata kunci dihitung lebih sering daripada term di jawaban
+    FIELD_WEIGHTS = (('kata_kunci', 3), ('pertanyaan', 2), ('jawaban', 1))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._snapshot = None
+        self.typo_index = TrigramIndex()
+
+    def _build(self):
+        """Mengompilasi automaton dan indeks BM25 dari knowledge base aktif"""
+        automaton = KeywordAutomaton()
+        entries = []
+        documents = []
+        vocabulary = set(STOPWORDS)
+        keyword_terms = set()
+        for knowledge in ChatbotKnowledge.objects.filter(is_active=True).order_by('-prioritas', 'pk'):
+            rank = len(entries)
+            entries.append(knowledge)
+            for keyword in knowledge.get_kata_kunci_list():
+                automaton.add(keyword, rank)
+                keyword_terms.update(TOKEN_RE.findall(keyword))
+
+            tf = Counter()
+            for field, weight in self.FIELD_WEIGHTS:
+                text = getattr(knowledge, field)
+                vocabulary.update(TOKEN_RE.findall(text.lower()))
+                for term in analyze(text):
+                    tf[term] += weight
+            documents.append(tf)
+        automaton.compile()
+
+        # Indeks trigram hanya menerima selisih kata kunci, tidak dibangun ulang
+        self.typo_index.sync(keyword_terms)
+        return automaton, BM25Index(documents), entries, frozenset(vocabulary)
+
+    def _refresh(self, version):
+        with self._lock:
+            if self._snapshot is None or version != self._version:
+                self._snapshot = self._build()
+                self._version = version
+            return self._snapshot
+
+    def snapshot(self):
+        """Mengembalikan (automaton, indeks, entries, vocabulary) terbaru, build ulang jika version berubah"""
+        version = stamp_cache.get(KNOWLEDGE_VERSION_KEY, 0)
+        snapshot = self._snapshot
+        if snapshot is not None and version == self._version:
+            return snapshot
+        return self._refresh(version)
+
+    async def asnapshot(self):
+        """
+        Versi async dari snapshot().
+        Pencarian sepenuhnya in-memory; thread hanya dipakai saat engine perlu dibangun ulang dari database.
+        """
+        version = await stamp_cache.aget(KNOWLEDGE_VERSION_KEY, 0)
+        snapshot = self._snapshot
+        if snapshot is not None and version == self._version:
+            return snapshot
+        return await sync_to_async(self._refresh)(version)
+
+    def invalidate(self):
+        """Menandai engine lokal agar dibangun ulang pada pencarian berikutnya"""
+        self._version = None
+
+    def match(self, message):
+        """Mengembalikan ChatbotKnowledge dengan prioritas tertinggi yang kata kuncinya muncul, atau None"""
+        automaton, _, entries, _ = self.snapshot()
+        rank = automaton.search(message.lower())
+        if rank is None:
+            return None
+        return entries[rank]
+
+    def correct(self, message, vocabulary):
+        """Mengganti kata yang tidak dikenal dengan kata kunci terdekat (pendaftran -> pendaftaran)"""
+        def fix(match):
+            word = match.group()
+            if word in vocabulary or word.isdigit():
+                return word
+            found = self.typo_index.lookup(word, max_typo_distance(word))
+            return found[0] if found else word
+        return TOKEN_RE.sub(fix, message.lower())
+
+    def _rank(self, snapshot, message, k):
+        """
+        Pesan asli dicocokkan lebih dulu agar kata kunci yang muncul persis tidak
+        hilang karena koreksi ejaan; teks hasil koreksi hanya dipakai jika pesan
+        asli tidak mengandung kata kunci dan hasilnya lebih yakin.
+        """
+        vocabulary = snapshot[3]
+        message = message.lower()
+        results = self._match(snapshot, message, k)
+        if results and results[0].score is None:
+            return results
+
+        corrected = self.correct(message, vocabulary)
+        if corrected != message:
+            fallback = self._match(snapshot, corrected, k)
+            if fallback and (not results or fallback[0].confidence > results[0].confidence):
+                return fallback
+        return results
+
+    @staticmethod
+    def _match(snapshot, message, k):
+        automaton, index, entries, _ = snapshot
+        results = []
+
+        rank = automaton.search(message)
+        if rank is not None:
+            results.append(ChatResult(entries[rank], None, 1.0))
+
+        for doc_id, score, confidence in index.search(analyze(message), k):
+            if doc_id != rank:
+                results.append(ChatResult(entries[doc_id], score, confidence))
+        return results[:k]
+
+    @staticmethod
+    def _pick(results):
+        threshold = getattr(settings, 'CHATBOT_CONFIDENCE_THRESHOLD', 0.2)
+        results = [r for r in results if r.confidence >= threshold]
+        if not results:
+            return None, []
+        return results[0], results[1:]
+
+    def search(self, message, k=3):
+        """
+        Mengembalikan daftar ChatResult terurut dari yang paling relevan.
+        Kata kunci yang muncul persis dianggap pasti (confidence 1.0) dan selalu di urutan pertama,
+        sisanya diurutkan dengan skor BM25.
+        """
+        return self._rank(self.snapshot(), message, k)
+
+    def answer(self, message, k=3):
+        """
+        Mengembalikan (hasil terbaik, alternatif) atau (None, []) jika confidence
+        di bawah CHATBOT_CONFIDENCE_THRESHOLD sehingga view memakai jawaban default.
+        """
+        return self._pick(self.search(message, k))
+
+    async def aanswer(self, message, k=3):
+        """Versi async dari answer() untuk view ASGI"""
+        return self._pick(self._rank(await self.asnapshot(), message, k))
+
+
+def bump_knowledge_version():
+    """Menaikkan version stamp agar semua proses membangun ulang engine"""
+    bump_stamp(KNOWLEDGE_VERSION_KEY)
+
+
+engine = ChatbotEngine()
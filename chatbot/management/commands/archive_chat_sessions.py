@@ -0,0 +1,37 @@
+"""
+Arsipkan dan hapus sesi chat lama
+
+Contoh (cron harian):
+    0 2 * * * cd /path/ke/project && python manage.py archive_chat_sessions --days 90
+"""
+
+from django.core.management.base import BaseCommand
+
+from chatbot.retention import archive_old_sessions
+
+
+class Command(BaseCommand):
+    help = 'Arsipkan sesi chat yang lebih lama dari N hari ke JSONL.gz, simpan agregat harian, lalu hapus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Batas retensi dalam hari (default: CHAT_RETENTION_DAYS)')
+        parser.add_argument('--archive-dir', help='Folder arsip (default: CHAT_ARCHIVE_DIR)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Jumlah sesi per transaksi hapus')
+        parser.add_argument('--dry-run', action='store_true', help='Hanya hitung sesi yang akan diarsipkan')
+
+    def handle(self, *args, **options):
+        summary = archive_old_sessions(
+            days=options['days'],
+            archive_dir=options['archive_dir'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        if options['dry_run']:
+            self.stdout.write(f'{summary["sessions"]} sesi ({summary["messages"]} pesan) akan diarsipkan.')
+        elif summary['archive']:
+            self.stdout.write(self.style.SUCCESS(
+                f'{summary["sessions"]} sesi ({summary["messages"]} pesan) diarsipkan ke {summary["archive"]}'
+            ))
+        else:
+            self.stdout.write('Tidak ada sesi yang perlu diarsipkan.')
@@ -0,0 +1,291 @@
+"""
+Benchmark latensi endpoint chatbot
+
+Contoh:
+    python manage.py bench_chatbot --size 5000 --requests 2000 --concurrency 8 --output bench.json
+
+Semua data sintetis dibuat di database test sementara, database utama tidak disentuh.
+"""
+
+import asyncio
+import io
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+
+from chatbot.chatbot import engine, bump_knowledge_version
+from chatbot.models import ChatbotKnowledge
+from chatbot.response_cache import response_cache, bump_reply_version
+
+
+TOPIK = [
+    'pendaftaran', 'biaya kuliah', 'beasiswa', 'jadwal kuliah', 'kurikulum', 'dosen',
+    'akreditasi', 'fasilitas', 'laboratorium', 'magang', 'karir', 'wisuda', 'skripsi',
+    'kkn', 'krs', 'ukt', 'asrama', 'organisasi', 'prestasi', 'alumni', 'kontak', 'lokasi',
+]
+KATA = [
+    'mahasiswa', 'baru', 'semester', 'online', 'syarat', 'dokumen', 'jalur', 'prestasi',
+    'reguler', 'gelombang', 'tes', 'seleksi', 'program', 'studi', 'informatika', 'kampus',
+    'gedung', 'ruang', 'praktikum', 'nilai', 'ipk', 'cuti', 'pembayaran', 'cicilan', 'bank',
+    'portal', 'akun', 'email', 'kelas', 'pagi', 'malam', 'transfer', 'pindahan', 'sertifikat',
+]
+POLA_PERTANYAAN = [
+    'Bagaimana cara {t}?', 'Berapa {t}?', 'Info {t} dong', 'Apa saja {t} yang tersedia?',
+    'Kapan {t} dibuka?', '{t}', 'Saya mau tanya tentang {t} {k}', 'Syarat {t} apa saja?',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark latensi chatbot (test client, WSGI, ASGI) dengan knowledge base sintetis'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1000, help='Jumlah ChatbotKnowledge sintetis')
+        parser.add_argument('--requests', type=int, default=500, help='Jumlah request per jalur')
+        parser.add_argument('--concurrency', type=int, default=1, help='Jumlah request paralel')
+        parser.add_argument('--paths', default='client,wsgi,asgi', help='Jalur yang diuji, pisahkan dengan koma')
+        parser.add_argument('--no-cache', action='store_true', help='Matikan cache jawaban selama benchmark')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Simpan hasil JSON ke file (default: stdout)')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        original_cache_size = response_cache.max_size
+        try:
+            if options['no_cache']:
+                response_cache.max_size = 0
+
+            build_seconds = self.create_knowledge_base(options['size'], rng)
+            corpus = self.build_corpus(options['requests'], rng)
+
+            results = {}
+            for path in [p.strip() for p in options['paths'].split(',') if p.strip()]:
+                runner = getattr(self, f'run_{path}', None)
+                if runner is None:
+                    self.stderr.write(f'Jalur tidak dikenal: {path}')
+                    continue
+                results[path] = runner(corpus, options['concurrency'])
+        finally:
+            response_cache.max_size = original_cache_size
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'config': {
+                'size': options['size'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'response_cache': not options['no_cache'],
+                'seed': options['seed'],
+            },
+            'engine_build_seconds': round(build_seconds, 4),
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Hasil disimpan ke {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    # ------------------------------------------------------------------
+    # Data sintetis
+    # ------------------------------------------------------------------
+
+    def create_knowledge_base(self, size, rng):
+        """Membuat knowledge base sintetis lalu mengukur waktu build engine"""
+        kategori = [k for k, _ in ChatbotKnowledge.KATEGORI_CHOICES]
+        objs = []
+        for i in range(size):
+            topik = rng.choice(TOPIK)
+            kata = rng.sample(KATA, 6)
+            objs.append(ChatbotKnowledge(
+                kategori=rng.choice(kategori),
+                pertanyaan=rng.choice(POLA_PERTANYAAN).format(t=topik, k=kata[0]),
+                kata_kunci=f'{topik} {kata[1]} {i}, {kata[2]} {kata[3]} {i}',
+                jawaban=f'Informasi {topik}: ' + ' '.join(rng.choices(KATA, k=40)),
+                prioritas=rng.randint(0, 10),
+            ))
+        ChatbotKnowledge.objects.bulk_create(objs, batch_size=500)
+
+        # bulk_create tidak memicu signal, jadi version stamp dinaikkan manual
+        engine.invalidate()
+        bump_knowledge_version()
+        response_cache.clear()
+        bump_reply_version()
+
+        start = time.perf_counter()
+        engine.snapshot()
+        return time.perf_counter() - start
+
+    def build_corpus(self, count, rng):
+        """Korpus pertanyaan: sebagian besar topik populer (distribusi Zipf), sisanya acak"""
+        weights = [1 / (rank + 1) for rank in range(len(TOPIK))]
+        corpus = []
+        for _ in range(count):
+            if rng.random() < 0.8:
+                topik = rng.choices(TOPIK, weights=weights)[0]
+                corpus.append(rng.choice(POLA_PERTANYAAN).format(t=topik, k=rng.choice(KATA)))
+            else:
+                corpus.append(' '.join(rng.choices(KATA, k=rng.randint(2, 6))))
+        return corpus
+
+    # ------------------------------------------------------------------
+    # Jalur request
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _body(message):
+        return json.dumps({'message': message}).encode()
+
+    def run_client(self, corpus, concurrency):
+        """Django test client (middleware lengkap), sekaligus menghitung query per request"""
+        url = reverse('chatbot:send')
+        client = Client()
+        query_counts = []
+
+        def call(message):
+            with CaptureQueriesContext(connection) as ctx:
+                client.post(url, self._body(message), content_type='application/json')
+            query_counts.append(len(ctx.captured_queries))
+
+        # Client tidak thread-safe untuk CaptureQueriesContext, jadi jalur ini selalu sekuensial
+        result = self._measure(call, corpus, 1)
+        result['queries_per_request'] = round(statistics.mean(query_counts), 3) if query_counts else 0
+        result['max_queries'] = max(query_counts) if query_counts else 0
+        return result
+
+    def run_wsgi(self, corpus, concurrency):
+        """Memanggil aplikasi WSGI langsung dengan environ mentah"""
+        application = get_wsgi_application()
+        path = reverse('chatbot:send')
+
+        def call(message):
+            body = self._body(message)
+            environ = {
+                'REQUEST_METHOD': 'POST',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': 'testserver',
+                'SERVER_PORT': '80',
+                'REMOTE_ADDR': '127.0.0.1',
+                'CONTENT_TYPE': 'application/json',
+                'CONTENT_LENGTH': str(len(body)),
+                'wsgi.input': io.BytesIO(body),
+                'wsgi.url_scheme': 'http',
+                'wsgi.errors': io.StringIO(),
+                'wsgi.version': (1, 0),
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            response = application(environ, lambda status, headers, exc_info=None: None)
+            b''.join(response)
+            if hasattr(response, 'close'):
+                response.close()
+
+        return self._measure(call, corpus, concurrency)
+
+    def run_asgi(self, corpus, concurrency):
+        """Memanggil aplikasi ASGI langsung di satu event loop"""
+        application = get_asgi_application()
+        path = reverse('chatbot:send')
+
+        async def call(message):
+            body = self._body(message)
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'POST', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+                'query_string': b'', 'root_path': '',
+                'headers': [
+                    (b'host', b'testserver'),
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode()),
+                ],
+                'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+            }
+            sent = False
+
+            async def receive():
+                nonlocal sent
+                if not sent:
+                    sent = True
+                    return {'type': 'http.request', 'body': body, 'more_body': False}
+                await asyncio.Event().wait()
+
+            async def send(message):
+                pass
+
+            await application(scope, receive, send)
+
+        async def run_all():
+            semaphore = asyncio.Semaphore(concurrency)
+            latencies = []
+
+            async def timed(message):
+                async with semaphore:
+                    start = time.perf_counter()
+                    await call(message)
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(timed(m) for m in corpus))
+            return latencies, time.perf_counter() - start
+
+        latencies, wall = asyncio.run(run_all())
+        return self._summarize(latencies, wall)
+
+    # ------------------------------------------------------------------
+    # Pengukuran
+    # ------------------------------------------------------------------
+
+    def _measure(self, call, corpus, concurrency):
+        latencies = []
+
+        def timed(message):
+            start = time.perf_counter()
+            call(message)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(timed, corpus))
+        else:
+            for message in corpus:
+                timed(message)
+        return self._summarize(latencies, time.perf_counter() - start)
+
+    @staticmethod
+    def _summarize(latencies, wall):
+        latencies = sorted(latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            'requests': len(latencies),
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'p99_ms': percentile(99),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 3) if latencies else 0.0,
+            'throughput_rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        }
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Tanggal')),
+                ('session_count', models.IntegerField(default=0, verbose_name='Jumlah Sesi')),
+                ('message_count', models.IntegerField(default=0, verbose_name='Jumlah Pesan')),
+                ('user_message_count', models.IntegerField(default=0, verbose_name='Pesan User')),
+                ('bot_message_count', models.IntegerField(default=0, verbose_name='Pesan Bot')),
+                ('matched_count', models.IntegerField(default=0, verbose_name='Jawaban Cocok')),
+                ('confidence_sum', models.FloatField(default=0.0)),
+                ('feedback_1', models.IntegerField(default=0)),
+                ('feedback_2', models.IntegerField(default=0)),
+                ('feedback_3', models.IntegerField(default=0)),
+                ('feedback_4', models.IntegerField(default=0)),
+                ('feedback_5', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Statistik Chat Harian',
+                'verbose_name_plural': 'Statistik Chat Harian',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='chatmessage',
+            name='timestamp',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='chatsession',
+            name='last_activity',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -53,7 +53,7 @@ class ChatSession(models.Model):
     session_id = models.CharField(max_length=100, unique=True)
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     started_at = models.DateTimeField(auto_now_add=True)
-    last_activity = models.DateTimeField(auto_now=True)
+    last_activity = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         verbose_name = 'Sesi Chat'
@@ -76,7 +76,7 @@ class ChatMessage(models.Model):
     session = models.ForeignKey(ChatSession, on_delete=models.CASCADE, related_name='messages')
     sender = models.CharField(max_length=10, choices=SENDER_CHOICES)
     message = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
     
     # Untuk analisis
     matched_knowledge = models.ForeignKey(
@@ -89,6 +89,10 @@ class ChatMessage(models.Model):
         verbose_name = 'Pesan Chat'
         verbose_name_plural = 'Pesan Chat'
         ordering = ['timestamp']
+        # Riwayat pesan per sesi (session.messages terurut timestamp)
+        indexes = [
+            models.Index(fields=['session', 'timestamp'], name='chatmessage_session_ts_idx'),
+        ]
     
     def __str__(self):
         return f'{self.sender}: {self.message[:50]}'
@@ -135,3 +139,46 @@ class QuickReply(models.Model):
     
     def __str__(self):
         return self.teks
+
+
+class ChatDailyStat(models.Model):
+    """
+    Model untuk agregat chat harian
+    Disimpan sebelum sesi lama diarsipkan dan dihapus, sehingga analitik tetap ada
+    """
+    date = models.DateField(unique=True, verbose_name='Tanggal')
+    session_count = models.IntegerField(default=0, verbose_name='Jumlah Sesi')
+    message_count = models.IntegerField(default=0, verbose_name='Jumlah Pesan')
+    user_message_count = models.IntegerField(default=0, verbose_name='Pesan User')
+    bot_message_count = models.IntegerField(default=0, verbose_name='Pesan Bot')
+    matched_count = models.IntegerField(default=0, verbose_name='Jawaban Cocok')
+    confidence_sum = models.FloatField(default=0.0)
+    
+    # Distribusi rating feedback
+    feedback_1 = models.IntegerField(default=0)
+    feedback_2 = models.IntegerField(default=0)
+    feedback_3 = models.IntegerField(default=0)
+    feedback_4 = models.IntegerField(default=0)
+    feedback_5 = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Statistik Chat Harian'
+        verbose_name_plural = 'Statistik Chat Harian'
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f'Statistik chat {self.date}'
+    
+    @property
+    def matched_rate(self):
+        """Persentase jawaban bot yang cocok dengan knowledge base"""
+        if not self.bot_message_count:
+            return 0.0
+        return self.matched_count / self.bot_message_count * 100
+    
+    @property
+    def mean_confidence(self):
+        """Rata-rata confidence jawaban bot"""
+        if not self.bot_message_count:
+            return 0.0
+        return self.confidence_sum / self.bot_message_count
@@ -0,0 +1,219 @@
+"""
+Pemrosesan teks Bahasa Indonesia untuk chatbot
+Tokenisasi, stopword, dan stemmer ringan berbasis aturan (tanpa kamus)
+"""
+
+import re
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset('''
+    ada adalah agar akan aku anda apa apakah atau bagaimana bagi bahwa banyak
+    berapa beberapa belum bisa boleh dan dapat dari dengan di dia ini itu ingin jika
+    juga kalau kami kamu kan ke kepada kok lagi mau maupun mereka min nah nya
+    oleh pada para saja saya sih siapa sudah supaya tanya tentang tersebut
+    tolong untuk yang ya yg gimana dong deh kak mohon bapak ibu halo hai
+    kapan dimana mana
+    '''.split())
+
+PARTICLES = ('lah', 'kah', 'tah', 'pun')
+POSSESSIVES = ('nya', 'ku', 'mu')
+VOWELS = 'aiueo'
+
+# Awalan kedua yang boleh menempel setelah awalan pertama (memper-, diber-, dst)
+SECOND_PREFIXES = ('per', 'ber', 'ter', 'pe', 'be')
+
+# Panjang minimal kata dasar agar stemmer tidak memotong terlalu dalam
+MIN_STEM = 3
+
+
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def _strip_prefix(word, allowed=None):
+    """Menghapus satu awalan beserta perubahan bunyinya, mengembalikan (kata, berhasil)"""
+    if allowed is not None:
+        for prefix in allowed:
+            if word.startswith(prefix) and len(word) - len(prefix) >= MIN_STEM:
+                return word[len(prefix):], True
+        return word, False
+    for prefix in ('meny', 'peny'):
+        if word.startswith(prefix) and len(word) > 5 and word[4] in VOWELS:
+            return 's' + word[4:], True
+    for prefix in ('meng', 'peng'):
+        if word.startswith(prefix) and len(word) - 4 >= MIN_STEM:
+            return word[4:], True
+    for prefix in ('mem', 'pem'):
+        if word.startswith(prefix) and len(word) - 3 >= MIN_STEM:
+            rest = word[3:]
+            return ('p' + rest if rest[0] in VOWELS else rest), True
+    for prefix in ('men', 'pen'):
+        if word.startswith(prefix) and len(word) - 3 >= MIN_STEM:
+            rest = word[3:]
+            return ('t' + rest if rest[0] in VOWELS else rest), True
+    for prefix in ('ber', 'ter', 'per'):
+        if word.startswith(prefix) and len(word) - 3 >= MIN_STEM:
+            return word[3:], True
+    for prefix in ('me', 'pe', 'be'):
+        # me-/pe-/be- hanya menempel langsung pada konsonan (melihat, pekerja, bekerja)
+        if word.startswith(prefix) and len(word) - 2 >= MIN_STEM and word[2] not in VOWELS:
+            return word[2:], True
+    for prefix in ('di', 'ke', 'se'):
+        if word.startswith(prefix) and len(word) - 2 >= MIN_STEM:
+            return word[2:], True
+    return word, False
+
+
+@lru_cache(maxsize=20000)
+def stem(word):
+    """
+    Stemmer ringan Bahasa Indonesia (varian sederhana Nazief-Adriani).
+    Tidak harus menghasilkan kata dasar yang benar, cukup konsisten
+    antara pertanyaan pengguna dan isi knowledge base.
+    """
+    if len(word) <= MIN_STEM + 1 or word.isdigit():
+        return word
+
+    word = _strip_suffix(word, PARTICLES)
+    word = _strip_suffix(word, POSSESSIVES)
+
+    word, stripped = _strip_prefix(word)
+    if stripped:
+        word, _ = _strip_prefix(word, SECOND_PREFIXES)
+
+    suffixes = ('kan', 'an', 'i') if stripped else ('kan', 'an')
+    return _strip_suffix(word, suffixes)
+
+
+def tokenize(text):
+    """Memecah teks menjadi token lowercase tanpa stopword"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def analyze(text):
+    """Tokenisasi lalu stemming, dipakai untuk indeks maupun query"""
+    return [stem(t) for t in tokenize(text)]
+
+
+def normalize_query(text):
+    """
+    Bentuk kanonis pertanyaan untuk kunci cache: lowercase dan tanpa tanda baca.
+    Semua token dipertahankan (termasuk stopword dan token pendek) sesuai urutan,
+    karena pencocokan sapaan/kata kunci juga membaca kata-kata tersebut.
+    """
+    return ' '.join(TOKEN_RE.findall(text.lower()))
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """Jarak edit a-b, atau None jika lebih dari max_distance (berhenti lebih awal)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def max_typo_distance(word):
+    """Toleransi salah ketik: kata pendek tidak dikoreksi, kata panjang boleh 2 kesalahan"""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 8 else 2
+
+
+class TrigramIndex:
+    """
+    Indeks trigram karakter untuk mencari term terdekat dalam batas jarak edit.
+    Hanya posting list dari trigram kata yang dicari yang disentuh, jadi biaya
+    pencarian tidak bergantung pada jumlah total term. Term bisa ditambah/dihapus
+    satu per satu tanpa membangun ulang indeks.
+    """
+
+    Q = 3
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._terms = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def grams(cls, term):
+        padded = '$' * (cls.Q - 1) + term + '$' * (cls.Q - 1)
+        return {padded[i:i + cls.Q] for i in range(len(padded) - cls.Q + 1)}
+
+    def __contains__(self, term):
+        return term in self._terms
+
+    def __len__(self):
+        return len(self._terms)
+
+    def add(self, term):
+        with self._lock:
+            if term in self._terms:
+                return
+            self._terms.add(term)
+            for gram in self.grams(term):
+                self._postings[gram].add(term)
+
+    def remove(self, term):
+        with self._lock:
+            if term not in self._terms:
+                return
+            self._terms.discard(term)
+            for gram in self.grams(term):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(term)
+                    if not postings:
+                        del self._postings[gram]
+
+    def sync(self, terms):
+        """Menyamakan isi indeks dengan `terms`, hanya selisihnya yang diproses"""
+        terms = set(terms)
+        for term in self._terms - terms:
+            self.remove(term)
+        for term in terms - self._terms:
+            self.add(term)
+
+    def lookup(self, word, max_distance):
+        """Mengembalikan (term, jarak) terdekat dalam max_distance, atau None"""
+        if max_distance <= 0:
+            return None
+        grams = self.grams(word)
+        with self._lock:
+            shared = Counter()
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings:
+                    shared.update(postings)
+
+        # Filter q-gram: setiap edit merusak paling banyak Q trigram
+        best = None
+        for term, count in shared.items():
+            required = max(len(word), len(term)) + self.Q - 1 - max_distance * self.Q
+            if count < required:
+                continue
+            distance = bounded_levenshtein(word, term, max_distance)
+            if distance is None:
+                continue
+            key = (distance, -count, term)
+            if best is None or key < best[0]:
+                best = (key, term, distance)
+        return (best[1], best[2]) if best else None
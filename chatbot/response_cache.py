@@ -0,0 +1,81 @@
+"""
+Cache jawaban chatbot untuk pertanyaan yang berulang
+LRU in-process dengan TTL, dikosongkan setiap kali version stamp
+ChatbotKnowledge/QuickReply berubah (lihat signals.py).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from main.stamps import bump_stamp
+
+
+# Kunci cache untuk version stamp jawaban, dinaikkan oleh signals
+REPLY_VERSION_KEY = 'chatbot:reply_version'
+
+
+class ResponseCache:
+    """LRU dengan TTL dan penghitung hit/miss"""
+
+    def __init__(self, max_size=1000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        """Mengembalikan jawaban tersimpan untuk `key`, atau None jika tidak ada/kedaluwarsa"""
+        with self._lock:
+            if version != self._version:
+                self._data.clear()
+                self._version = version
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value, version):
+        with self._lock:
+            if version != self._version:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._version = None
+
+    def stats(self):
+        """Statistik cache di proses ini"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+        }
+
+
+def bump_reply_version():
+    """Menaikkan version stamp agar cache jawaban di semua proses dikosongkan"""
+    bump_stamp(REPLY_VERSION_KEY)
+
+
+response_cache = ResponseCache(
+    max_size=getattr(settings, 'CHATBOT_RESPONSE_CACHE_SIZE', 1000),
+    ttl=getattr(settings, 'CHATBOT_RESPONSE_CACHE_TTL', 300),
+)
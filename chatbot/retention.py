@@ -0,0 +1,156 @@
+"""
+Retensi transkrip chat
+Sesi yang lebih lama dari batas retensi diarsipkan ke file JSONL terkompresi,
+agregat hariannya disimpan ke ChatDailyStat, lalu sesi dihapus per chunk
+dalam transaksi pendek agar database tidak terkunci lama.
+"""
+
+import gzip
+import json
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ChatSession, ChatMessage, ChatbotFeedback, ChatDailyStat
+
+
+STAT_FIELDS = (
+    'session_count', 'message_count', 'user_message_count', 'bot_message_count',
+    'matched_count', 'confidence_sum',
+    'feedback_1', 'feedback_2', 'feedback_3', 'feedback_4', 'feedback_5',
+)
+
+
+def _local_date(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _load_chunk(session_ids):
+    """Mengambil sesi, pesan, dan feedback untuk satu chunk dalam tiga query"""
+    sessions = list(ChatSession.objects.filter(pk__in=session_ids).values(
+        'pk', 'session_id', 'ip_address', 'started_at', 'last_activity',
+    ))
+    messages = list(ChatMessage.objects.filter(session_id__in=session_ids).order_by('timestamp', 'pk').values(
+        'pk', 'session_id', 'sender', 'message', 'timestamp', 'matched_knowledge_id', 'confidence_score',
+    ))
+    feedback = list(ChatbotFeedback.objects.filter(message__session_id__in=session_ids).values(
+        'message_id', 'rating', 'komentar', 'created_at',
+    ))
+    return sessions, messages, feedback
+
+
+def _aggregate(sessions, messages, feedback):
+    """Menghitung selisih statistik per tanggal untuk satu chunk"""
+    stats = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    for session in sessions:
+        stats[_local_date(session['started_at'])]['session_count'] += 1
+    for message in messages:
+        day = stats[_local_date(message['timestamp'])]
+        day['message_count'] += 1
+        if message['sender'] == 'user':
+            day['user_message_count'] += 1
+        else:
+            day['bot_message_count'] += 1
+            day['confidence_sum'] += message['confidence_score']
+            if message['matched_knowledge_id']:
+                day['matched_count'] += 1
+    for item in feedback:
+        if 1 <= item['rating'] <= 5:
+            stats[_local_date(item['created_at'])][f'feedback_{item["rating"]}'] += 1
+    return stats
+
+
+def _serialize(sessions, messages, feedback):
+    """Satu baris JSON per sesi, lengkap dengan pesan dan feedback-nya"""
+    feedback_by_message = defaultdict(list)
+    for item in feedback:
+        feedback_by_message[item['message_id']].append({
+            'rating': item['rating'],
+            'komentar': item['komentar'],
+            'created_at': _isoformat(item['created_at']),
+        })
+    messages_by_session = defaultdict(list)
+    for message in messages:
+        messages_by_session[message['session_id']].append({
+            'sender': message['sender'],
+            'message': message['message'],
+            'timestamp': _isoformat(message['timestamp']),
+            'matched_knowledge_id': message['matched_knowledge_id'],
+            'confidence_score': message['confidence_score'],
+            'feedback': feedback_by_message.get(message['pk'], []),
+        })
+    for session in sessions:
+        yield json.dumps({
+            'session_id': session['session_id'],
+            'ip_address': session['ip_address'],
+            'started_at': _isoformat(session['started_at']),
+            'last_activity': _isoformat(session['last_activity']),
+            'messages': messages_by_session.get(session['pk'], []),
+        }, ensure_ascii=False)
+
+
+def _apply_stats(stats):
+    for date, delta in stats.items():
+        stat, _ = ChatDailyStat.objects.get_or_create(date=date)
+        ChatDailyStat.objects.filter(pk=stat.pk).update(
+            **{field: F(field) + value for field, value in delta.items() if value}
+        )
+
+
+def archive_old_sessions(days=None, archive_dir=None, chunk_size=500, dry_run=False, log=None):
+    """
+    Mengarsipkan dan menghapus sesi yang tidak aktif lebih dari `days` hari.
+    Mengembalikan dict ringkasan (jumlah sesi, pesan, dan path arsip).
+    Bisa dipanggil dari cron lewat `manage.py archive_chat_sessions` atau scheduler lain.
+    """
+    days = days if days is not None else getattr(settings, 'CHAT_RETENTION_DAYS', 90)
+    archive_dir = Path(archive_dir or getattr(settings, 'CHAT_ARCHIVE_DIR', settings.BASE_DIR / 'archive' / 'chat'))
+    cutoff = timezone.now() - timedelta(days=days)
+    old_sessions = ChatSession.objects.filter(last_activity__lt=cutoff)
+
+    summary = {'sessions': 0, 'messages': 0, 'archive': None}
+    if dry_run:
+        summary['sessions'] = old_sessions.count()
+        summary['messages'] = ChatMessage.objects.filter(session__last_activity__lt=cutoff).count()
+        return summary
+
+    ids = list(old_sessions.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+    if not ids:
+        return summary
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f'chat-{timezone.now():%Y%m%d-%H%M%S}.jsonl.gz'
+    summary['archive'] = str(path)
+
+    with gzip.open(path, 'wt', encoding='utf-8') as archive:
+        while ids:
+            sessions, messages, feedback = _load_chunk(ids)
+
+            # Tulis arsip dulu; data baru dihapus setelah aman di file
+            for line in _serialize(sessions, messages, feedback):
+                archive.write(line + '\n')
+            archive.flush()
+
+            with transaction.atomic():
+                _apply_stats(_aggregate(sessions, messages, feedback))
+                ChatbotFeedback.objects.filter(message__session_id__in=ids).delete()
+                ChatMessage.objects.filter(session_id__in=ids).delete()
+                ChatSession.objects.filter(pk__in=ids).delete()
+
+            summary['sessions'] += len(sessions)
+            summary['messages'] += len(messages)
+            if log:
+                log(f'{summary["sessions"]} sesi diarsipkan...')
+
+            ids = list(old_sessions.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+
+    return summary
@@ -0,0 +1,26 @@
+"""
+Signals untuk chatbot app
+Menjaga engine dan cache jawaban in-memory tetap sinkron dengan database
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .chatbot import engine, bump_knowledge_version
+from .models import ChatbotKnowledge, QuickReply
+from .response_cache import response_cache, bump_reply_version
+
+
+@receiver([post_save, post_delete], sender=ChatbotKnowledge)
+def knowledge_changed(sender, **kwargs):
+    """Bangun ulang automaton dan indeks BM25 setelah knowledge base berubah"""
+    engine.invalidate()
+    bump_knowledge_version()
+
+
+@receiver([post_save, post_delete], sender=ChatbotKnowledge)
+@receiver([post_save, post_delete], sender=QuickReply)
+def reply_source_changed(sender, **kwargs):
+    """Kosongkan cache jawaban setelah knowledge base atau quick reply berubah"""
+    response_cache.clear()
+    bump_reply_version()
@@ -0,0 +1,156 @@
+"""
+Penyimpanan transkrip chat secara asinkron dan batch
+Request hanya memasukkan pesan ke antrean in-process; thread writer
+menyimpannya ke ChatSession/ChatMessage dalam satu transaksi per batch.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import ChatbotKnowledge, ChatSession, ChatMessage
+
+
+logger = logging.getLogger(__name__)
+
+TranscriptEntry = namedtuple('TranscriptEntry', [
+    'session_id', 'ip_address', 'user_message', 'bot_message',
+    'knowledge_id', 'confidence',
+])
+
+
+class TranscriptWriter:
+    """
+    Writer transkrip di background.
+    Flush dilakukan ketika antrean mencapai `batch_size` entri atau
+    `flush_interval` detik berlalu sejak flush terakhir, mana yang lebih dulu.
+    """
+
+    def __init__(self, batch_size=50, flush_interval=2.0, max_queue=10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.dropped = 0
+
+    def record(self, session_id, ip_address, user_message, bot_message, knowledge_id=None, confidence=0.0):
+        """Memasukkan satu tanya-jawab ke antrean tanpa pernah menunggu database"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(TranscriptEntry(
+                session_id, ip_address, user_message, bot_message, knowledge_id, confidence,
+            ))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='chat-transcript-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                continue
+            # Error di luar _write_batch (mis. close_old_connections) tidak boleh mematikan thread
+            try:
+                self._write(batch)
+            except Exception:
+                logger.exception('Writer transkrip chat gagal, %d entri dibuang', len(batch))
+
+    def _collect(self):
+        """Mengambil entri dari antrean sampai batch penuh atau batas waktu habis"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """Menyimpan semua entri yang masih ada di antrean secara sinkron (dipakai saat shutdown/command)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch):
+        """Menyimpan satu batch: sesi baru dibuat sekaligus, lalu semua pesan di-bulk_create"""
+        with self._flush_lock:
+            close_old_connections()
+            try:
+                with transaction.atomic():
+                    self._write_batch(batch)
+            except Exception:
+                logger.exception('Gagal menyimpan %d transkrip chat', len(batch))
+            finally:
+                close_old_connections()
+
+    def _write_batch(self, batch):
+        session_keys = {entry.session_id for entry in batch}
+        sessions = dict(
+            ChatSession.objects.filter(session_id__in=session_keys).values_list('session_id', 'pk')
+        )
+
+        ip_by_session = {entry.session_id: entry.ip_address for entry in batch}
+        missing = [
+            ChatSession(session_id=key, ip_address=ip_by_session[key])
+            for key in session_keys if key not in sessions
+        ]
+        if missing:
+            ChatSession.objects.bulk_create(missing, ignore_conflicts=True)
+            sessions.update(
+                ChatSession.objects.filter(
+                    session_id__in=[s.session_id for s in missing]
+                ).values_list('session_id', 'pk')
+            )
+
+        # Knowledge yang terhapus sejak request diproses tidak boleh menggagalkan satu batch
+        knowledge_ids = set(ChatbotKnowledge.objects.filter(
+            pk__in={entry.knowledge_id for entry in batch if entry.knowledge_id}
+        ).values_list('pk', flat=True))
+
+        messages = []
+        for entry in batch:
+            session_pk = sessions[entry.session_id]
+            messages.append(ChatMessage(session_id=session_pk, sender='user', message=entry.user_message))
+            messages.append(ChatMessage(
+                session_id=session_pk, sender='bot', message=entry.bot_message,
+                matched_knowledge_id=entry.knowledge_id if entry.knowledge_id in knowledge_ids else None,
+                confidence_score=entry.confidence,
+            ))
+        ChatMessage.objects.bulk_create(messages)
+
+        ChatSession.objects.filter(pk__in=sessions.values()).update(last_activity=timezone.now())
+
+
+transcript_writer = TranscriptWriter(
+    batch_size=getattr(settings, 'CHATBOT_TRANSCRIPT_BATCH_SIZE', 50),
+    flush_interval=getattr(settings, 'CHATBOT_TRANSCRIPT_FLUSH_INTERVAL', 2.0),
+)
+atexit.register(transcript_writer.flush)
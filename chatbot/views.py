@@ -2,11 +2,38 @@
 Views untuk aplikasi Chatbot
 """
 
+import json
+import uuid
+
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
-from .models import ChatbotKnowledge, ChatMessage
+from main.stamps import stamp_cache
+
+from .chatbot import engine
+from .models import QuickReply
+from .nlp import normalize_query
+from .response_cache import response_cache, REPLY_VERSION_KEY
+from .transcript import transcript_writer
+
+
+# Ukuran potongan jawaban saat streaming (karakter, dipotong di batas kata)
+STREAM_CHUNK_SIZE = 80
+
+DEFAULT_RESPONSE = 'Terima kasih atas pertanyaannya. Untuk informasi lebih lanjut, silakan hubungi kami melalui halaman Kontak atau email ke prodi@universitas.ac.id'
+
+
+def get_payload(request):
+    """Membaca pesan dari body JSON (widget) maupun form biasa"""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            data = {}
+        return data if isinstance(data, dict) else {}
+    return request.POST
 
 
 def chatbot_widget(request):
@@ -14,36 +41,120 @@ def chatbot_widget(request):
     return render(request, 'chatbot/widget.html')
 
 
+def get_stream_format(request):
+    """Menentukan format streaming dari query ?stream= atau header Accept, None jika tidak streaming"""
+    stream = request.GET.get('stream', '')
+    accept = request.headers.get('Accept', '')
+    if stream == 'sse' or 'text/event-stream' in accept:
+        return 'sse'
+    if stream in ('1', 'ndjson') or 'application/x-ndjson' in accept:
+        return 'ndjson'
+    return None
+
+
+def split_chunks(text, size=STREAM_CHUNK_SIZE):
+    """Memotong teks menjadi potongan sekitar `size` karakter tanpa memotong kata"""
+    chunk = ''
+    for word in text.split(' '):
+        if chunk and len(chunk) + len(word) + 1 > size:
+            yield chunk + ' '
+            chunk = word
+        else:
+            chunk = f'{chunk} {word}' if chunk else word
+    if chunk:
+        yield chunk
+
+
+async def stream_reply(meta, text, stream_format):
+    """Mengirim metadata, potongan jawaban, lalu penanda selesai"""
+    def encode(event, data):
+        body = json.dumps(dict(data, type=event))
+        if stream_format == 'sse':
+            return f'event: {event}\ndata: {body}\n\n'
+        return body + '\n'
+
+    yield encode('meta', meta)
+    for chunk in split_chunks(text):
+        yield encode('chunk', {'text': chunk})
+    yield encode('done', {})
+
+
+async def build_reply(message):
+    """Menyusun jawaban lengkap untuk satu pesan (tanpa cache)"""
+    # Ranking knowledge base (kata kunci persis + BM25), tanpa menahan thread
+    result, alternatives = None, []
+    try:
+        result, alternatives = await engine.aanswer(message)
+    except Exception:
+        pass
+    
+    if result:
+        return {
+            'response': result.knowledge.jawaban,
+            'link': result.knowledge.link_terkait,
+            'confidence': round(result.confidence, 3),
+            'quick_replies': [alt.knowledge.pertanyaan for alt in alternatives],
+            'knowledge_id': result.knowledge.pk,
+        }
+    
+    # Default response jika tidak ada match yang cukup yakin, dengan saran quick reply
+    quick_replies = QuickReply.objects.filter(is_active=True).values_list('teks', flat=True)[:4]
+    return {
+        'response': DEFAULT_RESPONSE,
+        'link': '',
+        'confidence': 0.0,
+        'quick_replies': [teks async for teks in quick_replies],
+        'knowledge_id': None,
+    }
+
+
 @csrf_exempt
-def chatbot_response(request):
-    """Handle chatbot messages"""
+async def chatbot_response(request):
+    """
+    Handle chatbot messages (async, native di ASGI)
+    Default mengembalikan satu JSON; dengan ?stream=ndjson atau ?stream=sse
+    jawaban dikirim bertahap sebagai JSON lines atau server-sent events.
+    """
     if request.method == 'POST':
-        message = request.POST.get('message', '').lower().strip()
-        
-        # Cari response dari database
-        response_text = None
+        payload = get_payload(request)
+        raw_message = str(payload.get('message', '')).strip()
+        message = raw_message.lower()
         
-        # Cek keyword match
-        try:
-            responses = ChatbotKnowledge.objects.filter(is_active=True).order_by('-prioritas')
-            for resp in responses:
-                keywords = [k.strip().lower() for k in resp.kata_kunci.split(',')]
-                for keyword in keywords:
-                    if keyword in message:
-                        response_text = resp.jawaban
-                        break
-                if response_text:
-                    break
-        except:
-            pass
+        # Pertanyaan yang sama (setelah normalisasi) dijawab dari cache;
+        # pesan tanpa token sama sekali tidak di-cache
+        cache_key = normalize_query(message)
+        version = await stamp_cache.aget(REPLY_VERSION_KEY, 0)
+        reply = response_cache.get(cache_key, version) if cache_key else None
+        if reply is None:
+            reply = await build_reply(message)
+            if cache_key:
+                response_cache.set(cache_key, reply, version)
         
-        # Default response jika tidak ada match
-        if not response_text:
-            response_text = 'Terima kasih atas pertanyaannya. Untuk informasi lebih lanjut, silakan hubungi kami melalui halaman Kontak atau email ke prodi@universitas.ac.id'
+        # Simpan transkrip lewat antrean background (opsional)
+        if getattr(settings, 'CHATBOT_TRANSCRIPT_ENABLED', False) and message:
+            session_id = str(payload.get('session_id') or f'anon_{uuid.uuid4().hex}')[:100]
+            transcript_writer.record(
+                session_id, request.META.get('REMOTE_ADDR'), raw_message, reply['response'],
+                knowledge_id=reply['knowledge_id'], confidence=reply['confidence'],
+            )
         
-        return JsonResponse({
+        meta = {
             'status': 'success',
-            'response': response_text
-        })
+            'link': reply['link'],
+            'confidence': reply['confidence'],
+            'quick_replies': reply['quick_replies'],
+        }
+        
+        stream_format = get_stream_format(request)
+        if stream_format:
+            response = StreamingHttpResponse(
+                stream_reply(meta, reply['response'], stream_format),
+                content_type='text/event-stream' if stream_format == 'sse' else 'application/x-ndjson',
+            )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'
+            return response
+        
+        return JsonResponse(dict(meta, response=reply['response']))
     
     return JsonResponse({'status': 'error'}, status=400)
@@ -5,6 +5,7 @@ Admin configuration untuk karya app
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import KaryaMahasiswa, KategoriKarya, Teknologi
+from main.images import thumbnail_url
 
 
 @admin.register(KategoriKarya)
@@ -63,6 +64,6 @@ class KaryaMahasiswaAdmin(admin.ModelAdmin):
     
     def gambar_preview(self, obj):
         if obj.gambar_utama:
-            return format_html('<img src="{}" width="80" height="50" style="object-fit: cover;" />', obj.gambar_utama.url)
+            return format_html('<img src="{}" width="80" height="50" style="object-fit: cover;" />', thumbnail_url(obj.gambar_utama, 160))
         return '-'
     gambar_preview.short_description = 'Gambar'
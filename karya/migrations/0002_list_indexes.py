@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('karya', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='karyamahasiswa',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='karya_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='karyamahasiswa',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['tahun', '-created_at'], name='karya_tahun_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='karyamahasiswa',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-view_count'], name='karya_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='karyamahasiswa',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-like_count'], name='karya_liked_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='karyamahasiswa',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['-is_featured', '-tahun', '-created_at'], name='karya_featured_idx'),
+        ),
+    ]
@@ -8,6 +8,17 @@ from django.urls import reverse
 from django.utils.text import slugify
 
 
+class KaryaQuerySet(models.QuerySet):
+    """Query karya yang sudah memuat relasi yang dipakai template"""
+
+    def published(self):
+        return self.filter(is_published=True)
+
+    def for_list(self):
+        """Untuk kartu karya: kategori di-join dan teknologi di-prefetch (satu query untuk semua kartu)"""
+        return self.select_related('kategori').prefetch_related('teknologi')
+
+
 class KategoriKarya(models.Model):
     """
     Model untuk kategori karya
@@ -114,10 +125,25 @@ class KaryaMahasiswa(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = KaryaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Karya Mahasiswa'
         verbose_name_plural = 'Karya Mahasiswa'
         ordering = ['-is_featured', '-tahun', '-created_at']
+        # Indeks parsial untuk karya yang dipublikasikan, sesuai urutan dan filter daftar
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_published=True),
+                         name='karya_published_idx'),
+            models.Index(fields=['tahun', '-created_at'], condition=models.Q(is_published=True),
+                         name='karya_tahun_idx'),
+            models.Index(fields=['-view_count'], condition=models.Q(is_published=True),
+                         name='karya_popular_idx'),
+            models.Index(fields=['-like_count'], condition=models.Q(is_published=True),
+                         name='karya_liked_idx'),
+            models.Index(fields=['-is_featured', '-tahun', '-created_at'],
+                         condition=models.Q(is_published=True, is_featured=True), name='karya_featured_idx'),
+        ]
     
     def __str__(self):
         return f'{self.judul} - {self.nama_pembuat}'
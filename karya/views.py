@@ -7,18 +7,31 @@ from django.views.generic import ListView, DetailView
 from django.http import JsonResponse
 from django.db.models import Q
 
-from .models import KaryaMahasiswa, KategoriKarya, Teknologi
+from .models import KaryaMahasiswa
+from main.counters import counters
+from main.fragments import list_widgets
+from main.pagination import CursorPaginationMixin
 
 
-class KaryaListView(ListView):
+# Urutan per nilai ?sort=, juga dipakai sebagai kunci paginasi cursor
+SORT_ORDERING = {
+    'popular': ('-view_count',),
+    'liked': ('-like_count',),
+    'oldest': ('created_at',),
+}
+
+
+class KaryaListView(CursorPaginationMixin, ListView):
     """View untuk daftar karya mahasiswa"""
     model = KaryaMahasiswa
     template_name = 'karya/karya_list.html'
     context_object_name = 'karya_list'
     paginate_by = 12
+    cursor_ordering = ('-created_at',)
+    json_fields = ('judul', 'slug', 'jenis', 'nama_pembuat', 'tahun', 'view_count', 'like_count')
     
     def get_queryset(self):
-        queryset = KaryaMahasiswa.objects.filter(is_published=True)
+        queryset = KaryaMahasiswa.objects.published().for_list()
         
         kategori = self.request.GET.get('kategori')
         if kategori:
@@ -40,31 +53,20 @@ class KaryaListView(ListView):
                 Q(nama_pembuat__icontains=search)
             )
         
-        sort = self.request.GET.get('sort')
-        if sort == 'popular':
-            queryset = queryset.order_by('-view_count')
-        elif sort == 'liked':
-            queryset = queryset.order_by('-like_count')
-        elif sort == 'oldest':
-            queryset = queryset.order_by('created_at')
-        else:
-            queryset = queryset.order_by('-created_at')
-        
-        return queryset
+        return queryset.order_by(*self.get_cursor_ordering())
+    
+    def get_cursor_ordering(self):
+        return SORT_ORDERING.get(self.request.GET.get('sort'), self.cursor_ordering)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['kategori_list'] = KategoriKarya.objects.all()
-        context['tahun_list'] = KaryaMahasiswa.objects.filter(is_published=True).values_list('tahun', flat=True).distinct().order_by('-tahun')
-        context['teknologi_list'] = Teknologi.objects.all()
+        context.update(list_widgets('karya'))
         context['jenis_choices'] = KaryaMahasiswa.JENIS_CHOICES
         context['selected_kategori'] = self.request.GET.get('kategori', '')
         context['selected_tahun'] = self.request.GET.get('tahun', '')
         context['selected_jenis'] = self.request.GET.get('jenis', '')
         context['selected_sort'] = self.request.GET.get('sort', '')
         context['search_query'] = self.request.GET.get('q', '')
-        context['karya_populer'] = KaryaMahasiswa.objects.filter(is_published=True).order_by('-view_count')[:5]
-        context['featured_list'] = KaryaMahasiswa.objects.filter(is_published=True, is_featured=True)[:3]
         return context
 
 
@@ -76,33 +78,31 @@ class KaryaDetailView(DetailView):
     slug_field = 'slug'
     
     def get_queryset(self):
-        return KaryaMahasiswa.objects.filter(is_published=True)
+        return KaryaMahasiswa.objects.published().for_list()
     
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        obj.view_count += 1
-        obj.save()
+        counters.incr(obj, 'view_count')
         return obj
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         karya = self.object
         
-        context['karya_terkait'] = KaryaMahasiswa.objects.filter(
-            is_published=True, kategori=karya.kategori
+        context['karya_terkait'] = KaryaMahasiswa.objects.published().for_list().filter(
+            kategori=karya.kategori
         ).exclude(pk=karya.pk)[:4]
         
         return context
 
 
-def karya_like(request, pk):
+def karya_like(request, slug):
     """AJAX view untuk like karya"""
     if request.method == 'POST':
         try:
-            karya = KaryaMahasiswa.objects.get(pk=pk)
-            karya.like_count += 1
-            karya.save()
-            return JsonResponse({'status': 'success', 'likes_count': karya.like_count})
+            karya = KaryaMahasiswa.objects.get(slug=slug, is_published=True)
+            counters.incr(karya, 'like_count')
+            return JsonResponse({'status': 'liked', 'like_count': karya.like_count})
         except KaryaMahasiswa.DoesNotExist:
             return JsonResponse({'status': 'error'}, status=404)
     return JsonResponse({'status': 'error'}, status=400)
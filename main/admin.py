@@ -2,12 +2,16 @@
 Admin configuration untuk main app
 """
 
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
 from django.utils.html import format_html
 from .models import (
     SiteSettings, ProfilProdi, Kemitraan, PesanKontak,
-    Slider, FAQ, Testimonial, VisitorLog
+    Slider, FAQ, Testimonial, VisitorLog, VisitorStatDaily, Task
 )
+from .images import thumbnail_url
+from .rollups import dashboard
+from .tasks import overdue_tasks
 
 
 @admin.register(SiteSettings)
@@ -80,7 +84,7 @@ class KemitraanAdmin(admin.ModelAdmin):
     
     def logo_preview(self, obj):
         if obj.logo:
-            return format_html('<img src="{}" width="50" height="50" style="object-fit: contain;" />', obj.logo.url)
+            return format_html('<img src="{}" width="50" height="50" style="object-fit: contain;" />', thumbnail_url(obj.logo, 100))
         return '-'
     logo_preview.short_description = 'Logo'
 
@@ -111,7 +115,7 @@ class SliderAdmin(admin.ModelAdmin):
     
     def gambar_preview(self, obj):
         if obj.gambar:
-            return format_html('<img src="{}" width="100" height="50" style="object-fit: cover;" />', obj.gambar.url)
+            return format_html('<img src="{}" width="100" height="50" style="object-fit: cover;" />', thumbnail_url(obj.gambar, 200))
         return '-'
     gambar_preview.short_description = 'Preview'
 
@@ -152,9 +156,11 @@ class VisitorLogAdmin(admin.ModelAdmin):
     """Admin untuk log pengunjung"""
     
     list_display = ('ip_address', 'page_url', 'device_type', 'browser', 'visited_at')
-    list_filter = ('device_type', 'browser', 'visited_at')
+    # Tabel ini besar dan dihapus berkala: tanpa filter DISTINCT/date_hierarchy dan
+    # COUNT(*) penuh. Tren dibaca dari Statistik Pengunjung Harian.
+    list_filter = ('visited_at',)
     search_fields = ('ip_address', 'page_url')
-    date_hierarchy = 'visited_at'
+    show_full_result_count = False
     readonly_fields = ('ip_address', 'user_agent', 'page_url', 'referrer', 'country', 'city', 'device_type', 'browser', 'visited_at')
     
     def has_add_permission(self, request):
@@ -162,3 +168,62 @@ class VisitorLogAdmin(admin.ModelAdmin):
     
     def has_change_permission(self, request, obj=None):
         return False
+
+
+@admin.register(VisitorStatDaily)
+class VisitorStatDailyAdmin(admin.ModelAdmin):
+    """Dashboard analytics pengunjung, hanya membaca tabel agregat"""
+    
+    list_display = ('date', 'dimension', 'value_display', 'view_count')
+    list_filter = ('dimension',)
+    search_fields = ('value',)
+    date_hierarchy = 'date'
+    
+    def value_display(self, obj):
+        return obj.value_display
+    value_display.short_description = 'Nilai'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context['visitor_dashboard'] = dashboard()
+        return super().changelist_view(request, extra_context=extra_context)
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Admin untuk antrian tugas latar belakang"""
+    
+    list_display = ('name', 'status', 'key', 'attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key')
+    readonly_fields = ('name', 'payload', 'key', 'status', 'run_at', 'attempts', 'max_attempts',
+                       'last_error', 'locked_by', 'locked_at', 'created_at', 'finished_at')
+    actions = ['retry_tasks']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def changelist_view(self, request, extra_context=None):
+        overdue = overdue_tasks()
+        if overdue:
+            self.message_user(
+                request,
+                f'{overdue} tugas tertunda melewati jadwal. Pastikan `manage.py run_worker` berjalan.',
+                messages.WARNING,
+            )
+        return super().changelist_view(request, extra_context=extra_context)
+    
+    def retry_tasks(self, request, queryset):
+        # Key yang sudah punya tugas menunggu tidak perlu (dan tidak boleh) diantrekan dua kali
+        pending_keys = Task.objects.filter(status=Task.STATUS_PENDING).exclude(key='').values('key')
+        updated = queryset.filter(status=Task.STATUS_FAILED).exclude(key__in=pending_keys).update(
+            status=Task.STATUS_PENDING, run_at=timezone.now(), attempts=0, finished_at=None,
+        )
+        self.message_user(request, f'{updated} tugas gagal diantrekan ulang.')
+    retry_tasks.short_description = 'Jalankan ulang tugas yang gagal'
@@ -0,0 +1,160 @@
+"""
+Pencatatan kunjungan (VisitorLog) secara batch
+Middleware hanya menambahkan tuple mentah ke ring buffer in-process; parsing
+user agent dan INSERT dilakukan thread writer dengan bulk_create per batch,
+sehingga request tidak pernah menunggu database.
+"""
+
+import atexit
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import VisitorLog
+
+
+logger = logging.getLogger(__name__)
+
+VisitEntry = namedtuple('VisitEntry', ['ip_address', 'user_agent', 'path', 'referrer', 'timestamp'])
+
+# Panjang maksimum URLField VisitorLog
+URL_MAX_LENGTH = 200
+
+# Urutan penting: Edge/Opera memuat "Chrome", Chrome memuat "Safari"
+BROWSER_PATTERNS = [
+    ('Edge', re.compile(r'Edg(?:e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Samsung Internet', re.compile(r'SamsungBrowser/')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Safari', re.compile(r'Safari/')),
+    ('Internet Explorer', re.compile(r'MSIE |Trident/')),
+]
+BOT_RE = re.compile(r'bot|crawl|spider|slurp|curl|wget|python-requests|httpx|headless', re.IGNORECASE)
+TABLET_RE = re.compile(r'iPad|Tablet|Android(?!.*Mobile)', re.IGNORECASE)
+MOBILE_RE = re.compile(r'Mobi|iPhone|iPod|Android|Windows Phone', re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def parse_user_agent(user_agent):
+    """Mengembalikan (device_type, browser); hasil di-cache karena user agent sangat berulang"""
+    if not user_agent:
+        return '', ''
+    if BOT_RE.search(user_agent):
+        return 'bot', 'Bot'
+    if TABLET_RE.search(user_agent):
+        device = 'tablet'
+    elif MOBILE_RE.search(user_agent):
+        device = 'mobile'
+    else:
+        device = 'desktop'
+    for browser, pattern in BROWSER_PATTERNS:
+        if pattern.search(user_agent):
+            return device, browser
+    return device, 'Lainnya'
+
+
+class VisitRecorder:
+    """
+    Ring buffer kunjungan per proses.
+    Buffer berukuran tetap (`buffer_size`): saat penuh, kunjungan tertua ditimpa
+    dan dihitung di `dropped`. Thread writer mengosongkan buffer setiap
+    `flush_interval` detik dengan bulk_create per `batch_size` baris.
+    `sample_rate` < 1 hanya mencatat sebagian request untuk menekan overhead.
+    """
+
+    def __init__(self, buffer_size=10000, batch_size=500, flush_interval=5.0, sample_rate=1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self._buffer = deque(maxlen=buffer_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.dropped = 0
+
+    def record(self, ip_address, user_agent, path, referrer):
+        """Jalur request: hanya sampling dan append ke deque (operasi atomik, tanpa lock)"""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._ensure_started()
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(VisitEntry(ip_address, user_agent, path, referrer, time.time()))
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='visitor-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            # Error apa pun (termasuk dari close_old_connections) tidak boleh menghentikan
+            # writer: thread yang mati membuat buffer terus ditimpa tanpa pernah disimpan
+            try:
+                close_old_connections()
+                try:
+                    self.flush()
+                finally:
+                    close_old_connections()
+            except Exception:
+                logger.exception('Writer log pengunjung gagal, dicoba lagi pada interval berikutnya')
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._buffer.popleft())
+            except IndexError:
+                break
+        return batch
+
+    def flush(self):
+        """Menyimpan semua kunjungan di buffer, mengembalikan jumlah baris yang disimpan"""
+        total = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return total
+                try:
+                    with transaction.atomic():
+                        VisitorLog.objects.bulk_create([self._build(entry) for entry in batch])
+                except Exception:
+                    # Analytics tidak boleh mengganggu situs: batch yang gagal dibuang
+                    logger.exception('Gagal menyimpan %d log pengunjung', len(batch))
+                    return total
+                total += len(batch)
+
+    @staticmethod
+    def _build(entry):
+        device_type, browser = parse_user_agent(entry.user_agent)
+        return VisitorLog(
+            ip_address=entry.ip_address or '0.0.0.0',
+            user_agent=entry.user_agent,
+            page_url=entry.path[:URL_MAX_LENGTH],
+            referrer=entry.referrer[:URL_MAX_LENGTH],
+            device_type=device_type,
+            browser=browser,
+            visited_at=datetime.fromtimestamp(entry.timestamp, tz=dt_timezone.utc),
+        )
+
+
+visit_recorder = VisitRecorder(
+    buffer_size=getattr(settings, 'VISITOR_LOG_BUFFER_SIZE', 10000),
+    batch_size=getattr(settings, 'VISITOR_LOG_BATCH_SIZE', 500),
+    flush_interval=getattr(settings, 'VISITOR_LOG_FLUSH_INTERVAL', 5.0),
+    sample_rate=getattr(settings, 'VISITOR_LOG_SAMPLE_RATE', 1.0),
+)
+atexit.register(visit_recorder.flush)
@@ -5,3 +5,10 @@ class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
     verbose_name = 'Halaman Utama'
+
+    def ready(self):
+        from . import checks  # noqa: F401  (registrasi system check)
+        from .signals import connect_fragment_signals, connect_image_signals, connect_search_signals
+        connect_search_signals()
+        connect_fragment_signals()
+        connect_image_signals()
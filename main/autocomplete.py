@@ -0,0 +1,211 @@
+"""
+Indeks autocomplete untuk live search
+Judul berita, prestasi, dan nama dosen disimpan di memori sebagai array
+kata terurut, sehingga pencarian prefix cukup dengan bisect tanpa query database.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import unicodedata
+from collections import namedtuple
+
+from django.apps import apps
+from django.db import DatabaseError
+from django.urls import reverse
+
+from .stamps import bump_stamp, stamp_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Kunci cache untuk version stamp indeks, dinaikkan setiap ada perubahan
+AUTOCOMPLETE_VERSION_KEY = 'main:autocomplete_version'
+
+AutocompleteSource = namedtuple('AutocompleteSource', ['model', 'label', 'field', 'active', 'popularity', 'url_name'])
+
+# Urutan sumber menentukan urutan tipe di hasil autocomplete
+AUTOCOMPLETE_SOURCES = {
+    'berita': AutocompleteSource('berita.Berita', 'Berita', 'judul', {'is_published': True}, 'view_count', 'berita:detail'),
+    'prestasi': AutocompleteSource('prestasi.Prestasi', 'Prestasi', 'judul', {'is_published': True}, 'view_count', 'prestasi:detail'),
+    'dosen': AutocompleteSource('akademik.Dosen', 'Dosen', 'nama', {'is_active': True}, None, 'akademik:dosen_detail'),
+}
+
+
+class Suggestion(namedtuple('Suggestion', ['kind', 'text', 'slug', 'popularity', 'words'])):
+    __slots__ = ()
+
+    @property
+    def url(self):
+        # reverse() hanya untuk hasil yang ditampilkan, bukan untuk seluruh indeks
+        return reverse(AUTOCOMPLETE_SOURCES[self.kind].url_name, kwargs={'slug': self.slug})
+
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Huruf kecil tanpa diakritik, dipecah per kata"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return WORD_RE.findall(text.lower())
+
+
+def get_model(kind):
+    return apps.get_model(AUTOCOMPLETE_SOURCES[kind].model)
+
+
+def kind_for_model(model):
+    label = model._meta.label
+    for kind, source in AUTOCOMPLETE_SOURCES.items():
+        if source.model == label:
+            return kind
+    return None
+
+
+class AutocompleteIndex:
+    """
+    Indeks prefix per proses.
+    Snapshot berisi dict entri dan list tuple (kata, kunci) terurut; prefix query
+    dicari dengan bisect lalu kandidat diurutkan berdasarkan popularitas (view_count).
+    Dibangun ulang hanya ketika version stamp berubah, perubahan lokal diterapkan
+    langsung ke salinan snapshot sehingga pembaca tidak pernah melihat list setengah jadi.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._snapshot = ({}, [])
+
+    @staticmethod
+    def _make_entry(kind, text, slug, popularity):
+        return Suggestion(kind, text, slug, popularity or 0, tuple(sorted(set(normalize(text)))))
+
+    def _build(self):
+        entries = {}
+        for kind, source in AUTOCOMPLETE_SOURCES.items():
+            fields = ['pk', source.field, 'slug'] + ([source.popularity] if source.popularity else [])
+            rows = get_model(kind).objects.filter(**source.active).values_list(*fields)
+            for pk, text, slug, *popularity in rows.iterator(chunk_size=2000):
+                entries[(kind, pk)] = self._make_entry(kind, text, slug, popularity[0] if popularity else 0)
+        words = sorted((word, key) for key, entry in entries.items() for word in entry.words)
+        return entries, words
+
+    def _refresh(self, version):
+        with self._lock:
+            if version != self._version:
+                self._snapshot = self._build()
+                self._version = version
+
+    def warm(self):
+        """Membangun indeks jika belum ada atau sudah usang"""
+        version = stamp_cache.get(AUTOCOMPLETE_VERSION_KEY, 0)
+        if version != self._version:
+            self._refresh(version)
+
+    @staticmethod
+    def _remove_words(words, key, entry):
+        for word in entry.words:
+            index = bisect.bisect_left(words, (word, key))
+            if index < len(words) and words[index] == (word, key):
+                del words[index]
+
+    def update(self, kind, obj, popularity_only=False):
+        """Menerapkan perubahan satu objek ke indeks lokal"""
+        key = (kind, obj.pk)
+        source = AUTOCOMPLETE_SOURCES[kind]
+        with self._lock:
+            if self._version is None:
+                return
+            entries, words = self._snapshot
+            old = entries.get(key)
+            if popularity_only:
+                # Hanya jumlah view yang berubah: list kata tidak perlu disalin
+                if old is not None and source.popularity:
+                    entries = dict(entries)
+                    entries[key] = old._replace(popularity=getattr(obj, source.popularity))
+                    self._snapshot = (entries, words)
+                return
+            entries, words = dict(entries), list(words)
+            if old is not None:
+                self._remove_words(words, key, old)
+                del entries[key]
+            if all(getattr(obj, field) == value for field, value in source.active.items()):
+                popularity = getattr(obj, source.popularity) if source.popularity else 0
+                entry = self._make_entry(kind, getattr(obj, source.field), obj.slug, popularity)
+                entries[key] = entry
+                for word in entry.words:
+                    bisect.insort(words, (word, key))
+            self._snapshot = (entries, words)
+
+    def remove(self, kind, pk):
+        key = (kind, pk)
+        with self._lock:
+            entries, words = self._snapshot
+            if key in entries:
+                entries, words = dict(entries), list(words)
+                self._remove_words(words, key, entries.pop(key))
+                self._snapshot = (entries, words)
+
+    def mark_current(self, previous, version):
+        """Indeks lokal sudah memuat perubahan sendiri, jadi tidak perlu build ulang untuk versi ini"""
+        with self._lock:
+            if self._version == previous:
+                self._version = version
+
+    @staticmethod
+    def _prefix_keys(words, prefix):
+        keys = set()
+        index = bisect.bisect_left(words, (prefix,))
+        while index < len(words) and words[index][0].startswith(prefix):
+            keys.add(words[index][1])
+            index += 1
+        return keys
+
+    def suggest(self, query, per_kind=3, limit=10):
+        """
+        Mengembalikan daftar Suggestion yang semua kata query-nya cocok
+        sebagai prefix kata di judul/nama, maksimal `per_kind` per tipe.
+        """
+        self.warm()
+        terms = normalize(query)
+        if not terms:
+            return []
+        entries, words = self._snapshot
+
+        # Mulai dari term terpanjang (paling selektif)
+        terms.sort(key=len, reverse=True)
+        candidates = [entries[key] for key in self._prefix_keys(words, terms[0]) if key in entries]
+        candidates.sort(key=lambda entry: (-entry.popularity, entry.text))
+
+        # Term lain dicek berurutan dari kandidat terpopuler, berhenti begitu semua tipe penuh
+        picked = {kind: [] for kind in AUTOCOMPLETE_SOURCES}
+        remaining = len(picked)
+        for entry in candidates:
+            bucket = picked[entry.kind]
+            if len(bucket) >= per_kind:
+                continue
+            if all(any(word.startswith(term) for word in entry.words) for term in terms[1:]):
+                bucket.append(entry)
+                if len(bucket) == per_kind:
+                    remaining -= 1
+                    if not remaining:
+                        break
+        return [entry for bucket in picked.values() for entry in bucket][:limit]
+
+
+def bump_autocomplete_version():
+    """Menaikkan version stamp, mengembalikan (versi lama, versi baru)"""
+    version = bump_stamp(AUTOCOMPLETE_VERSION_KEY)
+    return version - 1, version
+
+
+autocomplete = AutocompleteIndex()
+
+
+def warm_autocomplete():
+    """Dipanggil dari wsgi.py/asgi.py; jika database belum siap, indeks dibangun saat request pertama"""
+    try:
+        autocomplete.warm()
+    except DatabaseError:
+        logger.warning('Indeks autocomplete gagal dibangun saat startup', exc_info=True)
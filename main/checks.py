@@ -0,0 +1,32 @@
+"""
+System check untuk deployment main app
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.db import DatabaseError
+
+
+@register(Tags.database)
+def check_task_worker(app_configs, databases=None, **kwargs):
+    """
+    Memperingatkan jika ada tugas latar belakang yang tertunda lama, artinya
+    `manage.py run_worker` tidak berjalan dan turunan gambar/cache fragmen usang.
+    Ikut dijalankan oleh `migrate` dan `check --database default`.
+    """
+    if not databases or 'default' not in databases or getattr(settings, 'TASKS_EAGER', False):
+        return []
+    from .tasks import overdue_tasks
+    try:
+        count = overdue_tasks()
+    except DatabaseError:
+        # Tabel Task belum dibuat (sebelum migrate)
+        return []
+    if not count:
+        return []
+    return [Warning(
+        f'{count} tugas latar belakang tertunda lebih dari '
+        f'{getattr(settings, "TASK_OVERDUE_WARNING", 600)} detik.',
+        hint='Pastikan `python manage.py run_worker` berjalan (systemd/supervisor) atau set TASKS_EAGER=True.',
+        id='main.W001',
+    )]
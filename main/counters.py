@@ -0,0 +1,180 @@
+"""
+Counter write-behind untuk view, share, like, dan helpful
+Kenaikan counter dikumpulkan di memori lalu di-flush berkala dengan
+UPDATE ... SET field = field + n (F()), sehingga request tidak lagi
+menyimpan seluruh baris dan increment dari banyak proses tidak saling menimpa.
+Karena .update() tidak memicu post_save, setelah flush counter sendiri yang
+memperbarui popularitas autocomplete dan menaikkan version fragmen/halaman
+(dibatasi paling sering sekali per `invalidate_interval` detik per model).
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """
+    Buffer counter per proses.
+    Kunci buffer adalah (model, pk, field); flush dilakukan setiap `flush_interval`
+    detik atau lebih cepat jika jumlah kunci mencapai `max_pending`.
+    Delta yang gagal di-flush dikembalikan ke buffer agar tidak hilang.
+    `flush_interval` <= 0 berarti setiap increment langsung di-flush (tanpa thread).
+    """
+
+    def __init__(self, flush_interval=5.0, max_pending=1000, invalidate_interval=60.0):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.invalidate_interval = invalidate_interval
+        self._stale = set()
+        self._invalidated = {}
+        self._pending = defaultdict(int)
+        self._flushing = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def incr(self, obj, field, amount=1):
+        """
+        Menambah counter `field` milik `obj` dan memperbarui atribut obj,
+        sehingga view langsung menampilkan nilai yang sudah termasuk increment-nya sendiri.
+        """
+        key = (type(obj), obj.pk, field)
+        with self._lock:
+            self._pending[key] += amount
+            total = self._pending[key] + self._flushing.get(key, 0)
+            size = len(self._pending)
+        setattr(obj, field, getattr(obj, field) + total)
+
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._ensure_started()
+            if size >= self.max_pending:
+                self._wakeup.set()
+        return getattr(obj, field)
+
+    def pending(self, model, pk, field):
+        """Delta yang belum tersimpan di database untuk satu counter"""
+        key = (model, pk, field)
+        with self._lock:
+            return self._pending.get(key, 0) + self._flushing.get(key, 0)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='counter-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            # Error di luar flush (mis. close_old_connections) tidak boleh mematikan thread
+            try:
+                close_old_connections()
+                try:
+                    self.flush()
+                finally:
+                    close_old_connections()
+            except Exception:
+                logger.exception('Flusher counter gagal, dicoba lagi pada interval berikutnya')
+
+    def flush(self):
+        """Menyimpan semua delta ke database, mengembalikan jumlah counter yang di-flush"""
+        with self._flush_lock:
+            with self._lock:
+                batch = dict(self._pending)
+                if batch:
+                    self._flushing, self._pending = batch, defaultdict(int)
+            if not batch:
+                # Model yang tertahan throttle tetap di-invalidate pada tick berikutnya
+                self._invalidate_stale()
+                return 0
+
+            try:
+                with transaction.atomic():
+                    self._write(batch)
+            except Exception:
+                logger.exception('Gagal menyimpan %d counter, dicoba lagi pada flush berikutnya', len(batch))
+                with self._lock:
+                    for key, amount in batch.items():
+                        self._pending[key] += amount
+                    self._flushing = {}
+                return 0
+
+            with self._lock:
+                self._flushing = {}
+            self._after_write(batch)
+            return len(batch)
+
+    def _after_write(self, batch):
+        """Efek yang biasanya dijalankan signal post_save; error hanya dicatat"""
+        try:
+            self._update_autocomplete(batch)
+        except Exception:
+            logger.exception('Gagal memperbarui popularitas autocomplete setelah flush counter')
+        self._stale.update(model for model, pk, field in batch)
+        self._invalidate_stale()
+
+    @staticmethod
+    def _update_autocomplete(batch):
+        """Total baru counter popularitas (view_count) dibaca ulang lalu diterapkan ke indeks lokal"""
+        from . import autocomplete as ac
+
+        groups = defaultdict(set)
+        for model, pk, field in batch:
+            kind = ac.kind_for_model(model)
+            if kind and field == ac.AUTOCOMPLETE_SOURCES[kind].popularity:
+                groups[(model, kind, field)].add(pk)
+        for (model, kind, field), pks in groups.items():
+            for obj in model._base_manager.filter(pk__in=pks).only(field):
+                ac.autocomplete.update(kind, obj, popularity_only=True)
+
+    def _invalidate_stale(self):
+        """Naikkan version fragmen dan validator halaman untuk model yang counternya berubah"""
+        if not self._stale:
+            return
+        from .signals import invalidate_fragments
+
+        now = time.monotonic()
+        for model in list(self._stale):
+            if now - self._invalidated.get(model, float('-inf')) < self.invalidate_interval:
+                continue
+            try:
+                invalidate_fragments(model)
+            except Exception:
+                logger.exception('Gagal meng-invalidate cache untuk %s setelah flush counter', model._meta.label)
+                continue
+            self._invalidated[model] = now
+            self._stale.discard(model)
+
+    @staticmethod
+    def _write(batch):
+        """Satu UPDATE per (model, field, delta) untuk semua pk dengan delta yang sama"""
+        groups = defaultdict(list)
+        for (model, pk, field), amount in batch.items():
+            if amount:
+                groups[(model, field, amount)].append(pk)
+        for (model, field, amount), pks in groups.items():
+            model._base_manager.filter(pk__in=pks).update(**{field: F(field) + amount})
+
+
+counters = CounterBuffer(
+    flush_interval=getattr(settings, 'COUNTER_FLUSH_INTERVAL', 5.0),
+    max_pending=getattr(settings, 'COUNTER_MAX_PENDING', 1000),
+    invalidate_interval=getattr(settings, 'COUNTER_INVALIDATE_INTERVAL', 60.0),
+)
+atexit.register(counters.flush)
@@ -0,0 +1,236 @@
+"""
+Cache fragmen HTML dan data widget
+Setiap fragmen dirender (atau dihitung) sekali lalu disimpan di cache Django.
+Kunci fragmen memuat version stamp miliknya sendiri (alias cache `stamps`,
+main/stamps.py); signal menaikkan version
+semua fragmen yang bergantung pada model yang berubah, sehingga tiap bagian
+halaman diperbarui sendiri-sendiri tanpa menghapus cache bagian lain.
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .stamps import STAMP_CACHE_ALIAS, bump_stamp, fresh_stamp, stamp_cache
+
+
+Fragment = namedtuple('Fragment', ['template', 'models', 'context'])
+
+
+def version_key(name):
+    return f'fragment:{name}:version'
+
+
+class FragmentCache:
+    """
+    Registry fragmen: nama -> (template, label model dependensi, fungsi konteks).
+    Fungsi konteks hanya dipanggil saat fragmen belum ada di cache.
+    Fragmen tanpa template menyimpan hasil fungsi konteks itu sendiri (dict),
+    untuk widget yang HTML-nya bergantung pada filter yang sedang aktif.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._fragments = {}
+        self._dependents = {}
+
+    def register(self, name, template, models, context):
+        self._fragments[name] = Fragment(template, tuple(models), context)
+        for label in models:
+            self._dependents.setdefault(label.lower(), set()).add(name)
+
+    def _get_many(self, names, build):
+        """
+        Mengembalikan dict nama -> nilai cache. Dalam kondisi normal cukup dua
+        get_many ke cache (version lalu fragmen) tanpa query database.
+        """
+        versions = stamp_cache.get_many([version_key(name) for name in names])
+        for name in names:
+            key = version_key(name)
+            if key not in versions:
+                # Version yang hilang tidak boleh kembali ke nilai lama (fragmen usang masih di cache)
+                stamp_cache.add(key, fresh_stamp(), None)
+                versions[key] = stamp_cache.get(key)
+        keys = {name: f'fragment:{name}:{versions[version_key(name)]}' for name in names}
+        cached = cache.get_many(list(keys.values()))
+
+        values = {}
+        missing = {}
+        for name, key in keys.items():
+            if key in cached:
+                values[name] = cached[key]
+            else:
+                values[name] = missing[key] = build(self._fragments[name])
+        if missing:
+            cache.set_many(missing, self.timeout)
+        return values
+
+    def render_many(self, names):
+        """Mengembalikan dict nama -> HTML aman"""
+        rendered = self._get_many(names, lambda fragment: render_to_string(fragment.template, fragment.context()))
+        return {name: mark_safe(html) for name, html in rendered.items()}
+
+    def render(self, name):
+        return self.render_many([name])[name]
+
+    def context(self, names):
+        """Menggabungkan dict hasil fragmen data (tanpa template) untuk konteks view"""
+        merged = {}
+        for data in self._get_many(names, lambda fragment: fragment.context()).values():
+            merged.update(data)
+        return merged
+
+    def invalidate(self, name):
+        """Menaikkan version satu fragmen; fragmen lama dibiarkan kedaluwarsa sendiri"""
+        bump_stamp(version_key(name))
+
+    def invalidate_model(self, model):
+        for name in self._dependents.get(model._meta.label_lower, ()):
+            self.invalidate(name)
+
+    def depends_on(self, model):
+        return model._meta.label_lower in self._dependents
+
+
+fragments = FragmentCache(timeout=getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600))
+
+
+# ----------------------------------------------------------------------
+# Bagian halaman utama
+# ----------------------------------------------------------------------
+
+def _home_about():
+    from .models import ProfilProdi, SiteSettings
+    return {'profil': ProfilProdi.objects.first(), 'site_settings': SiteSettings.get_settings()}
+
+
+def _home_berita():
+    from berita.models import Berita
+    return {'berita_list': list(
+        Berita.objects.published().for_list().order_by('-published_at')[:6]
+    )}
+
+
+def _home_prestasi():
+    from prestasi.models import Prestasi
+    return {'prestasi_list': list(Prestasi.objects.published().order_by('-tanggal')[:8])}
+
+
+def _home_karya():
+    from karya.models import KaryaMahasiswa
+    return {'karya_list': list(
+        KaryaMahasiswa.objects.published().for_list().order_by('-created_at')[:6]
+    )}
+
+
+def _home_testimonial():
+    from .models import Testimonial
+    return {'testimonial_list': list(Testimonial.objects.filter(is_active=True, is_featured=True)[:4])}
+
+
+def _home_kemitraan():
+    from .models import Kemitraan
+    return {'kemitraan_list': list(Kemitraan.objects.filter(is_active=True)[:10])}
+
+
+HOME_SECTIONS = {
+    'about': (['main.ProfilProdi', 'main.SiteSettings'], _home_about),
+    'berita': (['berita.Berita', 'berita.KategoriBerita'], _home_berita),
+    'prestasi': (['prestasi.Prestasi'], _home_prestasi),
+    'karya': (['karya.KaryaMahasiswa', 'karya.Teknologi'], _home_karya),
+    'testimonial': (['main.Testimonial'], _home_testimonial),
+    'kemitraan': (['main.Kemitraan'], _home_kemitraan),
+}
+
+for _section, (_models, _context) in HOME_SECTIONS.items():
+    fragments.register(f'home:{_section}', f'main/home/{_section}.html', _models, _context)
+
+
+def render_home_sections():
+    """Dict nama bagian -> HTML untuk template main/home.html"""
+    rendered = fragments.render_many([f'home:{section}' for section in HOME_SECTIONS])
+    return {section: rendered[f'home:{section}'] for section in HOME_SECTIONS}
+
+
+# ----------------------------------------------------------------------
+# Widget daftar berita dan karya (sama untuk semua halaman dan filter)
+# ----------------------------------------------------------------------
+
+def _berita_kategori():
+    from berita.models import KategoriBerita
+    return {'kategori_list': list(KategoriBerita.objects.with_berita_count())}
+
+
+def _berita_tags():
+    from berita.models import TagBerita
+    return {'tag_list': list(TagBerita.objects.all()[:20])}
+
+
+def _berita_populer():
+    from berita.models import Berita
+    return {'popular_list': list(Berita.objects.published().order_by('-view_count')[:5])}
+
+
+def _berita_featured():
+    from berita.models import Berita
+    return {'featured_list': list(Berita.objects.published().for_list().filter(is_featured=True)[:3])}
+
+
+def _karya_filters():
+    from karya.models import KaryaMahasiswa, KategoriKarya
+    return {
+        'kategori_list': list(KategoriKarya.objects.all()),
+        'tahun_list': list(
+            KaryaMahasiswa.objects.published().values_list('tahun', flat=True).distinct().order_by('-tahun')
+        ),
+    }
+
+
+def _karya_teknologi():
+    from karya.models import Teknologi
+    return {'teknologi_list': list(Teknologi.objects.all())}
+
+
+def _karya_featured():
+    from karya.models import KaryaMahasiswa
+    return {'featured_list': list(KaryaMahasiswa.objects.published().for_list().filter(is_featured=True)[:3])}
+
+
+LIST_WIDGETS = {
+    'berita:kategori': (['berita.KategoriBerita', 'berita.Berita'], _berita_kategori),
+    'berita:tags': (['berita.TagBerita'], _berita_tags),
+    'berita:populer': (['berita.Berita'], _berita_populer),
+    'berita:featured': (['berita.Berita', 'berita.KategoriBerita'], _berita_featured),
+    'karya:filters': (['karya.KategoriKarya', 'karya.KaryaMahasiswa'], _karya_filters),
+    'karya:teknologi': (['karya.Teknologi'], _karya_teknologi),
+    'karya:featured': (['karya.KaryaMahasiswa', 'karya.KategoriKarya', 'karya.Teknologi'], _karya_featured),
+}
+
+for _name, (_models, _context) in LIST_WIDGETS.items():
+    fragments.register(_name, None, _models, _context)
+
+
+def warm_fragments():
+    """Render ulang semua fragmen yang kedaluwarsa (dipanggil tugas latar belakang setelah invalidasi)"""
+    render_home_sections()
+    for app in {name.split(':')[0] for name in LIST_WIDGETS}:
+        list_widgets(app)
+
+
+def cache_is_shared():
+    """
+    False jika cache default atau alias stamps per proses (locmem/dummy):
+    pemanasan dan invalidasi dari proses lain tidak terlihat oleh web
+    """
+    return not any(
+        settings.CACHES[alias]['BACKEND'].endswith(('LocMemCache', 'DummyCache'))
+        for alias in ('default', STAMP_CACHE_ALIAS)
+    )
+
+
+def list_widgets(app):
+    """Konteks widget untuk halaman daftar `app` ('berita' atau 'karya')"""
+    return fragments.context([name for name in LIST_WIDGETS if name.startswith(f'{app}:')])
@@ -0,0 +1,200 @@
+"""
+Turunan gambar responsif
+Setiap gambar unggahan yang terdaftar di IMAGE_FIELDS dibuatkan versi kecil pada
+lebar tetap (IMAGE_DERIVATIVE_WIDTHS), dalam format modern (WebP, atau AVIF jika
+didukung Pillow) ditambah format fallback sesuai ekstensi asli (JPEG/PNG).
+File turunan disimpan di samping file asli, mis. berita/foto.jpg ->
+berita/foto.640w.webp dan berita/foto.640w.jpg, sehingga URL-nya bisa dihitung
+tanpa query. Dipakai template tag `{% picture %}` dan filter `srcset`
+(main/templatetags/image_tags.py) serta preview di admin.
+"""
+
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+
+logger = logging.getLogger(__name__)
+
+# label model -> field gambar yang dibuatkan turunan
+IMAGE_FIELDS = {
+    'berita.Berita': ['gambar_utama'],
+    'berita.GaleriBerita': ['gambar'],
+    'karya.KaryaMahasiswa': ['gambar_utama', 'gambar_2', 'gambar_3'],
+    'main.Slider': ['gambar'],
+    'main.Kemitraan': ['logo'],
+    'akademik.Dosen': ['foto'],
+}
+
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+SAVE_OPTIONS = {
+    'avif': {'quality': 60},
+    'webp': {'quality': 80, 'method': 4},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+    'png': {'optimize': True},
+}
+
+# Hasil negatif (turunan belum dibuat) di-cache sebentar agar backfill segera terlihat
+MISSING_TIMEOUT = 300
+
+
+def derivative_widths():
+    return sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 640, 960, 1280)))
+
+
+def modern_formats():
+    """Format modern yang diminta settings dan didukung Pillow di server ini"""
+    requested = getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', ('webp',))
+    return [fmt for fmt in requested if fmt in ('avif', 'webp') and features.check(fmt)]
+
+
+def fallback_format(name):
+    """PNG tetap PNG (transparansi logo), selain itu JPEG"""
+    return 'png' if name.lower().endswith('.png') else 'jpeg'
+
+
+def output_formats(name):
+    return [*modern_formats(), fallback_format(name)]
+
+
+def target_widths(original_width):
+    """Lebar turunan untuk gambar selebar `original_width`; tidak pernah memperbesar"""
+    return sorted({min(width, original_width) for width in derivative_widths()})
+
+
+def derivative_name(name, width, fmt):
+    root, _ = posixpath.splitext(name)
+    return f'{root}.{width}w.{EXTENSIONS[fmt]}'
+
+
+def _widths_key(name):
+    return 'images:widths:' + hashlib.md5(name.encode()).hexdigest()
+
+
+def _oriented_width(image):
+    """Lebar setelah rotasi EXIF, hanya dari header (tanpa decode piksel)"""
+    # Orientasi 5-8 berarti gambar diputar 90/270 derajat
+    if image.getexif().get(0x0112) in (5, 6, 7, 8):
+        return image.height
+    return image.width
+
+
+def _encode(image, fmt):
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        # JPEG tanpa alpha: latar putih untuk gambar transparan
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    elif fmt in ('avif', 'webp') and image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    buffer = BytesIO()
+    image.save(buffer, format=fmt.upper(), **SAVE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def generate_derivatives(name, force=False, storage=None):
+    """
+    Membuat semua turunan untuk file `name` di storage.
+    Turunan yang sudah ada dilewati kecuali `force`. Mengembalikan daftar lebar.
+    Tidak menyentuh database, sehingga aman dijalankan di process pool.
+    """
+    storage = storage or default_storage
+    with storage.open(name) as source, Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        widths = target_widths(width)
+        formats = output_formats(name)
+        for target in widths:
+            pending = [fmt for fmt in formats
+                       if force or not storage.exists(derivative_name(name, target, fmt))]
+            if not pending:
+                continue
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS, reducing_gap=3.0,
+            )
+            for fmt in pending:
+                path = derivative_name(name, target, fmt)
+                if storage.exists(path):
+                    storage.delete(path)
+                storage.save(path, ContentFile(_encode(resized, fmt)))
+    cache.set(_widths_key(name), widths, None)
+    return widths
+
+
+def available_widths(name):
+    """
+    Lebar turunan yang tersedia untuk `name` ([] jika belum dibuat).
+    Di-cache per nama file; saat cache kosong dicek lewat storage dan header gambar.
+    """
+    key = _widths_key(name)
+    widths = cache.get(key)
+    if widths is not None:
+        return widths
+    widths = []
+    try:
+        with default_storage.open(name) as source, Image.open(source) as image:
+            widths = target_widths(_oriented_width(image))
+        if not default_storage.exists(derivative_name(name, widths[0], fallback_format(name))):
+            widths = []
+    except (OSError, ValueError):
+        widths = []
+    cache.set(key, widths, None if widths else MISSING_TIMEOUT)
+    return widths
+
+
+def srcset(field_file, fmt=None):
+    """String srcset ('url 320w, url 640w') untuk format `fmt` (default: fallback)"""
+    if not field_file:
+        return ''
+    name = field_file.name
+    fmt = fmt or fallback_format(name)
+    return ', '.join(
+        f'{default_storage.url(derivative_name(name, width, fmt))} {width}w'
+        for width in available_widths(name)
+    )
+
+
+def thumbnail_url(field_file, width):
+    """URL turunan terkecil yang lebarnya >= `width` (format modern pertama), atau file asli"""
+    if not field_file:
+        return ''
+    name = field_file.name
+    widths = available_widths(name)
+    if not widths:
+        return field_file.url
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    return default_storage.url(derivative_name(name, chosen, output_formats(name)[0]))
+
+
+def image_fields():
+    """(model, nama field) untuk semua field di IMAGE_FIELDS"""
+    for label, names in IMAGE_FIELDS.items():
+        model = apps.get_model(label)
+        for name in names:
+            yield model, name
+
+
+def process_instance(instance, fields=None):
+    """
+    Membuat turunan yang belum ada untuk field gambar `instance`.
+    Dijalankan tugas latar belakang (main/tasks.py): error lain diteruskan agar
+    tugas dicoba ulang, file asli yang hilang cukup dicatat.
+    """
+    for name in fields or IMAGE_FIELDS[instance._meta.label]:
+        field_file = getattr(instance, name)
+        if not field_file or available_widths(field_file.name):
+            continue
+        try:
+            generate_derivatives(field_file.name)
+        except FileNotFoundError:
+            logger.warning('File gambar %s tidak ditemukan, turunan tidak dibuat', field_file.name)
@@ -0,0 +1,45 @@
+"""
+Cek rencana eksekusi query daftar yang terdaftar di main/queryplans.py
+
+Gagal (exit code 1) jika ada query yang melakukan full table scan atau sort
+tanpa indeks, sehingga regresi indeks tertangkap di CI setelah migrate.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main.queryplans import LIST_QUERIES, explain, plan_issues
+
+
+class Command(BaseCommand):
+    help = 'Jalankan EXPLAIN QUERY PLAN untuk semua query daftar dan tandai full scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Nama query (default: semua)')
+        parser.add_argument('--plan', action='store_true', help='Tampilkan rencana lengkap setiap query')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('explain_queries hanya mendukung SQLite (EXPLAIN QUERY PLAN).')
+
+        names = options['names'] or list(LIST_QUERIES)
+        unknown = set(names) - set(LIST_QUERIES)
+        if unknown:
+            raise CommandError(f'Query tidak dikenal: {", ".join(sorted(unknown))}')
+
+        failed = []
+        for name in names:
+            plan = explain(LIST_QUERIES[name]())
+            issues = plan_issues(plan)
+            if issues:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: ' + '; '.join(issue.detail for issue in issues)))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: OK'))
+            if options['plan'] or issues:
+                for detail in plan:
+                    self.stdout.write(f'    {detail}')
+
+        if failed:
+            raise CommandError(f'{len(failed)} dari {len(names)} query tanpa indeks yang sesuai.')
+        self.stdout.write(self.style.SUCCESS(f'{len(names)} query memakai indeks.'))
@@ -0,0 +1,79 @@
+"""
+Buat turunan responsif (main/images.py) untuk semua gambar yang sudah ada
+
+Gambar diproses paralel di process pool; turunan yang sudah ada dilewati
+kecuali dengan --force (mis. setelah mengubah IMAGE_DERIVATIVE_WIDTHS/FORMATS).
+
+Contoh:
+    python manage.py generate_image_derivatives --workers 4
+    python manage.py generate_image_derivatives berita.Berita --force
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from main.images import IMAGE_FIELDS, generate_derivatives, image_fields
+
+
+class Command(BaseCommand):
+    help = 'Buat turunan WebP/AVIF/JPEG untuk gambar unggahan yang sudah ada (paralel)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='Label model, mis. berita.Berita (default: semua di IMAGE_FIELDS)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Jumlah proses (default: jumlah CPU)')
+        parser.add_argument('--force', action='store_true', help='Buat ulang turunan yang sudah ada')
+
+    def collect(self, labels):
+        names = set()
+        for model, field in image_fields():
+            if labels and model._meta.label not in labels:
+                continue
+            names.update(model._base_manager.exclude(**{field: ''}).values_list(field, flat=True))
+        return sorted(names)
+
+    def handle(self, *args, **options):
+        unknown = set(options['models']) - set(IMAGE_FIELDS)
+        if unknown:
+            raise CommandError(f'Model tidak terdaftar di IMAGE_FIELDS: {", ".join(sorted(unknown))}')
+
+        names = self.collect(options['models'])
+        if not names:
+            self.stdout.write('Tidak ada gambar yang perlu diproses.')
+            return
+
+        failed = 0
+        for done, (name, widths, error) in enumerate(self.process(names, options['workers'], options['force']), 1):
+            if error is not None:
+                failed += 1
+                self.stderr.write(f'{name}: {error}')
+            elif options['verbosity'] > 1:
+                self.stdout.write(f'[{done}/{len(names)}] {name}: {", ".join(map(str, widths))}')
+
+        message = f'{len(names) - failed} dari {len(names)} gambar diproses.'
+        if failed:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def process(self, names, workers, force):
+        """Menghasilkan (nama, lebar, error) per gambar sesuai urutan selesai"""
+        if workers <= 1:
+            for name in names:
+                try:
+                    yield name, generate_derivatives(name, force), None
+                except Exception as exc:
+                    yield name, None, exc
+            return
+
+        # Koneksi database tidak boleh diwarisi proses anak (worker tidak memakai database)
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            futures = {executor.submit(generate_derivatives, name, force): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as exc:
+                    yield futures[future], None, exc
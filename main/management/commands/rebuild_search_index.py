@@ -0,0 +1,21 @@
+"""
+Bangun ulang indeks pencarian global dari isi database
+
+Jalankan sekali setelah migrate, atau setelah import data massal
+(bulk_create/update tidak memicu signal).
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang indeks pencarian global (berita, prestasi, karya, FAQ, dosen)'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        total = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} dokumen diindeks dengan {backend.__class__.__name__}.'
+        ))
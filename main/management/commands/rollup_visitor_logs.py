@@ -0,0 +1,48 @@
+"""
+Agregasi VisitorLog ke statistik per jam dan harian, lalu hapus log mentah lama
+
+Contoh (cron setiap 15 menit, hapus log mentah sekali sehari):
+    */15 * * * * cd /path/ke/project && python manage.py rollup_visitor_logs
+    30 2 * * * cd /path/ke/project && python manage.py rollup_visitor_logs --prune --days 30
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.rollups import RollupConflict, prune_visitor_logs, rollup_visitor_logs
+
+
+class Command(BaseCommand):
+    help = 'Agregasi VisitorLog baru ke VisitorStatHourly/VisitorStatDaily dan (opsional) hapus log lama'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Jumlah log per transaksi')
+        parser.add_argument('--prune', action='store_true', help='Hapus log mentah yang sudah diagregasi')
+        parser.add_argument('--days', type=int, help='Retensi log mentah dalam hari (default: VISITOR_LOG_RETENTION_DAYS)')
+        parser.add_argument('--hourly-days', type=int,
+                            help='Retensi agregat per jam (default: VISITOR_STATS_HOURLY_RETENTION_DAYS)')
+        parser.add_argument('--dry-run', action='store_true', help='Dengan --prune: hanya hitung baris yang akan dihapus')
+
+    def handle(self, *args, **options):
+        try:
+            count = rollup_visitor_logs(
+                chunk_size=options['chunk_size'],
+                log=self.stdout.write if options['verbosity'] > 1 else None,
+            )
+        except RollupConflict:
+            raise CommandError('Rollup lain sedang berjalan; coba lagi nanti.')
+        self.stdout.write(self.style.SUCCESS(f'{count} log pengunjung diagregasi.'))
+
+        if not options['prune']:
+            return
+        summary = prune_visitor_logs(
+            days=options['days'],
+            hourly_days=options['hourly_days'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f'{summary["logs"]} log mentah dan {summary["hourly"]} agregat per jam akan dihapus.')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'{summary["logs"]} log mentah dan {summary["hourly"]} agregat per jam dihapus.'
+            ))
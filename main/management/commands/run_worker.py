@@ -0,0 +1,61 @@
+"""
+Jalankan worker antrian tugas latar belakang (main/tasks.py)
+
+Contoh:
+    python manage.py run_worker              # berjalan terus (systemd/supervisor)
+    python manage.py run_worker --once       # habiskan antrian lalu keluar (cron)
+
+Beberapa worker boleh berjalan bersamaan. SIGTERM/SIGINT menunggu tugas yang
+sedang berjalan selesai sebelum keluar.
+"""
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.tasks import Worker
+
+
+class Command(BaseCommand):
+    help = 'Jalankan tugas latar belakang (gambar, indeks pencarian, cache, rollup) dari tabel Task'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Jalankan tugas yang jatuh tempo lalu keluar')
+        parser.add_argument('--sleep', type=float, default=getattr(settings, 'TASK_POLL_INTERVAL', 2.0),
+                            help='Jeda polling saat antrian kosong (detik, default: TASK_POLL_INTERVAL)')
+        parser.add_argument('--no-schedule', action='store_true', help='Jangan antrekan tugas berkala TASK_SCHEDULE')
+
+    def handle(self, *args, **options):
+        worker = Worker(schedule={} if options['no_schedule'] else None)
+        self.stopping = False
+        if not options['once']:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+            self.stdout.write(f'Worker {worker.name} berjalan.')
+
+        # Housekeeping (tugas macet, jadwal berkala) cukup sekitar sekali per menit
+        housekeeping_at = 0
+        total = 0
+        while not self.stopping:
+            if time.monotonic() >= housekeeping_at:
+                requeued = worker.requeue_stale()
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'{requeued} tugas macet dikembalikan ke antrian.'))
+                worker.schedule_periodic()
+                housekeeping_at = time.monotonic() + 60
+
+            count = worker.run_pending(limit=1 if not options['once'] else None)
+            total += count
+            if options['verbosity'] > 1 and count:
+                self.stdout.write(f'{total} tugas dijalankan...')
+            if options['once']:
+                break
+            if not count:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'{total} tugas dijalankan.'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,330 @@
+"""
+Middleware untuk main app
+"""
+
+import logging
+import mimetypes
+import os
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils._os import safe_join
+from django.utils.http import http_date
+
+from . import pagecache
+from .analytics import visit_recorder
+from .fragments import cache_is_shared
+from .querybudget import QueryBudgetExceeded, QueryRecorder
+from .staticfiles import HASHED_NAME_RE
+
+
+logger = logging.getLogger('main.querybudget')
+
+
+class AsyncCapableMiddleware:
+    """
+    Dasar middleware yang bisa berjalan sync maupun async (seperti MiddlewareMixin).
+    Di bawah ASGI __call__ mengembalikan coroutine __acall__, sehingga Django tidak
+    membungkus middleware dengan sync_to_async di setiap request (view async seperti
+    chatbot:send tetap berjalan di event loop). Subclass memanggil super().__init__
+    setelah pengecekan MiddlewareNotUsed, lalu mengimplementasikan __call__ dan __acall__.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    """
+    Mencatat semua query per request dan memperingatkan (atau melempar
+    QueryBudgetExceeded jika QUERY_BUDGET_RAISE) saat view melebihi budget
+    atau memicu pola N+1. Budget per view diatur lewat QUERY_BUDGET_VIEWS
+    dengan kunci nama URL ('namespace:nama').
+    Nonaktif (dilepas dari rantai middleware) jika QUERY_BUDGET_ENABLED False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.default_budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', 30)
+        self.view_budgets = getattr(settings, 'QUERY_BUDGET_VIEWS', {})
+        self.raise_errors = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.check(request, response, recorder)
+
+    async def __acall__(self, request):
+        # Koneksi database per thread: wrapper dipasang di thread sync_to_async milik
+        # request ini (ThreadSensitiveContext), tempat view sync dan ORM async menjalankan query
+        recorder = QueryRecorder()
+        await sync_to_async(recorder.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.__exit__)(None, None, None)
+        return self.check(request, response, recorder)
+
+    def check(self, request, response, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else request.path
+        budget = self.view_budgets.get(view_name, self.default_budget)
+        response['X-Query-Count'] = str(recorder.count)
+
+        problems = []
+        if recorder.count > budget:
+            problems.append(f'melebihi budget {budget} query')
+        suspects = recorder.n_plus_one()
+        if suspects:
+            problems.append('pola N+1: ' + '; '.join(
+                f'{group.count}x {group.origin}' for group in suspects
+            ))
+        if problems:
+            message = f'{view_name} {", ".join(problems)}\n{recorder.report()}'
+            if self.raise_errors:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class PageCacheMiddleware(AsyncCapableMiddleware):
+    """
+    Cache halaman penuh untuk GET/HEAD anonim pada halaman di
+    pagecache.PAGE_DEPENDENCIES. Request dengan If-None-Match/If-Modified-Since
+    yang masih cocok dijawab 304 tanpa merender template; selain itu HTML diambil
+    dari cache jika ETag-nya masih sama. Response yang menyetel cookie (CSRF,
+    session, messages) tidak pernah disimpan dan tidak diberi header cache publik.
+    Dipasang sebelum SessionMiddleware agar cache hit tidak menyentuh session.
+    Nonaktif jika PAGE_CACHE_ENABLED False, atau jika cache tidak dibagi antar
+    proses (LocMem): stamp model dari proses lain tidak terlihat sehingga ETag
+    lama akan terus dijawab 304.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PAGE_CACHE_ENABLED', False):
+            raise MiddlewareNotUsed
+        if not cache_is_shared():
+            logging.getLogger('main.pagecache').warning(
+                'PAGE_CACHE_ENABLED diabaikan: backend cache %s tidak dibagi antar proses',
+                settings.CACHES['default']['BACKEND'],
+            )
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 600)
+        self.max_age = getattr(settings, 'PAGE_CACHE_MAX_AGE', 60)
+        self.private_cookies = {
+            settings.SESSION_COOKIE_NAME,
+            getattr(settings, 'MESSAGE_COOKIE_NAME', 'messages'),
+        }
+
+    def cacheable_view(self, request):
+        """Nama URL jika request boleh dilayani dari cache, selain itu None"""
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if self.private_cookies & set(request.COOKIES):
+            return None
+        if pagecache.cache_params(request) is None:
+            return None
+        try:
+            view_name = resolve(request.path_info).view_name
+        except Resolver404:
+            return None
+        return view_name if view_name in pagecache.PAGE_DEPENDENCIES else None
+
+    @staticmethod
+    def storable(response):
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return False
+        cache_control = response.get('Cache-Control', '')
+        return 'private' not in cache_control and 'no-store' not in cache_control
+
+    def add_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        view_name = self.cacheable_view(request)
+        if view_name is None:
+            return self.get_response(request)
+        response, validators = self.lookup(request, view_name)
+        if response is not None:
+            return response
+        return self.store(validators, self.get_response(request))
+
+    async def __acall__(self, request):
+        view_name = self.cacheable_view(request)
+        if view_name is None:
+            return await self.get_response(request)
+        # Stamp dan HTML dibaca dari cache file: I/O blocking di thread
+        response, validators = await sync_to_async(self.lookup)(request, view_name)
+        if response is not None:
+            return response
+        response = await self.get_response(request)
+        return await sync_to_async(self.store)(validators, response)
+
+    def lookup(self, request, view_name):
+        """(response dari cache atau 304, None) jika bisa dijawab tanpa view, selain itu (None, validator)"""
+        key = pagecache.page_key(request, pagecache.cache_params(request))
+        stamps = pagecache.model_stamps(pagecache.BASE_MODELS + pagecache.PAGE_DEPENDENCIES[view_name])
+        etag, last_modified = pagecache.validators(key, stamps)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+        if not_modified is not None:
+            return self.add_validators(not_modified, etag, last_modified), None
+
+        cached = cache.get(key)
+        if cached is not None and cached[0] == etag:
+            _, content, content_type, vary = cached
+            response = HttpResponse(content, content_type=content_type)
+            if vary:
+                response['Vary'] = vary
+            response['X-Page-Cache'] = 'hit'
+            return self.add_validators(response, etag, last_modified), None
+        return None, (key, etag, last_modified)
+
+    def store(self, validators, response):
+        if not self.storable(response):
+            return response
+        key, etag, last_modified = validators
+        cache.set(key, (etag, response.content, response['Content-Type'], response.get('Vary')), self.timeout)
+        response['X-Page-Cache'] = 'miss'
+        return self.add_validators(response, etag, last_modified)
+
+
+class VisitorLogMiddleware(AsyncCapableMiddleware):
+    """
+    Mencatat kunjungan halaman HTML (termasuk cache hit dan 304) ke VisitorLog
+    lewat ring buffer main/analytics.py. Di jalur request hanya ada pengecekan
+    string dan satu append; parsing user agent dan INSERT dikerjakan thread writer.
+    Dipasang paling luar agar halaman dari PageCacheMiddleware juga tercatat.
+    Nonaktif jika VISITOR_LOG_ENABLED False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'VISITOR_LOG_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.exclude = tuple(getattr(settings, 'VISITOR_LOG_EXCLUDE', ()))
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.record(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        # Pencatatan hanya append ke deque, aman dijalankan langsung di event loop
+        return self.record(request, await self.get_response(request))
+
+    def record(self, request, response):
+        if request.method != 'GET' or request.path.startswith(self.exclude):
+            return response
+        status = response.status_code
+        if status == 304 or (status == 200 and response.get('Content-Type', '').startswith('text/html')):
+            meta = request.META
+            visit_recorder.record(
+                meta.get('REMOTE_ADDR', ''),
+                meta.get('HTTP_USER_AGENT', ''),
+                request.get_full_path(),
+                meta.get('HTTP_REFERER', ''),
+            )
+        return response
+
+
+class StaticAssetMiddleware(AsyncCapableMiddleware):
+    """
+    Menyajikan file dari STATIC_ROOT (hasil collectstatic, main/staticfiles.py)
+    tanpa web server terpisah. Varian .br/.gz dipilih sesuai Accept-Encoding;
+    nama file ber-hash mendapat Cache-Control satu tahun + immutable, file lain
+    STATIC_MAX_AGE dengan revalidasi ETag/Last-Modified.
+    Nonaktif jika STATIC_ASSETS_SERVE False (mis. nginx yang menyajikan /static/).
+    """
+
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'STATIC_ASSETS_SERVE', False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else f'/{settings.STATIC_URL}'
+        self.root = str(settings.STATIC_ROOT)
+        self.max_age = getattr(settings, 'STATIC_MAX_AGE', 3600)
+
+    def is_static(self, request):
+        return request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.is_static(request):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.is_static(request):
+            # stat/baca file di thread; isi dibaca penuh karena FileResponse (iterator sync)
+            # akan dikonsumsi ASGIHandler lewat sync_to_async disertai warning
+            response = await sync_to_async(self.serve, thread_sensitive=False)(
+                request, request.path[len(self.prefix):], streaming=False,
+            )
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def serve(self, request, name, streaming=True):
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        accepted = {item.split(';')[0].strip() for item in request.headers.get('Accept-Encoding', '').split(',')}
+        encoding = None
+        for candidate, suffix in self.ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        stat = os.stat(path)
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            content_type, _ = mimetypes.guess_type(name)
+            content_type = content_type or 'application/octet-stream'
+            if streaming:
+                response = FileResponse(open(path, 'rb'), content_type=content_type)
+            else:
+                with open(path, 'rb') as handle:
+                    response = HttpResponse(handle.read(), content_type=content_type)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.headers['Last-Modified'] = http_date(stat.st_mtime)
+        response.headers['ETag'] = etag
+        response.headers['Vary'] = 'Accept-Encoding'
+        if HASHED_NAME_RE.search(name):
+            patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_searchindex'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='visitorlog',
+            name='visited_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
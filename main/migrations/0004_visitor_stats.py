@@ -0,0 +1,59 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_visitorlog_visited_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitorRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_log_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Status Rollup Pengunjung',
+                'verbose_name_plural': 'Status Rollup Pengunjung',
+            },
+        ),
+        migrations.CreateModel(
+            name='VisitorStatDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('page', 'Halaman'), ('device', 'Perangkat'), ('browser', 'Browser'), ('referrer', 'Host Referrer')], max_length=20, verbose_name='Dimensi')),
+                ('value', models.CharField(blank=True, max_length=200, verbose_name='Nilai')),
+                ('view_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Kunjungan')),
+                ('date', models.DateField(verbose_name='Tanggal')),
+            ],
+            options={
+                'verbose_name': 'Statistik Pengunjung Harian',
+                'verbose_name_plural': 'Statistik Pengunjung Harian',
+                'ordering': ['-date', 'dimension', '-view_count'],
+                'indexes': [models.Index(fields=['dimension', 'date'], name='visitorstat_daily_dim_idx')],
+                'unique_together': {('date', 'dimension', 'value')},
+            },
+        ),
+        migrations.CreateModel(
+            name='VisitorStatHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('page', 'Halaman'), ('device', 'Perangkat'), ('browser', 'Browser'), ('referrer', 'Host Referrer')], max_length=20, verbose_name='Dimensi')),
+                ('value', models.CharField(blank=True, max_length=200, verbose_name='Nilai')),
+                ('view_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Kunjungan')),
+                ('hour', models.DateTimeField(verbose_name='Jam')),
+            ],
+            options={
+                'verbose_name': 'Statistik Pengunjung per Jam',
+                'verbose_name_plural': 'Statistik Pengunjung per Jam',
+                'ordering': ['-hour', 'dimension', '-view_count'],
+                'indexes': [models.Index(fields=['dimension', 'hour'], name='visitorstat_hourly_dim_idx')],
+                'unique_together': {('hour', 'dimension', 'value')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_visitor_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nama Tugas')),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('key', models.CharField(blank=True, max_length=200, verbose_name='Kunci Idempoten')),
+                ('status', models.CharField(choices=[('pending', 'Menunggu'), ('running', 'Berjalan'), ('done', 'Selesai'), ('failed', 'Gagal')], default='pending', max_length=10)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Jadwal')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Percobaan')),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('last_error', models.TextField(blank=True)),
+                ('locked_by', models.CharField(blank=True, max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tugas Latar Belakang',
+                'verbose_name_plural': 'Tugas Latar Belakang',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['run_at', 'id'], name='task_pending_idx'), models.Index(fields=['key', '-created_at'], name='task_key_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'pending'), models.Q(('key', ''), _negated=True)), fields=('key',), name='task_pending_key_uniq')],
+            },
+        ),
+    ]
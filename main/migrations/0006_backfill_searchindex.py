@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def backfill_search_index(apps, schema_editor):
+    """Mengisi indeks FTS5 dengan konten yang sudah ada (0002 hanya membuat tabel kosong)"""
+    from main.search import SEARCH_SOURCES, SQLiteFTSBackend, fts5_available
+
+    if not fts5_available():
+        return
+    SQLiteFTSBackend().rebuild(get_model=lambda kind: apps.get_model(SEARCH_SOURCES[kind].model))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_task'),
+        ('akademik', '0003_list_indexes'),
+        ('berita', '0002_list_indexes'),
+        ('karya', '0002_list_indexes'),
+        ('prestasi', '0002_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
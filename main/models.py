@@ -3,9 +3,18 @@ Models untuk aplikasi Main
 Berisi model untuk konfigurasi website, profil prodi, kemitraan, dan statistik
 """
 
+import time
+
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from .stamps import bump_stamp, stamp_cache
+
+
+# Kunci cache untuk version stamp SiteSettings, dinaikkan setiap kali pengaturan disimpan
+SITE_SETTINGS_VERSION_KEY = 'main:site_settings_version'
+
 
 class SiteSettings(models.Model):
     """
@@ -52,15 +61,39 @@ class SiteSettings(models.Model):
     def __str__(self):
         return self.site_name
     
+    # Salinan per proses: (version stamp, waktu dibaca, instance)
+    _cached = (None, 0.0, None)
+    
     def save(self, *args, **kwargs):
         # Singleton pattern - pastikan hanya ada 1 instance
         self.pk = 1
         super().save(*args, **kwargs)
+        self.bump_version()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.bump_version()
+        return result
+    
+    @staticmethod
+    def bump_version():
+        """Membuat salinan SiteSettings di semua proses usang"""
+        bump_stamp(SITE_SETTINGS_VERSION_KEY)
     
     @classmethod
     def get_settings(cls):
-        """Mendapatkan instance settings, buat jika belum ada"""
-        obj, created = cls.objects.get_or_create(pk=1)
+        """
+        Mendapatkan instance settings, buat jika belum ada.
+        Instance disimpan per proses dan dibaca ulang dari database ketika
+        version stamp di cache berubah atau sudah lebih tua dari
+        SITE_SETTINGS_MAX_AGE, jadi request biasa tanpa query.
+        """
+        version = stamp_cache.get(SITE_SETTINGS_VERSION_KEY, 0)
+        cached_version, loaded_at, obj = cls._cached
+        max_age = getattr(settings, 'SITE_SETTINGS_MAX_AGE', 60)
+        if obj is None or cached_version != version or time.monotonic() - loaded_at > max_age:
+            obj, created = cls.objects.get_or_create(pk=1)
+            cls._cached = (version, time.monotonic(), obj)
         return obj
 
 
@@ -253,7 +286,8 @@ class VisitorLog(models.Model):
     city = models.CharField(max_length=100, blank=True)
     device_type = models.CharField(max_length=50, blank=True)  # desktop, mobile, tablet
     browser = models.CharField(max_length=100, blank=True)
-    visited_at = models.DateTimeField(auto_now_add=True)
+    # Diisi waktu request oleh main/analytics.py (bulk_create tertunda), bukan waktu INSERT
+    visited_at = models.DateTimeField(default=timezone.now, db_index=True)
     
     class Meta:
         verbose_name = 'Log Pengunjung'
@@ -262,3 +296,125 @@ class VisitorLog(models.Model):
     
     def __str__(self):
         return f'{self.ip_address} - {self.visited_at}'
+
+
+class VisitorStat(models.Model):
+    """
+    Agregat kunjungan per dimensi (main/rollups.py)
+    Dashboard admin hanya membaca tabel agregat, sehingga VisitorLog mentah
+    boleh dihapus setelah beberapa hari tanpa kehilangan tren.
+    """
+    DIMENSION_CHOICES = [
+        ('page', 'Halaman'),
+        ('device', 'Perangkat'),
+        ('browser', 'Browser'),
+        ('referrer', 'Host Referrer'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES, verbose_name='Dimensi')
+    value = models.CharField(max_length=200, blank=True, verbose_name='Nilai')
+    view_count = models.PositiveIntegerField(default=0, verbose_name='Jumlah Kunjungan')
+
+    class Meta:
+        abstract = True
+
+    @property
+    def value_display(self):
+        return self.value or '(tidak diketahui)'
+
+
+class VisitorStatHourly(VisitorStat):
+    """Agregat kunjungan per jam"""
+    hour = models.DateTimeField(verbose_name='Jam')
+
+    class Meta:
+        verbose_name = 'Statistik Pengunjung per Jam'
+        verbose_name_plural = 'Statistik Pengunjung per Jam'
+        ordering = ['-hour', 'dimension', '-view_count']
+        unique_together = ['hour', 'dimension', 'value']
+        indexes = [
+            models.Index(fields=['dimension', 'hour'], name='visitorstat_hourly_dim_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.hour:%Y-%m-%d %H:00} {self.dimension}={self.value_display}'
+
+
+class VisitorStatDaily(VisitorStat):
+    """Agregat kunjungan per hari (tanggal lokal)"""
+    date = models.DateField(verbose_name='Tanggal')
+
+    class Meta:
+        verbose_name = 'Statistik Pengunjung Harian'
+        verbose_name_plural = 'Statistik Pengunjung Harian'
+        ordering = ['-date', 'dimension', '-view_count']
+        unique_together = ['date', 'dimension', 'value']
+        indexes = [
+            models.Index(fields=['dimension', 'date'], name='visitorstat_daily_dim_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.date} {self.dimension}={self.value_display}'
+
+
+class VisitorRollupState(models.Model):
+    """
+    Penanda (watermark) rollup: id VisitorLog terakhir yang sudah diagregasi
+    Hanya ada satu baris (pk=1).
+    """
+    last_log_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Status Rollup Pengunjung'
+        verbose_name_plural = 'Status Rollup Pengunjung'
+
+    def __str__(self):
+        return f'Rollup sampai log #{self.last_log_id}'
+
+
+class Task(models.Model):
+    """
+    Antrian tugas latar belakang di database (main/tasks.py)
+    Dijalankan oleh `manage.py run_worker`; `key` menjaga agar tugas yang sama
+    tidak diantrekan dua kali selama masih menunggu.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Menunggu'),
+        (STATUS_RUNNING, 'Berjalan'),
+        (STATUS_DONE, 'Selesai'),
+        (STATUS_FAILED, 'Gagal'),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name='Nama Tugas')
+    payload = models.JSONField(default=dict, blank=True)
+    key = models.CharField(max_length=200, blank=True, verbose_name='Kunci Idempoten')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    run_at = models.DateTimeField(default=timezone.now, verbose_name='Jadwal')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Percobaan')
+    max_attempts = models.PositiveIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Tugas Latar Belakang'
+        verbose_name_plural = 'Tugas Latar Belakang'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['key'], condition=models.Q(status='pending') & ~models.Q(key=''),
+                                    name='task_pending_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['run_at', 'id'], condition=models.Q(status='pending'), name='task_pending_idx'),
+            models.Index(fields=['key', '-created_at'], name='task_key_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
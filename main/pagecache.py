@@ -0,0 +1,117 @@
+"""
+Cache halaman penuh untuk pengunjung anonim
+Setiap halaman yang boleh di-cache mendaftarkan model yang ditampilkannya.
+Validator (ETag dan Last-Modified) diturunkan dari waktu perubahan terakhir
+model-model tersebut: stamp per model di alias cache `stamps` (main/stamps.py),
+diisi saat pertama kali dibutuhkan lalu diperbarui lewat signal setiap ada perubahan.
+Halaman yang menaikkan counter saat dibuka (detail berita/karya) atau memuat
+form dengan CSRF token sengaja tidak didaftarkan.
+"""
+
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from .fragments import HOME_SECTIONS
+from .search import SEARCH_SOURCES
+from .stamps import stamp_cache
+
+
+# Model yang dipakai base.html (context processor site_settings) di semua halaman
+BASE_MODELS = ['main.SiteSettings']
+
+BERITA_MODELS = ['berita.Berita', 'berita.KategoriBerita', 'berita.TagBerita']
+
+# Nama URL -> label model yang isinya tampil di halaman
+PAGE_DEPENDENCIES = {
+    'main:home': sorted({label for models, _ in HOME_SECTIONS.values() for label in models}),
+    'main:tentang_kami': ['main.ProfilProdi', 'akademik.Dosen'],
+    'main:visi_misi': ['main.ProfilProdi'],
+    'main:kemitraan': ['main.Kemitraan'],
+    'main:testimonial': ['main.Testimonial'],
+    'main:search': [source.model for source in SEARCH_SOURCES.values()],
+    'berita:list': BERITA_MODELS,
+    'berita:agenda': BERITA_MODELS,
+    'berita:kategori_detail': BERITA_MODELS,
+    'berita:tag_detail': BERITA_MODELS,
+    'prestasi:list': ['prestasi.Prestasi', 'prestasi.KategoriPrestasi'],
+    'prestasi:detail': ['prestasi.Prestasi', 'prestasi.KategoriPrestasi'],
+    'karya:list': ['karya.KaryaMahasiswa', 'karya.KategoriKarya', 'karya.Teknologi'],
+    'akademik:dosen_list': ['akademik.Dosen'],
+    'akademik:dosen_detail': ['akademik.Dosen', 'akademik.RisetGrup', 'akademik.Publikasi', 'akademik.MataKuliah'],
+    'akademik:kurikulum': ['akademik.Kurikulum', 'akademik.MataKuliah'],
+    'akademik:matakuliah_detail': ['akademik.MataKuliah', 'akademik.Kurikulum', 'akademik.Dosen'],
+    'akademik:jadwal': ['akademik.JadwalKuliah', 'akademik.MataKuliah', 'akademik.Dosen'],
+    'akademik:riset_grup': ['akademik.RisetGrup', 'akademik.Dosen'],
+    'akademik:publikasi': ['akademik.Publikasi', 'akademik.Dosen'],
+    'akademik:fasilitas': ['akademik.Fasilitas'],
+}
+
+TRACKED_MODELS = {label.lower() for labels in PAGE_DEPENDENCIES.values() for label in labels} | {
+    label.lower() for label in BASE_MODELS
+}
+
+# Parameter yang tidak mengubah isi halaman
+IGNORED_PARAMS = {'fbclid', 'gclid'}
+
+# Hanya filter dan paginasi yang di-cache. Request dengan parameter lain (termasuk
+# pencarian teks bebas `q`) dilayani tanpa cache, agar jumlah kunci halaman terbatas
+# dan tidak mendesak entri lain keluar dari cache.
+CACHEABLE_PARAMS = {
+    'page', 'cursor', 'format', 'sort', 'jenis', 'kategori', 'tag', 'tahun',
+    'tingkat', 'jabatan', 'semester', 'hari', 'dosen', 'tipe', 'type',
+}
+MAX_PARAM_LENGTH = 100
+
+
+def stamp_key(label):
+    return f'pagecache:stamp:{label.lower()}'
+
+
+def cache_params(request):
+    """Query string yang dinormalisasi (list pasangan terurut), atau None jika tidak boleh di-cache"""
+    params = []
+    for key, values in request.GET.lists():
+        if key in IGNORED_PARAMS or key.startswith('utm_'):
+            continue
+        for value in values:
+            if not value:
+                continue
+            if key not in CACHEABLE_PARAMS or len(value) > MAX_PARAM_LENGTH:
+                return None
+            params.append((key, value))
+    return sorted(params)
+
+
+def page_key(request, params):
+    """Kunci halaman: host, path, dan query string hasil cache_params()"""
+    raw = f'{request.get_host()}{request.path}?{urlencode(params)}'
+    return 'pagecache:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def model_stamps(labels):
+    """
+    Dict label -> timestamp perubahan terakhir. Stamp yang belum ada diisi waktu
+    sekarang, bukan MAX(updated_at): nilai itu tidak berubah setelah delete,
+    sehingga bisa menghasilkan ulang ETag lama dan menjawab 304 untuk halaman usang.
+    """
+    keys = {label: stamp_key(label) for label in labels}
+    stamps = stamp_cache.get_many(list(keys.values()))
+    for label, key in keys.items():
+        if key not in stamps:
+            stamp_cache.add(key, time.time(), None)
+            stamps[key] = stamp_cache.get(key)
+    return {label: stamps[key] for label, key in keys.items()}
+
+
+def touch_model(model):
+    """Dipanggil dari signal: halaman yang bergantung pada model ini mendapat validator baru"""
+    if model._meta.label_lower not in TRACKED_MODELS:
+        return
+    stamp_cache.set(stamp_key(model._meta.label), time.time(), None)
+
+
+def validators(key, stamps):
+    """(ETag, Last-Modified dalam detik epoch) untuk satu halaman"""
+    digest = hashlib.md5(f'{key}:{sorted(stamps.items())}'.encode()).hexdigest()
+    return f'"{digest}"', max(stamps.values(), default=0.0)
@@ -0,0 +1,189 @@
+"""
+Paginasi keyset (cursor)
+Halaman berikutnya diambil dengan WHERE (kolom urutan, pk) < nilai terakhir
+alih-alih OFFSET, sehingga halaman ke-400 sama murahnya dengan halaman pertama
+dan tidak perlu COUNT(*). Dipakai ListView lewat CursorPaginationMixin.
+"""
+
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404, JsonResponse
+
+
+class InvalidCursor(Exception):
+    """Cursor rusak atau tidak cocok dengan urutan halaman"""
+
+
+class CursorPage:
+    """
+    Satu halaman hasil keyset. Antarmukanya mengikuti Page milik Django
+    (has_next, has_previous, has_other_pages, iterasi) tanpa nomor halaman.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginator keyset untuk queryset dengan urutan `ordering`, mis. ('-published_at',).
+    pk selalu ditambahkan sebagai kunci terakhir agar urutan stabil untuk nilai kembar.
+    Kolom urutan diasumsikan tidak NULL.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        ordering = [field for field in ordering if field.lstrip('-') != 'pk']
+        descending = ordering[-1].startswith('-') if ordering else True
+        self.ordering = ordering + ['-pk' if descending else 'pk']
+        self.fields = [queryset.model._meta.pk if field.lstrip('-') == 'pk'
+                       else queryset.model._meta.get_field(field.lstrip('-'))
+                       for field in self.ordering]
+
+    @staticmethod
+    def _reverse(ordering):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+    def encode(self, obj, backwards):
+        values = [field.value_to_string(obj) for field in self.fields]
+        data = json.dumps(['p' if backwards else 'n', *values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            direction, *values = data
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursor(cursor)
+        if direction not in ('n', 'p') or len(values) != len(self.fields):
+            raise InvalidCursor(cursor)
+        try:
+            values = [field.to_python(value) for field, value in zip(self.fields, values)]
+        except ValidationError:
+            raise InvalidCursor(cursor)
+        return direction == 'p', values
+
+    def _after(self, ordering, values):
+        """Q untuk baris yang berada setelah `values` menurut `ordering`"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def page(self, cursor=None):
+        """Mengambil per_page + 1 baris untuk tahu ada halaman berikutnya tanpa COUNT"""
+        backwards, values = self.decode(cursor) if cursor else (False, None)
+        ordering = self._reverse(self.ordering) if backwards else self.ordering
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, self, None, None)
+        # Maju: halaman sebelumnya ada jika datang dari cursor; mundur: kebalikannya
+        has_next = has_more if not backwards else True
+        has_previous = values is not None if not backwards else has_more
+        return CursorPage(
+            rows, self,
+            self.encode(rows[-1], backwards=False) if has_next else None,
+            self.encode(rows[0], backwards=True) if has_previous else None,
+        )
+
+
+class CursorPaginationMixin:
+    """
+    Mode paginasi cursor opsional untuk ListView.
+    View menentukan `cursor_ordering` (kolom urutan tanpa pk). Mode cursor dipakai
+    jika settings.CURSOR_PAGINATION aktif, atau request membawa parameter
+    `cursor` atau `format=json`; selain itu paginasi offset biasa tetap dipakai.
+    `?format=json` mengembalikan {results, next, previous} dengan field `json_fields`.
+    """
+    cursor_ordering = None
+    json_fields = ()
+
+    def use_cursor_pagination(self):
+        params = self.request.GET
+        return bool(
+            getattr(settings, 'CURSOR_PAGINATION', False)
+            or 'cursor' in params
+            or params.get('format') == 'json'
+        )
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.get_cursor_ordering())
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Cursor tidak valid')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def cursor_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        params['cursor'] = cursor
+        return f'{self.request.path}?{params.urlencode()}'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if isinstance(page, CursorPage):
+            context['cursor_pagination'] = True
+            context['next_page_url'] = self.cursor_url(page.next_cursor)
+            context['previous_page_url'] = self.cursor_url(page.previous_cursor)
+        return context
+
+    def serialize(self, obj):
+        data = {field: getattr(obj, field) for field in self.json_fields}
+        if hasattr(obj, 'get_absolute_url'):
+            data['url'] = obj.get_absolute_url()
+        return data
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get('format') != 'json':
+            return super().render_to_response(context, **response_kwargs)
+        return JsonResponse({
+            'results': [self.serialize(obj) for obj in context['object_list']],
+            'next': context.get('next_page_url'),
+            'previous': context.get('previous_page_url'),
+        })
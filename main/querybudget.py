@@ -0,0 +1,153 @@
+"""
+Query budget dan pendeteksi N+1
+Mencatat setiap SQL yang dijalankan selama satu request (atau satu blok di test),
+mengelompokkan query dengan bentuk yang sama, dan menandai pola N+1 berdasarkan
+baris template (atau baris kode) yang memicunya.
+
+Contoh di test:
+    with query_budget(10):
+        self.client.get('/karya/')
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Node
+
+
+RENDER_ANNOTATED = Node.render_annotated.__code__
+PROJECT_ROOT = str(settings.BASE_DIR)
+# QueryBudgetMiddleware membungkus semua view: frame di luarnya (middleware lain,
+# handler, runserver) hanya plumbing request, jadi pencarian asal berhenti di sana
+MIDDLEWARE_FILE = os.path.join(os.path.dirname(__file__), 'middleware.py')
+DB_PACKAGE = os.path.join('django', 'db') + os.sep
+
+QueryGroup = namedtuple('QueryGroup', ['shape', 'origin', 'count', 'duration'])
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Dilempar saat jumlah query melebihi budget (atau ada N+1) dan mode raise aktif"""
+
+
+_IN_LIST_RE = re.compile(r'IN \((?:%s|\?)(?:, (?:%s|\?))*\)')
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def query_shape(sql):
+    """Bentuk query tanpa nilai: literal dan panjang daftar IN (...) diseragamkan"""
+    return _LITERAL_RE.sub('?', _IN_LIST_RE.sub('IN (...)', sql))
+
+
+def _library_path(filename):
+    """Path relatif terhadap site-packages (mis. django/views/generic/detail.py), atau None"""
+    _, marker, path = filename.partition('site-packages' + os.sep)
+    return path if marker else None
+
+
+def query_origin():
+    """
+    Lokasi yang memicu query: node template terdalam yang sedang dirender
+    (nama_template:baris), atau baris kode proyek terdekat di luar Django.
+    Pencarian berhenti di main/middleware.py; jika tidak ada kode proyek di
+    dalamnya (mis. generic view tanpa override), dipakai baris Django di luar django/db.
+    """
+    frame = sys._getframe(2)
+    code_origin = None
+    library_origin = None
+    while frame is not None:
+        if frame.f_code is RENDER_ANNOTATED:
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                return f'{origin.template_name}:{token.lineno}'
+        elif code_origin is None:
+            filename = frame.f_code.co_filename
+            if filename == MIDDLEWARE_FILE:
+                break
+            library = _library_path(filename)
+            if library is not None:
+                if library_origin is None and not library.startswith(DB_PACKAGE):
+                    library_origin = f'{library}:{frame.f_lineno}'
+            elif filename.startswith(PROJECT_ROOT) and filename != __file__:
+                code_origin = f'{filename[len(PROJECT_ROOT) + 1:]}:{frame.f_lineno}'
+        frame = frame.f_back
+    return code_origin or library_origin or '?'
+
+
+class QueryRecorder:
+    """Context manager yang memasang execute_wrapper di semua koneksi database"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((query_shape(sql), query_origin(), time.perf_counter() - start))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def groups(self):
+        """QueryGroup per (bentuk, asal), terurut dari yang paling sering"""
+        counts = Counter()
+        durations = Counter()
+        for shape, origin, duration in self.queries:
+            counts[(shape, origin)] += 1
+            durations[(shape, origin)] += duration
+        return [
+            QueryGroup(shape, origin, count, durations[(shape, origin)])
+            for (shape, origin), count in counts.most_common()
+        ]
+
+    def n_plus_one(self, threshold=None):
+        """Kelompok query yang berulang minimal `threshold` kali dari lokasi yang sama"""
+        threshold = threshold or getattr(settings, 'QUERY_BUDGET_N_PLUS_ONE', 3)
+        return [group for group in self.groups() if group.count >= threshold]
+
+    def report(self, limit=10):
+        lines = [f'{self.count} query, {self.duration * 1000:.1f} ms']
+        for group in self.groups()[:limit]:
+            lines.append(f'  {group.count}x {group.origin}: {group.shape[:200]}')
+        return '\n'.join(lines)
+
+
+@contextmanager
+def query_budget(max_queries, n_plus_one=True, threshold=None):
+    """
+    Helper test: gagal (AssertionError) jika blok menjalankan lebih dari
+    `max_queries` query atau, jika `n_plus_one` aktif, ada pola N+1.
+    """
+    with QueryRecorder() as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        raise QueryBudgetExceeded(f'Melebihi budget {max_queries} query: {recorder.report()}')
+    if n_plus_one:
+        suspects = recorder.n_plus_one(threshold)
+        if suspects:
+            raise QueryBudgetExceeded('Pola N+1 terdeteksi:\n' + '\n'.join(
+                f'  {group.count}x {group.origin}: {group.shape[:200]}' for group in suspects
+            ))
@@ -0,0 +1,100 @@
+"""
+Daftar query daftar/listing yang sering dijalankan, untuk dicek rencana eksekusinya
+Setiap entri membangun queryset yang sama dengan view aslinya (tanpa dievaluasi).
+`manage.py explain_queries` menjalankan EXPLAIN QUERY PLAN pada semuanya dan
+menandai full table scan atau sort tanpa indeks.
+"""
+
+from collections import namedtuple
+
+from django.db import connection
+from django.utils import timezone
+
+
+PlanIssue = namedtuple('PlanIssue', ['detail'])
+
+
+def _berita():
+    from berita.models import Berita
+    return Berita.objects.published()
+
+
+def _karya():
+    from karya.models import KaryaMahasiswa
+    return KaryaMahasiswa.objects.published()
+
+
+def _prestasi():
+    from prestasi.models import Prestasi
+    return Prestasi.objects.published()
+
+
+def _publikasi():
+    from akademik.models import Publikasi
+    return Publikasi.objects.all()
+
+
+def _jadwal():
+    from akademik.models import JadwalKuliah
+    return JadwalKuliah.objects.active()
+
+
+def _chat_messages():
+    from chatbot.models import ChatMessage
+    return ChatMessage.objects.all()
+
+
+def _keyset(queryset, ordering):
+    """Halaman cursor berikutnya (main/pagination.py) dengan nilai kunci contoh"""
+    from .pagination import CursorPaginator
+    paginator = CursorPaginator(queryset, 10, ordering)
+    sample = [timezone.now() if field.get_internal_type() == 'DateTimeField'
+              else timezone.localdate() if field.get_internal_type() == 'DateField'
+              else 1 for field in paginator.fields]
+    return queryset.order_by(*paginator.ordering).filter(paginator._after(paginator.ordering, sample))
+
+
+# nama -> fungsi yang mengembalikan queryset; urutan dan filter mengikuti view
+LIST_QUERIES = {
+    'berita:list': lambda: _berita().for_list().distinct().order_by('-is_pinned', '-published_at'),
+    'berita:list_cursor': lambda: _keyset(_berita().for_list(), ['-is_pinned', '-published_at']),
+    'berita:jenis': lambda: _berita().filter(jenis='berita').order_by('-is_pinned', '-published_at'),
+    'berita:kategori': lambda: _berita().for_list().filter(kategori=1).order_by('-is_pinned', '-published_at'),
+    'berita:populer': lambda: _berita().order_by('-view_count')[:5],
+    'berita:featured': lambda: _berita().filter(is_featured=True)[:3],
+    'karya:list': lambda: _karya().for_list().order_by('-created_at'),
+    'karya:list_cursor': lambda: _keyset(_karya().for_list(), ['-created_at']),
+    'karya:tahun': lambda: _karya().filter(tahun=timezone.now().year).order_by('-created_at'),
+    'karya:tahun_list': lambda: _karya().values_list('tahun', flat=True).distinct().order_by('-tahun'),
+    'karya:populer': lambda: _karya().order_by('-view_count'),
+    'karya:liked': lambda: _karya().order_by('-like_count'),
+    'karya:featured': lambda: _karya().filter(is_featured=True)[:3],
+    'prestasi:list': lambda: _prestasi().order_by('-tanggal'),
+    'prestasi:list_cursor': lambda: _keyset(_prestasi(), ['-tanggal']),
+    'prestasi:tingkat': lambda: _prestasi().filter(tingkat='nasional').order_by('-tanggal'),
+    'prestasi:tahun': lambda: _prestasi().filter(tanggal__year=timezone.now().year).order_by('-tanggal'),
+    'publikasi:tahun_jenis': lambda: _publikasi().filter(tahun=timezone.now().year, jenis='jurnal_nas'),
+    'publikasi:jenis': lambda: _publikasi().filter(jenis='jurnal_nas').order_by('-tahun'),
+    'jadwal:list': lambda: _jadwal().for_list().order_by('hari', 'jam_mulai'),
+    'jadwal:hari': lambda: _jadwal().for_list().filter(hari='senin').order_by('jam_mulai'),
+    'chat:history': lambda: _chat_messages().filter(session_id=1).order_by('timestamp'),
+}
+
+
+def explain(queryset):
+    """Baris detail EXPLAIN QUERY PLAN (SQLite) untuk queryset"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_issues(plan):
+    """Full scan tabel (SCAN tanpa indeks) dan sort di temporary B-tree"""
+    issues = []
+    for detail in plan:
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            issues.append(PlanIssue(detail))
+        elif detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            issues.append(PlanIssue(detail))
+    return issues
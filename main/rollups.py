@@ -0,0 +1,199 @@
+"""
+Rollup analytics pengunjung
+VisitorLog mentah diagregasi secara inkremental ke VisitorStatHourly dan
+VisitorStatDaily (halaman, perangkat, browser, host referrer). Posisi terakhir
+disimpan di VisitorRollupState sehingga setiap log dihitung tepat sekali,
+lalu log mentah yang sudah diagregasi boleh dihapus setelah N hari.
+Dijalankan terjadwal lewat `manage.py rollup_visitor_logs`.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import VisitorLog, VisitorStatHourly, VisitorStatDaily, VisitorRollupState
+
+
+# Log yang lebih muda dari ini belum diagregasi: writer (main/analytics.py) mungkin
+# masih meng-commit batch dengan id lebih kecil
+SETTLE_SECONDS = 60
+
+DASHBOARD_DAYS = 30
+DASHBOARD_TOP = 10
+
+VALUE_MAX_LENGTH = 200
+
+
+class RollupConflict(Exception):
+    """Watermark berubah di tengah rollup (ada proses rollup lain yang berjalan)"""
+
+
+def _dimensions(page_url, referrer, device_type, browser):
+    """Pasangan (dimensi, nilai) untuk satu kunjungan; query string halaman dibuang"""
+    return (
+        ('page', page_url.split('?', 1)[0][:VALUE_MAX_LENGTH]),
+        ('device', device_type[:VALUE_MAX_LENGTH]),
+        ('browser', browser[:VALUE_MAX_LENGTH]),
+        ('referrer', (urlsplit(referrer).hostname or '')[:VALUE_MAX_LENGTH] if referrer else ''),
+    )
+
+
+def _aggregate(rows):
+    """Menghitung selisih jumlah kunjungan per (jam/tanggal, dimensi, nilai)"""
+    hourly = Counter()
+    daily = Counter()
+    for page_url, referrer, device_type, browser, visited_at in rows:
+        hour = visited_at.replace(minute=0, second=0, microsecond=0)
+        date = timezone.localtime(visited_at).date()
+        for dimension, value in _dimensions(page_url, referrer, device_type, browser):
+            hourly[hour, dimension, value] += 1
+            daily[date, dimension, value] += 1
+    return hourly, daily
+
+
+def _apply(model, bucket_field, counts):
+    """Menambahkan `counts` ke tabel agregat: bulk_update baris lama, bulk_create baris baru"""
+    if not counts:
+        return
+    buckets = {bucket for bucket, _, _ in counts}
+    existing = {
+        (getattr(stat, bucket_field), stat.dimension, stat.value): stat
+        for stat in model.objects.filter(**{f'{bucket_field}__in': buckets})
+    }
+    changed = []
+    created = []
+    for (bucket, dimension, value), count in counts.items():
+        stat = existing.get((bucket, dimension, value))
+        if stat is None:
+            created.append(model(**{bucket_field: bucket}, dimension=dimension, value=value, view_count=count))
+        else:
+            stat.view_count += count
+            changed.append(stat)
+    model.objects.bulk_update(changed, ['view_count'], batch_size=500)
+    model.objects.bulk_create(created, batch_size=500)
+
+
+def rollup_visitor_logs(chunk_size=5000, log=None):
+    """
+    Mengagregasi VisitorLog dengan id di atas watermark, per chunk dalam satu
+    transaksi (agregat + watermark), sehingga rollup yang terhenti aman diulang.
+    Mengembalikan jumlah log yang diagregasi.
+    """
+    settled = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    state, _ = VisitorRollupState.objects.get_or_create(pk=1)
+    last_id = state.last_log_id
+    total = 0
+
+    while True:
+        rows = list(
+            VisitorLog.objects.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', 'page_url', 'referrer', 'device_type', 'browser', 'visited_at')[:chunk_size]
+        )
+        # Berhenti di log pertama yang belum cukup lama tersimpan
+        ready = []
+        for row in rows:
+            if row[-1] >= settled:
+                break
+            ready.append(row)
+        if not ready:
+            return total
+
+        new_last_id = ready[-1][0]
+        hourly, daily = _aggregate(row[1:] for row in ready)
+        with transaction.atomic():
+            # Watermark hanya maju dari nilai yang kita baca; 0 baris = proses lain mendahului
+            updated = VisitorRollupState.objects.filter(pk=1, last_log_id=last_id).update(
+                last_log_id=new_last_id, updated_at=timezone.now(),
+            )
+            if not updated:
+                raise RollupConflict(last_id)
+            _apply(VisitorStatHourly, 'hour', hourly)
+            _apply(VisitorStatDaily, 'date', daily)
+
+        last_id = new_last_id
+        total += len(ready)
+        if log:
+            log(f'{total} log diagregasi...')
+        if len(ready) < len(rows) or len(rows) < chunk_size:
+            return total
+
+
+def _delete_in_chunks(queryset, chunk_size):
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += queryset.model.objects.filter(pk__in=ids).delete()[0]
+
+
+def prune_visitor_logs(days=None, hourly_days=None, chunk_size=5000, dry_run=False):
+    """
+    Menghapus VisitorLog yang lebih lama dari `days` hari dan sudah diagregasi,
+    serta agregat per jam yang lebih lama dari `hourly_days` hari.
+    Agregat harian tidak pernah dihapus. Mengembalikan dict jumlah baris.
+    """
+    days = days if days is not None else getattr(settings, 'VISITOR_LOG_RETENTION_DAYS', 30)
+    hourly_days = hourly_days if hourly_days is not None else getattr(settings, 'VISITOR_STATS_HOURLY_RETENTION_DAYS', 90)
+    now = timezone.now()
+    state = VisitorRollupState.objects.filter(pk=1).first()
+    last_id = state.last_log_id if state else 0
+
+    logs = VisitorLog.objects.filter(visited_at__lt=now - timedelta(days=days), pk__lte=last_id)
+    hourly = VisitorStatHourly.objects.filter(hour__lt=now - timedelta(days=hourly_days))
+    if dry_run:
+        return {'logs': logs.count(), 'hourly': hourly.count()}
+    return {
+        'logs': _delete_in_chunks(logs, chunk_size),
+        'hourly': _delete_in_chunks(hourly, chunk_size),
+    }
+
+
+def _top(queryset, dimension, limit=DASHBOARD_TOP):
+    rows = list(
+        queryset.filter(dimension=dimension).values('value')
+        .annotate(total=Sum('view_count')).order_by('-total', 'value')[:limit]
+    )
+    peak = rows[0]['total'] if rows else 0
+    for row in rows:
+        row['percent'] = round(row['total'] * 100 / peak) if peak else 0
+    return rows
+
+
+def _series(queryset, bucket_field):
+    """Jumlah kunjungan per bucket (dimensi `page` mencakup setiap kunjungan tepat sekali)"""
+    rows = list(
+        queryset.filter(dimension='page').values(bucket_field)
+        .annotate(total=Sum('view_count')).order_by(bucket_field)
+    )
+    peak = max((row['total'] for row in rows), default=0)
+    for row in rows:
+        row['bucket'] = row.pop(bucket_field)
+        row['percent'] = round(row['total'] * 100 / peak) if peak else 0
+    return rows
+
+
+def dashboard(days=DASHBOARD_DAYS):
+    """Ringkasan untuk dashboard admin, hanya dari tabel agregat"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    daily = VisitorStatDaily.objects.filter(date__gte=since)
+    hourly = VisitorStatHourly.objects.filter(hour__gte=timezone.now() - timedelta(hours=24))
+    per_day = _series(daily, 'date')
+    state = VisitorRollupState.objects.filter(pk=1).first()
+    return {
+        'days': days,
+        'total': sum(row['total'] for row in per_day),
+        'per_day': per_day,
+        'per_hour': _series(hourly, 'hour'),
+        'top': [
+            (label, _top(daily, dimension))
+            for dimension, label in VisitorStatDaily.DIMENSION_CHOICES
+        ],
+        'updated_at': state.updated_at if state else None,
+    }
@@ -0,0 +1,227 @@
+"""
+Indeks pencarian global
+Satu tabel FTS5 (SQLite) untuk berita, prestasi, karya, FAQ, dan dosen,
+disinkronkan lewat signal. Backend bisa diganti lewat settings.SEARCH_BACKEND;
+DatabaseBackend (icontains) dipakai bila database tidak mendukung FTS5.
+"""
+
+import re
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape, strip_tags
+from django.utils.module_loading import import_string
+
+
+SEARCH_TABLE = 'main_searchindex'
+
+SearchSource = namedtuple('SearchSource', ['model', 'title', 'body', 'active'])
+
+# Urutan menentukan kode tipe di rowid FTS, jangan diubah tanpa rebuild indeks
+SEARCH_SOURCES = {
+    'berita': SearchSource('berita.Berita', 'judul', ('ringkasan', 'konten'), {'is_published': True}),
+    'prestasi': SearchSource('prestasi.Prestasi', 'judul', ('nama_kompetisi', 'deskripsi', 'nama_peraih'), {'is_published': True}),
+    'karya': SearchSource('karya.KaryaMahasiswa', 'judul', ('nama_pembuat', 'deskripsi'), {'is_published': True}),
+    'faq': SearchSource('main.FAQ', 'pertanyaan', ('jawaban',), {'is_active': True}),
+    'dosen': SearchSource('akademik.Dosen', 'nama', ('bidang_keahlian', 'research_interest', 'bio'), {'is_active': True}),
+}
+KIND_CODES = {kind: code for code, kind in enumerate(SEARCH_SOURCES)}
+KIND_SLOTS = 8
+
+SearchHit = namedtuple('SearchHit', ['object_id', 'snippet', 'score'])
+
+# Penanda sementara untuk highlight, diganti <mark> setelah teks di-escape
+MARK_START, MARK_END = '\x02', '\x03'
+
+
+def get_model(kind):
+    return apps.get_model(SEARCH_SOURCES[kind].model)
+
+
+def kind_for_model(model):
+    label = model._meta.label
+    for kind, source in SEARCH_SOURCES.items():
+        if source.model == label:
+            return kind
+    return None
+
+
+def is_indexable(kind, obj):
+    """Hanya konten yang sudah dipublikasikan/aktif yang masuk indeks"""
+    return all(getattr(obj, field) == value for field, value in SEARCH_SOURCES[kind].active.items())
+
+
+def document_text(kind, obj):
+    """Mengembalikan (judul, isi) teks polos untuk diindeks"""
+    source = SEARCH_SOURCES[kind]
+    body = ' '.join(strip_tags(getattr(obj, field) or '') for field in source.body)
+    return getattr(obj, source.title), re.sub(r'\s+', ' ', body).strip()
+
+
+def highlight(snippet):
+    """Escape HTML snippet lalu ubah penanda menjadi <mark>"""
+    return escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+class DatabaseBackend:
+    """Backend cadangan: query icontains per tipe, tanpa indeks terpisah"""
+
+    def index(self, kind, obj):
+        pass
+
+    def remove(self, kind, pk):
+        pass
+
+    def rebuild(self, get_model=get_model):
+        return 0
+
+    def search(self, query, kinds, limit):
+        results = {}
+        for kind in kinds:
+            source = SEARCH_SOURCES[kind]
+            condition = Q(**{f'{source.title}__icontains': query})
+            for field in source.body:
+                condition |= Q(**{f'{field}__icontains': query})
+            ids = get_model(kind).objects.filter(condition, **source.active).values_list('pk', flat=True)[:limit]
+            results[kind] = [SearchHit(pk, None, 0.0) for pk in ids]
+        return results
+
+
+class SQLiteFTSBackend:
+    """
+    Backend FTS5: satu virtual table dengan ranking BM25 dan snippet.
+    rowid = pk * KIND_SLOTS + kode tipe, sehingga update/hapus satu dokumen
+    cukup lewat rowid tanpa scan tabel.
+    """
+
+    # Bobot BM25 per kolom: judul lebih penting dari isi
+    TITLE_WEIGHT = 5.0
+    BODY_WEIGHT = 1.0
+
+    @staticmethod
+    def rowid(kind, pk):
+        return pk * KIND_SLOTS + KIND_CODES[kind]
+
+    def index(self, kind, obj):
+        title, body = document_text(kind, obj)
+        rowid = self.rowid(kind, obj.pk)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [rowid])
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, kind, title, body) VALUES (%s, %s, %s, %s)',
+                [rowid, kind, title, body],
+            )
+
+    def remove(self, kind, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [self.rowid(kind, pk)])
+
+    def rebuild(self, get_model=get_model):
+        """
+        Mengisi ulang seluruh indeks dari database, mengembalikan jumlah dokumen.
+        `get_model` bisa diganti agar migration memakai model historis.
+        """
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            for kind, source in SEARCH_SOURCES.items():
+                rows = []
+                for obj in get_model(kind).objects.filter(**source.active).iterator(chunk_size=500):
+                    title, body = document_text(kind, obj)
+                    rows.append([self.rowid(kind, obj.pk), kind, title, body])
+                cursor.executemany(
+                    f'INSERT INTO {SEARCH_TABLE} (rowid, kind, title, body) VALUES (%s, %s, %s, %s)', rows
+                )
+                total += len(rows)
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+        return total
+
+    @staticmethod
+    def match_expression(query):
+        """Setiap kata menjadi prefix query yang di-quote, digabung dengan AND"""
+        terms = re.findall(r'\w+', query.lower())
+        return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+    def search(self, query, kinds, limit):
+        expression = self.match_expression(query)
+        results = {kind: [] for kind in kinds}
+        if not expression or not kinds:
+            return results
+
+        placeholders = ', '.join(['%s'] * len(kinds))
+        # snippet() tidak bisa dipakai di dalam subquery window, jadi top-N per tipe
+        # dipilih di subquery lalu snippet dibuat di query luar (tetap satu round-trip)
+        sql = f'''
+            SELECT kind, rowid / {KIND_SLOTS},
+                   snippet({SEARCH_TABLE}, 2, %s, %s, '…', 24),
+                   bm25({SEARCH_TABLE}, 0.0, %s, %s) AS score
+            FROM {SEARCH_TABLE}
+            WHERE {SEARCH_TABLE} MATCH %s AND rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (
+                        PARTITION BY kind ORDER BY bm25({SEARCH_TABLE}, 0.0, %s, %s)
+                    ) AS position
+                    FROM {SEARCH_TABLE}
+                    WHERE {SEARCH_TABLE} MATCH %s AND kind IN ({placeholders})
+                )
+                WHERE position <= %s
+            )
+            ORDER BY kind, score
+        '''
+        weights = [self.TITLE_WEIGHT, self.BODY_WEIGHT]
+        params = [MARK_START, MARK_END, *weights, expression, *weights, expression, *kinds, limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for kind, object_id, snippet, score in cursor.fetchall():
+                results[kind].append(SearchHit(object_id, highlight(snippet), -score))
+        return results
+
+
+def fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+        return cursor.fetchone() is not None
+
+
+_backend = None
+
+
+def get_backend():
+    """Backend dari settings.SEARCH_BACKEND, atau FTS5 jika tabelnya ada"""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        else:
+            _backend = SQLiteFTSBackend() if fts5_available() else DatabaseBackend()
+    return _backend
+
+
+def search(query, kinds=None, limit=5):
+    """
+    Pencarian global. Mengembalikan dict tipe -> daftar objek model
+    terurut berdasarkan relevansi, masing-masing dengan atribut `search_snippet`.
+    """
+    kinds = [k for k in (kinds or SEARCH_SOURCES) if k in SEARCH_SOURCES]
+    hits = get_backend().search(query, kinds, limit)
+
+    results = {}
+    for kind in kinds:
+        kind_hits = hits.get(kind, [])
+        if not kind_hits:
+            results[kind] = []
+            continue
+        objects = get_model(kind).objects.in_bulk([hit.object_id for hit in kind_hits])
+        results[kind] = []
+        for hit in kind_hits:
+            obj = objects.get(hit.object_id)
+            if obj is not None:
+                obj.search_snippet = hit.snippet
+                results[kind].append(obj)
+    return results
@@ -0,0 +1,114 @@
+"""
+Signals untuk main app
+Menjaga indeks pencarian global, autocomplete, cache fragmen, dan turunan gambar tetap sinkron dengan konten
+Indeks pencarian diperbarui langsung setelah commit; pekerjaan berat (turunan gambar,
+pemanasan cache) diantrekan ke main/tasks.py
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
+
+from . import autocomplete as ac
+from . import images
+from .fragments import cache_is_shared, fragments
+from .pagecache import touch_model
+from .search import SEARCH_SOURCES, get_model, kind_for_model
+from . import tasks
+from .tasks import enqueue
+
+
+def _indexed_fields(kind):
+    source = SEARCH_SOURCES[kind]
+    return {source.title, *source.body, *source.active}
+
+
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Index ulang dokumen setelah disimpan, atau keluarkan jika tidak lagi dipublikasikan"""
+    kind = kind_for_model(sender)
+    # Simpan parsial yang tidak menyentuh field terindeks (mis. view_count) tidak perlu diindeks ulang
+    if update_fields and not set(update_fields) & _indexed_fields(kind):
+        return
+    sync_search_index(kind, instance.pk)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    sync_search_index(kind_for_model(sender), instance.pk)
+
+
+def sync_search_index(kind, pk):
+    """
+    Satu dokumen FTS cukup murah untuk diperbarui di request admin, jadi tidak
+    lewat antrian: indeks tetap sinkron walaupun run_worker tidak berjalan.
+    Dijalankan setelah commit dan membaca ulang data; error hanya dicatat.
+    """
+    transaction.on_commit(lambda: tasks.update_search_index(kind, pk), robust=True)
+
+
+def update_autocomplete(sender, instance, **kwargs):
+    """Terapkan perubahan ke indeks autocomplete lokal, proses lain build ulang lewat version stamp"""
+    # Kenaikan view_count tidak lewat sini: counter di-flush dengan .update(), lihat main/counters.py
+    kind = ac.kind_for_model(sender)
+    ac.autocomplete.update(kind, instance)
+    ac.autocomplete.mark_current(*ac.bump_autocomplete_version())
+
+
+def remove_from_autocomplete(sender, instance, **kwargs):
+    ac.autocomplete.remove(ac.kind_for_model(sender), instance.pk)
+    ac.autocomplete.mark_current(*ac.bump_autocomplete_version())
+
+
+def invalidate_fragments(sender, instance=None, **kwargs):
+    """Naikkan version fragmen (dan validator halaman) yang bergantung pada model yang berubah"""
+    model = type(instance) if instance is not None else sender
+    fragments.invalidate_model(model)
+    touch_model(model)
+    warm_fragments_later(model)
+
+
+def warm_fragments_later(model):
+    """Render ulang fragmen di worker, digabung untuk perubahan beruntun dalam beberapa detik"""
+    if fragments.depends_on(model) and cache_is_shared():
+        enqueue('main.warm_fragments', key='warm:fragments', delay=5)
+
+
+def invalidate_m2m_fragments(sender, instance, model, action, **kwargs):
+    if action.startswith('post_'):
+        for changed in (type(instance), model):
+            fragments.invalidate_model(changed)
+            touch_model(changed)
+            warm_fragments_later(changed)
+
+
+def generate_image_derivatives(sender, instance, update_fields=None, **kwargs):
+    """Antrekan pembuatan turunan responsif untuk gambar yang baru diunggah"""
+    fields = images.IMAGE_FIELDS[sender._meta.label]
+    if update_fields and not set(update_fields) & set(fields):
+        return
+    if any(getattr(instance, name) for name in fields):
+        label = sender._meta.label
+        enqueue('main.generate_image_derivatives', label=label, pk=instance.pk, key=f'images:{label}:{instance.pk}')
+
+
+def connect_image_signals():
+    for label in images.IMAGE_FIELDS:
+        post_save.connect(generate_image_derivatives, sender=apps.get_model(label),
+                          dispatch_uid=f'image_derivatives_{label}')
+
+
+def connect_fragment_signals():
+    # Tanpa sender: dependensi fragmen dicek lewat label model, jadi fragmen baru tidak perlu didaftarkan ulang di sini
+    post_save.connect(invalidate_fragments, dispatch_uid='fragment_cache_save')
+    post_delete.connect(invalidate_fragments, dispatch_uid='fragment_cache_delete')
+    m2m_changed.connect(invalidate_m2m_fragments, dispatch_uid='fragment_cache_m2m')
+
+
+def connect_search_signals():
+    for kind in SEARCH_SOURCES:
+        model = get_model(kind)
+        post_save.connect(update_search_index, sender=model, dispatch_uid=f'search_index_save_{kind}')
+        post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f'search_index_delete_{kind}')
+    for kind in ac.AUTOCOMPLETE_SOURCES:
+        model = ac.get_model(kind)
+        post_save.connect(update_autocomplete, sender=model, dispatch_uid=f'autocomplete_save_{kind}')
+        post_delete.connect(remove_from_autocomplete, sender=model, dispatch_uid=f'autocomplete_delete_{kind}')
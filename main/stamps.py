@@ -0,0 +1,33 @@
+"""
+Version stamp bersama untuk invalidasi antar proses
+SiteSettings, engine/jawaban chatbot, autocomplete, fragmen, dan cache halaman
+menyimpan stamp di alias cache `stamps` (settings.CACHES) yang tidak pernah
+di-cull: cache default boleh membuang entri kapan saja, tetapi stamp yang hilang
+membuat proses lain kembali ke versi lama dan menyajikan konten usang.
+"""
+
+import time
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+
+STAMP_CACHE_ALIAS = 'stamps'
+
+# Proxy seperti django.core.cache.cache, ke alias stamps
+stamp_cache = ConnectionProxy(caches, STAMP_CACHE_ALIAS)
+
+
+def fresh_stamp():
+    """Nilai awal stamp yang tidak mungkin sama dengan versi lama (milidetik epoch)"""
+    return int(time.time() * 1000)
+
+
+def bump_stamp(key):
+    """Menaikkan stamp `key`, mengembalikan nilai barunya"""
+    try:
+        return stamp_cache.incr(key)
+    except ValueError:
+        value = fresh_stamp()
+        stamp_cache.set(key, value, None)
+        return value
@@ -0,0 +1,265 @@
+"""
+Pipeline static files untuk production
+`collectstatic` dengan CompressedManifestStaticFilesStorage:
+1. CSS/JS milik proyek (STATICFILES_DIRS) di-minify di STATIC_ROOT,
+2. semua file diberi hash isi di nama (ManifestStaticFilesStorage, staticfiles.json),
+3. file teks ditulis ulang sebagai sibling .gz (dan .br jika paket `brotli` terpasang).
+StaticAssetMiddleware (main/middleware.py) lalu menyajikan varian terkompresi
+dengan Cache-Control satu tahun untuk nama file ber-hash.
+
+Minifier sengaja konservatif: komentar dan spasi dibuang, isi string/template
+literal/regex tidak disentuh, dan baris baru JS dipertahankan (aman untuk ASI).
+"""
+
+import gzip
+import logging
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import HashedFilesMixin, ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # .br dilewati, .gz tetap dibuat
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.json', '.svg', '.txt', '.xml', '.html', '.map', '.ico', '.ttf', '.eot'}
+COMPRESS_MIN_SIZE = 256
+# Nama ber-hash dari ManifestStaticFilesStorage: nama.<12 hex>.ext
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+
+
+# ----------------------------------------------------------------------
+# Minifier
+# ----------------------------------------------------------------------
+
+CSS_TOKEN_RE = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.S)
+
+
+def _minify_css_code(code):
+    code = re.sub(r'\s+', ' ', code)
+    code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+    return re.sub(r':\s+', ':', code).replace(';}', '}')
+
+
+def minify_css(css):
+    """Buang komentar (kecuali /*! dan /*#) dan spasi yang tidak bermakna; isi string tidak disentuh"""
+    parts = []
+    code = ''
+    position = 0
+    for match in CSS_TOKEN_RE.finditer(css):
+        code += css[position:match.start()]
+        token = match.group()
+        if token.startswith('/*') and not token.startswith(('/*!', '/*#')):
+            code += ' '
+        else:
+            parts.extend([_minify_css_code(code), token])
+            code = ''
+        position = match.end()
+    parts.append(_minify_css_code(code + css[position:]))
+    return ''.join(parts).strip()
+
+
+# Karakter/kata sebelum "/" yang berarti awal regex literal, bukan operator bagi
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw'}
+
+
+def _skip_string(src, i):
+    quote = src[i]
+    i += 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == '\\' else 1
+    return i + 1
+
+
+def _skip_template(src, i):
+    """Akhir template literal mulai dari backtick di `i`, termasuk ${...} bersarang"""
+    i += 1
+    while i < len(src) and src[i] != '`':
+        if src[i] == '\\':
+            i += 2
+        elif src.startswith('${', i):
+            i = _skip_code(src, i + 2, '}')
+        else:
+            i += 1
+    return i + 1
+
+
+def _skip_code(src, i, closing):
+    depth = 0
+    while i < len(src):
+        char = src[i]
+        if char in '\'"':
+            i = _skip_string(src, i)
+        elif char == '`':
+            i = _skip_template(src, i)
+        elif char == '{':
+            depth += 1
+            i += 1
+        elif char == closing and depth == 0:
+            return i + 1
+        elif char == '}':
+            depth -= 1
+            i += 1
+        else:
+            i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    i += 1
+    in_class = False
+    while i < len(src) and src[i] != '\n':
+        char = src[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(src) and (src[i].isalnum() or src[i] in '_$'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _regex_allowed(out, pending):
+    """Apakah "/" memulai regex literal, dilihat dari kode signifikan terakhir sebelumnya"""
+    stripped = pending.rstrip()
+    for chunk in reversed(out):
+        if stripped:
+            break
+        stripped = chunk.rstrip()
+    if not stripped:
+        return True
+    if stripped[-1] in REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[A-Za-z_$][\w$]*$', stripped)
+    return bool(word and word.group() in REGEX_KEYWORDS)
+
+
+def minify_js(src):
+    """
+    Buang komentar (kecuali /*! dan //#), indentasi, spasi ganda, dan baris kosong.
+    Baris baru tetap dipertahankan sehingga automatic semicolon insertion tidak berubah.
+    """
+    out = []
+    i = 0
+    code_start = 0
+
+    def flush_code(end):
+        out.append(re.sub(r'[ \t\f\v]+', ' ', src[code_start:end]))
+
+    while i < len(src):
+        char = src[i]
+        if char in '\'"`' or (char == '/' and src[i + 1:i + 2] not in ('/', '*') and _regex_allowed(out, src[code_start:i])):
+            flush_code(i)
+            end = _skip_template(src, i) if char == '`' else _skip_string(src, i) if char != '/' else _skip_regex(src, i)
+            out.append(src[i:end])
+            i = code_start = end
+        elif src.startswith('//', i) or src.startswith('/*', i):
+            flush_code(i)
+            end = src.find('\n', i) if src[i + 1] == '/' else src.find('*/', i) + 2
+            end = len(src) if end in (-1, 1) else end
+            comment = src[i:end]
+            if comment.startswith(('/*!', '//#')):
+                out.append(comment)
+            elif comment.startswith('/*') and '\n' in comment:
+                out.append('\n')
+            else:
+                out.append(' ')
+            i = code_start = end
+        else:
+            i += 1
+    flush_code(len(src))
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+# ----------------------------------------------------------------------
+# Kompresi dan storage
+# ----------------------------------------------------------------------
+
+def compress_file(path):
+    """Menulis path.gz (dan path.br) jika hasilnya lebih kecil; mengembalikan daftar file baru"""
+    path = Path(path)
+    data = path.read_bytes()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return []
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    written = []
+    for suffix, compressed in variants:
+        target = path.with_name(path.name + suffix)
+        if len(compressed) < len(data) * 0.95:
+            target.write_bytes(compressed)
+            written.append(target)
+        elif target.exists():
+            target.unlink()
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage + minify CSS/JS proyek + sibling .gz/.br"""
+
+    def url(self, name, force=False):
+        # Beberapa template merujuk gambar placeholder yang belum ada di static/:
+        # tetap kembalikan URL tanpa hash (404 biasa) alih-alih error 500
+        try:
+            return super().url(name, force)
+        except ValueError:
+            return super(HashedFilesMixin, self).url(name)
+
+    def _project_roots(self):
+        roots = set()
+        for entry in settings.STATICFILES_DIRS:
+            directory = entry[1] if isinstance(entry, (list, tuple)) else entry
+            roots.add(Path(directory).resolve())
+        return roots
+
+    def minify(self, paths):
+        """
+        Minify salinan di STATIC_ROOT lalu arahkan `paths` ke salinan itu, karena
+        HashedFilesMixin membaca ulang isi dari storage sumber saat membuat file ber-hash.
+        """
+        if not getattr(settings, 'STATIC_MINIFY', True):
+            return
+        roots = self._project_roots()
+        for name, (storage, source_path) in list(paths.items()):
+            minifier = MINIFIERS.get(Path(name).suffix)
+            location = getattr(storage, 'location', None)
+            if minifier is None or location is None or Path(location).resolve() not in roots:
+                continue
+            target = Path(self.path(name))
+            original = target.read_text(encoding='utf-8')
+            minified = minifier(original)
+            if minified != original:
+                target.write_text(minified, encoding='utf-8')
+                paths[name] = (self, name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+        self.minify(paths)
+        yield from super().post_process(paths, dry_run, **options)
+
+        if brotli is None:
+            logger.warning('Paket brotli tidak terpasang, hanya varian .gz yang dibuat')
+        for name in set(paths) | set(self.hashed_files.values()):
+            if name and Path(name).suffix in COMPRESSIBLE_EXTENSIONS and self.exists(name):
+                compress_file(self.path(name))
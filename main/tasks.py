@@ -0,0 +1,252 @@
+"""
+Antrian tugas latar belakang berbasis database
+Pekerjaan berat setelah admin menyimpan konten (turunan gambar, indeks pencarian,
+pemanasan cache) diantrekan ke tabel Task lalu dijalankan `manage.py run_worker`,
+sehingga request admin tidak menunggu. Tanpa Redis/Celery: worker mengklaim tugas
+dengan UPDATE bersyarat, jadi beberapa worker aman berjalan bersamaan.
+
+    @register('app.nama_tugas')
+    def nama_tugas(pk):
+        ...
+
+    enqueue('app.nama_tugas', pk=obj.pk, key=f'nama_tugas:{obj.pk}', delay=10)
+
+Dengan settings.TASKS_EAGER (default saat DEBUG) tugas langsung dijalankan di
+proses yang sama setelah transaksi commit, sehingga development tidak butuh worker.
+"""
+
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+# nama -> fungsi; argumen tugas adalah keyword dari payload (harus JSON-serializable)
+TASKS = {}
+
+
+def register(name):
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def _eager():
+    return getattr(settings, 'TASKS_EAGER', False)
+
+
+def _run_eager(name, payload):
+    try:
+        TASKS[name](**payload)
+    except Exception:
+        logger.exception('Tugas %s gagal', name)
+
+
+def enqueue(name, key='', delay=0, run_at=None, max_attempts=None, **payload):
+    """
+    Mengantrekan tugas `name` dengan argumen `payload`.
+    Jika `key` diisi dan tugas dengan key yang sama masih menunggu, tugas itu yang
+    dipakai (jadwalnya tidak diubah). Baris Task ikut transaksi pemanggil, jadi
+    worker baru melihatnya setelah data yang diproses ter-commit.
+    """
+    if name not in TASKS:
+        raise KeyError(f'Tugas tidak terdaftar: {name}')
+    if _eager():
+        transaction.on_commit(lambda: _run_eager(name, payload))
+        return None
+
+    if key:
+        existing = Task.objects.filter(key=key, status=Task.STATUS_PENDING).first()
+        if existing:
+            return existing
+    task = Task(
+        name=name, payload=payload, key=key,
+        run_at=run_at or timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or getattr(settings, 'TASK_MAX_ATTEMPTS', 5),
+    )
+    try:
+        with transaction.atomic():
+            task.save()
+    except IntegrityError:
+        # Proses lain mengantrekan key yang sama di antara cek dan insert
+        return Task.objects.filter(key=key, status=Task.STATUS_PENDING).first()
+    return task
+
+
+def overdue_tasks(grace=None):
+    """
+    Jumlah tugas menunggu yang sudah lewat jadwal lebih dari `grace` detik
+    (default TASK_OVERDUE_WARNING): tanda run_worker tidak berjalan.
+    """
+    grace = grace if grace is not None else getattr(settings, 'TASK_OVERDUE_WARNING', 600)
+    return Task.objects.filter(
+        status=Task.STATUS_PENDING, run_at__lt=timezone.now() - timedelta(seconds=grace),
+    ).count()
+
+
+def retry_delay(attempts):
+    """Backoff eksponensial: 30 dtk, 1 mnt, 2 mnt, ... maksimal 1 jam"""
+    return min(30 * 2 ** (attempts - 1), 3600)
+
+
+class Worker:
+    """
+    Mengambil dan menjalankan tugas yang sudah jatuh tempo satu per satu.
+    Tugas `running` yang terkunci lebih lama dari `lock_timeout` (worker mati)
+    dikembalikan ke antrian.
+    """
+
+    def __init__(self, name=None, lock_timeout=None, schedule=None):
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.lock_timeout = lock_timeout or getattr(settings, 'TASK_LOCK_TIMEOUT', 600)
+        self.schedule = schedule if schedule is not None else getattr(settings, 'TASK_SCHEDULE', {})
+
+    def claim(self):
+        """Mengklaim satu tugas jatuh tempo; None jika antrian kosong"""
+        while True:
+            candidate = (
+                Task.objects.filter(status=Task.STATUS_PENDING, run_at__lte=timezone.now())
+                .order_by('run_at', 'id').values_list('pk', flat=True).first()
+            )
+            if candidate is None:
+                return None
+            claimed = Task.objects.filter(pk=candidate, status=Task.STATUS_PENDING).update(
+                status=Task.STATUS_RUNNING, locked_by=self.name, locked_at=timezone.now(),
+            )
+            if claimed:
+                return Task.objects.get(pk=candidate)
+            # Diambil worker lain lebih dulu: coba kandidat berikutnya
+
+    def execute(self, task):
+        task.attempts += 1
+        try:
+            func = TASKS[task.name]
+            func(**task.payload)
+        except Exception:
+            task.last_error = traceback.format_exc()
+            if task.attempts < task.max_attempts:
+                task.status = Task.STATUS_PENDING
+                task.run_at = timezone.now() + timedelta(seconds=retry_delay(task.attempts))
+            else:
+                task.status = Task.STATUS_FAILED
+                task.finished_at = timezone.now()
+            logger.warning('Tugas %s #%s gagal (percobaan %d/%d)',
+                           task.name, task.pk, task.attempts, task.max_attempts, exc_info=True)
+        else:
+            task.status = Task.STATUS_DONE
+            task.finished_at = timezone.now()
+        task.locked_by = ''
+        task.locked_at = None
+        try:
+            task.save(update_fields=['status', 'attempts', 'run_at', 'last_error',
+                                     'locked_by', 'locked_at', 'finished_at'])
+        except IntegrityError:
+            # Retry bentrok dengan tugas ber-key sama yang sudah diantrekan ulang: cukup satu
+            task.status = Task.STATUS_DONE
+            task.finished_at = timezone.now()
+            task.save(update_fields=['status', 'attempts', 'last_error', 'locked_by', 'locked_at', 'finished_at'])
+        return task
+
+    def requeue_stale(self):
+        """Mengembalikan tugas milik worker yang mati ke antrian"""
+        stale = timezone.now() - timedelta(seconds=self.lock_timeout)
+        count = 0
+        for task in Task.objects.filter(status=Task.STATUS_RUNNING, locked_at__lt=stale):
+            retry = task.attempts + 1 < task.max_attempts
+            current = Task.objects.filter(pk=task.pk, status=Task.STATUS_RUNNING, locked_at=task.locked_at)
+            changes = {
+                'attempts': task.attempts + 1, 'locked_by': '', 'locked_at': None,
+                'last_error': f'Worker {task.locked_by} tidak menyelesaikan tugas dalam {self.lock_timeout} detik',
+            }
+            try:
+                with transaction.atomic():
+                    count += current.update(
+                        status=Task.STATUS_PENDING if retry else Task.STATUS_FAILED,
+                        finished_at=None if retry else timezone.now(), **changes,
+                    )
+            except IntegrityError:
+                # Tugas ber-key sama sudah diantrekan ulang, cukup yang itu
+                count += current.update(status=Task.STATUS_DONE, finished_at=timezone.now(), **changes)
+        return count
+
+    def schedule_periodic(self):
+        """Mengantrekan tugas berkala (settings.TASK_SCHEDULE: nama -> interval detik)"""
+        for name, interval in self.schedule.items():
+            key = f'schedule:{name}'
+            last = Task.objects.filter(key=key).order_by('-created_at').first()
+            if last and last.status in (Task.STATUS_PENDING, Task.STATUS_RUNNING):
+                continue
+            run_at = (last.finished_at or last.created_at) + timedelta(seconds=interval) if last else timezone.now()
+            enqueue(name, key=key, run_at=run_at)
+
+    def run_pending(self, limit=None):
+        """Menjalankan tugas jatuh tempo sampai antrian kosong; mengembalikan jumlahnya"""
+        count = 0
+        while limit is None or count < limit:
+            close_old_connections()
+            task = self.claim()
+            if task is None:
+                break
+            self.execute(task)
+            count += 1
+        close_old_connections()
+        return count
+
+
+# ----------------------------------------------------------------------
+# Tugas bawaan
+# ----------------------------------------------------------------------
+
+@register('main.generate_image_derivatives')
+def generate_image_derivatives(label, pk, fields=None):
+    from . import images
+    instance = apps.get_model(label)._base_manager.filter(pk=pk).first()
+    if instance is not None:
+        images.process_instance(instance, fields)
+
+
+@register('main.update_search_index')
+def update_search_index(kind, pk):
+    """
+    Menyamakan dokumen indeks dengan isi database terbaru (index, atau hapus jika tidak ada/tidak tayang).
+    Dipanggil langsung oleh signals setelah commit; tetap terdaftar untuk tugas lama di antrian.
+    """
+    from .search import get_backend, get_model, is_indexable
+    backend = get_backend()
+    instance = get_model(kind)._base_manager.filter(pk=pk).first()
+    if instance is not None and is_indexable(kind, instance):
+        backend.index(kind, instance)
+    else:
+        backend.remove(kind, pk)
+
+
+@register('main.warm_fragments')
+def warm_fragments():
+    from .fragments import warm_fragments
+    warm_fragments()
+
+
+@register('main.rollup_visitor_logs')
+def rollup_visitor_logs():
+    from .rollups import rollup_visitor_logs
+    rollup_visitor_logs()
+
+
+@register('main.purge_tasks')
+def purge_tasks(days=None):
+    """Menghapus tugas selesai yang lebih lama dari TASK_RETENTION_DAYS"""
+    days = days if days is not None else getattr(settings, 'TASK_RETENTION_DAYS', 7)
+    Task.objects.filter(
+        status=Task.STATUS_DONE, finished_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
@@ -0,0 +1,60 @@
+"""
+Template tags gambar responsif (turunan dari main/images.py)
+
+    {% load image_tags %}
+    {% picture berita.gambar_utama alt=berita.judul sizes="(min-width: 992px) 33vw, 100vw" class="img-fluid" %}
+    <img src="{{ dosen.foto|thumbnail:160 }}" srcset="{{ dosen.foto|srcset }}" sizes="80px">
+"""
+
+from django import template
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from main import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(field_file, sizes='100vw', **attrs):
+    """
+    <picture> dengan <source> per format modern dan <img> fallback.
+    Argumen lain menjadi atribut <img> (underscore -> tanda hubung); default loading="lazy".
+    Jika turunan belum dibuat, hanya <img> dengan file asli.
+    """
+    if not field_file:
+        return ''
+    attrs = {key.replace('_', '-'): value for key, value in attrs.items()}
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    name = field_file.name
+    widths = images.available_widths(name)
+    if not widths:
+        return format_html('<img src="{}"{}>', field_file.url, flatatt(attrs))
+
+    fallback = images.fallback_format(name)
+    sources = format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', (
+        (images.MIME_TYPES[fmt], images.srcset(field_file, fmt), sizes)
+        for fmt in images.modern_formats()
+    ))
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        sources,
+        default_storage.url(images.derivative_name(name, widths[-1], fallback)),
+        images.srcset(field_file, fallback),
+        sizes,
+        flatatt(attrs),
+    )
+
+
+@register.filter
+def srcset(field_file, fmt=None):
+    """Nilai atribut srcset untuk format `fmt` (default: format fallback)"""
+    return images.srcset(field_file, fmt)
+
+
+@register.filter
+def thumbnail(field_file, width):
+    """URL turunan terkecil selebar minimal `width` piksel"""
+    return images.thumbnail_url(field_file, int(width))
@@ -13,6 +13,10 @@ from .models import (
     SiteSettings, ProfilProdi, Kemitraan, PesanKontak,
     Slider, FAQ, Testimonial
 )
+from .autocomplete import AUTOCOMPLETE_SOURCES, autocomplete
+from .counters import counters
+from .fragments import render_home_sections
+from .search import SEARCH_SOURCES, search
 from berita.models import Berita
 from prestasi.models import Prestasi
 from akademik.models import Dosen
@@ -25,20 +29,8 @@ class HomeView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['sliders'] = Slider.objects.filter(is_active=True)[:5]
-        
-        try:
-            context['profil'] = ProfilProdi.objects.first()
-        except:
-            context['profil'] = None
-        
-        context['berita_list'] = Berita.objects.filter(is_published=True).order_by('-published_at')[:6]
-        context['prestasi_list'] = Prestasi.objects.filter(is_published=True).order_by('-tanggal')[:8]
-        context['karya_list'] = KaryaMahasiswa.objects.filter(is_published=True).order_by('-created_at')[:6]
-        context['kemitraan_list'] = Kemitraan.objects.filter(is_active=True)[:10]
-        context['testimonial_list'] = Testimonial.objects.filter(is_active=True, is_featured=True)[:4]
-        context['faq_list'] = FAQ.objects.filter(is_active=True).order_by('-view_count')[:5]
-        
+        # Setiap bagian dirender sekali dan di-cache, lihat main/fragments.py
+        context['sections'] = render_home_sections()
         return context
 
 
@@ -100,8 +92,7 @@ def faq_helpful(request, pk):
     if request.method == 'POST':
         try:
             faq = FAQ.objects.get(pk=pk)
-            faq.helpful_count += 1
-            faq.save()
+            counters.incr(faq, 'helpful_count')
             return JsonResponse({'status': 'success', 'helpful_count': faq.helpful_count})
         except FAQ.DoesNotExist:
             return JsonResponse({'status': 'error'}, status=404)
@@ -169,49 +160,38 @@ class TestimonialListView(ListView):
 
 
 def search_view(request):
-    """View untuk pencarian global"""
+    """View untuk pencarian global (satu query ke indeks pencarian, lihat main/search.py)"""
     query = request.GET.get('q', '')
-    results = {
-        'berita': [], 'prestasi': [], 'karya': [], 'faq': [], 'dosen': [],
-    }
+    selected_type = request.GET.get('type', '')
+    kinds = [selected_type] if selected_type in SEARCH_SOURCES else None
+    results = {kind: [] for kind in SEARCH_SOURCES}
     
     if query and len(query) >= 3:
-        results['berita'] = Berita.objects.filter(
-            Q(judul__icontains=query) | Q(konten__icontains=query), is_published=True
-        )[:5]
-        results['prestasi'] = Prestasi.objects.filter(
-            Q(judul__icontains=query) | Q(deskripsi__icontains=query), is_published=True
-        )[:5]
-        results['karya'] = KaryaMahasiswa.objects.filter(
-            Q(judul__icontains=query) | Q(deskripsi__icontains=query), is_published=True
-        )[:5]
-        results['faq'] = FAQ.objects.filter(
-            Q(pertanyaan__icontains=query) | Q(jawaban__icontains=query), is_active=True
-        )[:5]
-        results['dosen'] = Dosen.objects.filter(
-            Q(nama__icontains=query) | Q(bidang_keahlian__icontains=query), is_active=True
-        )[:5]
+        # Filter per tipe menampilkan lebih banyak hasil untuk tipe tersebut
+        results.update(search(query, kinds, limit=20 if kinds else 5))
     
     total = sum(len(v) for v in results.values())
     
     return render(request, 'main/search_results.html', {
-        'query': query, 'results': results, 'total': total,
+        'query': query, 'results': results, 'total': total, 'total_results': total,
+        'berita_results': results['berita'], 'prestasi_results': results['prestasi'],
+        'karya_results': results['karya'], 'faq_results': results['faq'],
+        'dosen_results': results['dosen'],
+        'selected_type': selected_type if kinds else '',
+        'type_choices': [('berita', 'Berita'), ('dosen', 'Dosen'), ('prestasi', 'Prestasi'),
+                         ('karya', 'Karya'), ('faq', 'FAQ')],
     })
 
 
 def live_search(request):
-    """AJAX view untuk live search"""
+    """AJAX view untuk live search, dijawab dari indeks autocomplete in-memory tanpa query database"""
     query = request.GET.get('q', '')
     suggestions = []
     
     if query and len(query) >= 2:
-        berita = Berita.objects.filter(judul__icontains=query, is_published=True).values_list('judul', flat=True)[:3]
-        suggestions.extend([{'text': b, 'type': 'Berita'} for b in berita])
-        
-        prestasi = Prestasi.objects.filter(judul__icontains=query, is_published=True).values_list('judul', flat=True)[:3]
-        suggestions.extend([{'text': p, 'type': 'Prestasi'} for p in prestasi])
-        
-        dosen = Dosen.objects.filter(nama__icontains=query, is_active=True).values_list('nama', flat=True)[:3]
-        suggestions.extend([{'text': d, 'type': 'Dosen'} for d in dosen])
+        suggestions = [
+            {'text': s.text, 'type': AUTOCOMPLETE_SOURCES[s.kind].label, 'url': s.url}
+            for s in autocomplete.suggest(query, per_kind=3, limit=10)
+        ]
     
-    return JsonResponse({'suggestions': suggestions[:10]})
+    return JsonResponse({'suggestions': suggestions})
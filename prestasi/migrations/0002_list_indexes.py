@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prestasi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prestasi',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-tanggal', '-id'], name='prestasi_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestasi',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['tingkat', '-tanggal'], name='prestasi_tingkat_idx'),
+        ),
+    ]
@@ -8,6 +8,11 @@ from django.urls import reverse
 from django.utils.text import slugify
 
 
+class PrestasiQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(is_published=True)
+
+
 class KategoriPrestasi(models.Model):
     """
     Model untuk kategori prestasi
@@ -94,10 +99,19 @@ class Prestasi(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PrestasiQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Prestasi'
         verbose_name_plural = 'Prestasi'
         ordering = ['-tanggal', '-created_at']
+        # Indeks parsial untuk daftar, filter tingkat, dan filter tahun (range tanggal)
+        indexes = [
+            models.Index(fields=['-tanggal', '-id'], condition=models.Q(is_published=True),
+                         name='prestasi_published_idx'),
+            models.Index(fields=['tingkat', '-tanggal'], condition=models.Q(is_published=True),
+                         name='prestasi_tingkat_idx'),
+        ]
     
     def __str__(self):
         return self.judul
@@ -7,17 +7,20 @@ from django.views.generic import ListView, DetailView
 from django.db.models import Q
 
 from .models import Prestasi
+from main.pagination import CursorPaginationMixin
 
 
-class PrestasiListView(ListView):
+class PrestasiListView(CursorPaginationMixin, ListView):
     """View untuk daftar prestasi"""
     model = Prestasi
     template_name = 'prestasi/prestasi_list.html'
     context_object_name = 'prestasi_list'
     paginate_by = 12
+    cursor_ordering = ('-tanggal',)
+    json_fields = ('judul', 'slug', 'tingkat', 'tanggal', 'nama_peraih', 'nama_kompetisi')
     
     def get_queryset(self):
-        queryset = Prestasi.objects.filter(is_published=True)
+        queryset = Prestasi.objects.published()
         
         tingkat = self.request.GET.get('tingkat')
         if tingkat:
@@ -32,7 +35,7 @@ class PrestasiListView(ListView):
             queryset = queryset.filter(
                 Q(judul__icontains=search) |
                 Q(deskripsi__icontains=search) |
-                Q(nama_peserta__icontains=search)
+                Q(nama_peraih__icontains=search)
             )
         
         return queryset.order_by('-tanggal')
@@ -40,7 +43,7 @@ class PrestasiListView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['tingkat_list'] = Prestasi.TINGKAT_CHOICES
-        context['tahun_list'] = Prestasi.objects.filter(is_published=True).dates('tanggal', 'year', order='DESC')
+        context['tahun_list'] = Prestasi.objects.published().dates('tanggal', 'year', order='DESC')
         context['selected_tingkat'] = self.request.GET.get('tingkat', '')
         context['selected_tahun'] = self.request.GET.get('tahun', '')
         context['search_query'] = self.request.GET.get('q', '')
@@ -55,14 +58,14 @@ class PrestasiDetailView(DetailView):
     slug_field = 'slug'
     
     def get_queryset(self):
-        return Prestasi.objects.filter(is_published=True)
+        return Prestasi.objects.published()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         prestasi = self.object
         
-        context['prestasi_terkait'] = Prestasi.objects.filter(
-            is_published=True, tingkat=prestasi.tingkat
+        context['prestasi_terkait'] = Prestasi.objects.published().filter(
+            tingkat=prestasi.tingkat
         ).exclude(pk=prestasi.pk)[:4]
         
         return context
@@ -9,3 +9,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prodi_website.settings')
 
 application = get_asgi_application()
+
+# Bangun indeks autocomplete saat worker start agar keystroke pertama tidak menunggu database
+from main.autocomplete import warm_autocomplete
+warm_autocomplete()
@@ -38,12 +38,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'main.middleware.StaticAssetMiddleware',
+    'main.middleware.VisitorLogMiddleware',
+    'main.middleware.PageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main.middleware.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'prodi_website.urls'
@@ -75,6 +79,26 @@ DATABASES = {
     }
 }
 
+# Cache bersama untuk semua proses/worker. Jangan pakai LocMemCache di production:
+# tiap proses punya salinan sendiri sehingga invalidasi dari proses lain tidak terlihat.
+# 'default': halaman, fragmen, dan data turunan (boleh di-cull saat penuh).
+# 'stamps': version stamp SiteSettings, chatbot, autocomplete, fragmen, dan cache halaman
+# (main/stamps.py); jumlah kuncinya kecil dan tetap, jadi culling praktis tidak pernah terjadi.
+CACHE_DIR = Path(os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / 'cache'))
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(CACHE_DIR / 'default'),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'stamps': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(CACHE_DIR / 'stamps'),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 1000000},
+    },
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -106,3 +130,104 @@ SITE_NAME = 'Program Studi Teknik Informatika'
 SITE_SHORT_NAME = 'PTI'
 SITE_TAGLINE = 'Membangun Generasi Digital Indonesia'
 SITE_UNIVERSITY = 'Universitas Muhammadiyah Surakarta'
+
+# Chatbot: jawaban dengan confidence di bawah ambang ini diganti jawaban default
+CHATBOT_CONFIDENCE_THRESHOLD = 0.2
+
+# Chatbot: simpan transkrip ke ChatSession/ChatMessage lewat writer background
+CHATBOT_TRANSCRIPT_ENABLED = os.environ.get('CHATBOT_TRANSCRIPT_ENABLED', 'False') == 'True'
+CHATBOT_TRANSCRIPT_BATCH_SIZE = 50
+CHATBOT_TRANSCRIPT_FLUSH_INTERVAL = 2.0  # detik
+
+# Chatbot: cache jawaban untuk pertanyaan yang sama (per proses)
+CHATBOT_RESPONSE_CACHE_SIZE = 1000
+CHATBOT_RESPONSE_CACHE_TTL = 300  # detik
+
+# Chatbot: retensi transkrip (manage.py archive_chat_sessions)
+CHAT_RETENTION_DAYS = 90
+CHAT_ARCHIVE_DIR = BASE_DIR / 'archive' / 'chat'
+
+# Pencarian global: None = FTS5 otomatis jika tersedia, atau path class backend
+# (misalnya 'main.search.DatabaseBackend' untuk query icontains biasa)
+SEARCH_BACKEND = None
+
+# Counter view/share/like/helpful: increment di-buffer lalu di-flush dengan F()
+# setiap COUNTER_FLUSH_INTERVAL detik (0 = langsung di-flush per request)
+COUNTER_FLUSH_INTERVAL = 5.0
+COUNTER_MAX_PENDING = 1000
+# Setelah flush, fragmen/halaman yang menampilkan counter (mis. berita populer)
+# di-invalidate paling sering sekali per COUNTER_INVALIDATE_INTERVAL detik per model
+COUNTER_INVALIDATE_INTERVAL = 60.0
+
+# Cache fragmen HTML (halaman utama): batas umur dalam detik, invalidasi utama lewat signal
+FRAGMENT_CACHE_TIMEOUT = 3600
+
+# Query budget per request (main/middleware.py), aktif saat development.
+# QUERY_BUDGET_VIEWS: budget khusus per nama URL, mis. {'main:home': 5}
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_DEFAULT = 30
+QUERY_BUDGET_VIEWS = {}
+QUERY_BUDGET_N_PLUS_ONE = 3  # query berbentuk sama dari lokasi yang sama
+QUERY_BUDGET_RAISE = False
+
+# Paginasi cursor (keyset) untuk daftar berita, karya, prestasi, dan publikasi.
+# False = nomor halaman biasa; mode cursor tetap dipakai untuk ?cursor= dan ?format=json
+CURSOR_PAGINATION = os.environ.get('CURSOR_PAGINATION', 'False') == 'True'
+
+# Cache halaman penuh untuk pengunjung anonim (main/pagecache.py), nonaktif saat development.
+# PAGE_CACHE_MAX_AGE: max-age Cache-Control untuk browser/reverse proxy (detik)
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', str(not DEBUG)) == 'True'
+PAGE_CACHE_TIMEOUT = 600
+PAGE_CACHE_MAX_AGE = 60
+
+# Analytics pengunjung (main/analytics.py): kunjungan masuk ring buffer lalu
+# di-bulk_create setiap VISITOR_LOG_FLUSH_INTERVAL detik oleh thread writer.
+# VISITOR_LOG_SAMPLE_RATE < 1.0 hanya mencatat sebagian request (mis. 0.1 = 10%)
+VISITOR_LOG_ENABLED = os.environ.get('VISITOR_LOG_ENABLED', 'True') == 'True'
+VISITOR_LOG_SAMPLE_RATE = float(os.environ.get('VISITOR_LOG_SAMPLE_RATE', '1.0'))
+VISITOR_LOG_BUFFER_SIZE = 10000  # kunjungan tertua ditimpa jika writer tertinggal
+VISITOR_LOG_BATCH_SIZE = 500
+VISITOR_LOG_FLUSH_INTERVAL = 5.0  # detik
+VISITOR_LOG_EXCLUDE = ('/admin/', '/static/', '/media/', '/api/', '/chatbot/api/')
+
+# Rollup analytics (main/rollups.py, `manage.py rollup_visitor_logs --prune`):
+# VisitorLog mentah yang sudah diagregasi dihapus setelah N hari, agregat harian disimpan permanen
+VISITOR_LOG_RETENTION_DAYS = 30
+VISITOR_STATS_HOURLY_RETENTION_DAYS = 90
+
+# Turunan gambar responsif (main/images.py): dibuat saat upload dan lewat
+# `manage.py generate_image_derivatives`. 'avif' hanya dipakai jika didukung Pillow
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 960, 1280)
+IMAGE_DERIVATIVE_FORMATS = ('webp',)  # mis. ('avif', 'webp'); fallback JPEG/PNG selalu dibuat
+
+# Antrian tugas latar belakang (main/tasks.py, `manage.py run_worker`).
+# Production WAJIB menjalankan run_worker (systemd/supervisor): tanpa worker turunan
+# gambar, pemanasan fragmen, dan rollup analytics tidak pernah dikerjakan.
+# TASKS_EAGER: jalankan tugas langsung setelah commit tanpa worker (default saat development)
+TASKS_EAGER = os.environ.get('TASKS_EAGER', str(DEBUG)) == 'True'
+TASK_MAX_ATTEMPTS = 5
+TASK_LOCK_TIMEOUT = 600  # detik sebelum tugas `running` dianggap macet
+TASK_POLL_INTERVAL = 2.0
+TASK_RETENTION_DAYS = 7
+TASK_OVERDUE_WARNING = 600  # detik; tugas menunggu lebih lama dari ini memicu warning main.W001 dan di admin
+# Tugas berkala: nama tugas -> interval detik
+TASK_SCHEDULE = {
+    'main.rollup_visitor_logs': 900,
+    'main.purge_tasks': 86400,
+}
+
+# Static files production (main/staticfiles.py): collectstatic me-minify CSS/JS proyek,
+# memberi hash isi di nama file (staticfiles.json), dan menulis sibling .gz/.br
+# (.br butuh paket brotli). StaticAssetMiddleware menyajikannya dari STATIC_ROOT
+# dengan cache satu tahun untuk nama ber-hash; matikan jika /static/ disajikan nginx
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'main.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+STATIC_MINIFY = True
+STATIC_ASSETS_SERVE = os.environ.get('STATIC_ASSETS_SERVE', str(not DEBUG)) == 'True'
+STATIC_MAX_AGE = 3600  # detik, untuk file tanpa hash di nama
+
+# SiteSettings disimpan per proses; dibaca ulang paling lambat setelah sekian detik
+# walaupun version stamp di cache tidak berubah (cadangan jika cache tidak bersama)
+SITE_SETTINGS_MAX_AGE = 60
@@ -11,4 +11,8 @@ if path not in sys.path:
 os.environ['DJANGO_SETTINGS_MODULE'] = 'prodi_website.settings'
 
 from django.core.wsgi import get_wsgi_application
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Bangun indeks autocomplete saat worker start agar keystroke pertama tidak menunggu database
+from main.autocomplete import warm_autocomplete
+warm_autocomplete()
\ No newline at end of file
@@ -334,7 +334,7 @@ function initLiveSearch() {
         
         searchTimeout = setTimeout(async () => {
             try {
-                const response = await fetch(`/api/search/?q=${encodeURIComponent(query)}`);
+                const response = await fetch(`/api/live-search/?q=${encodeURIComponent(query)}`);
                 const data = await response.json();
                 
                 displaySearchResults(data, searchResults);
@@ -353,7 +353,7 @@ function initLiveSearch() {
 }
 
 function displaySearchResults(data, container) {
-    if (!data.results || data.results.length === 0) {
+    if (!data.suggestions || data.suggestions.length === 0) {
         container.innerHTML = '<div class="search-no-results">Tidak ada hasil ditemukan</div>';
         container.style.display = 'block';
         return;
@@ -361,12 +361,12 @@ function displaySearchResults(data, container) {
     
     let html = '<ul class="search-results-list">';
     
-    data.results.forEach(item => {
+    data.suggestions.forEach(item => {
         html += `
             <li class="search-result-item">
                 <a href="${item.url}">
                     <span class="result-type">${item.type}</span>
-                    <span class="result-title">${item.title}</span>
+                    <span class="result-title">${item.text}</span>
                 </a>
             </li>
         `;